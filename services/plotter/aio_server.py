@@ -0,0 +1,175 @@
+import asyncio
+import time
+from concurrent import futures
+from threading import Event
+
+import grpc
+from decouple import config
+from proto.plotter_pb2 import PlotRequest, PlotResponse
+import proto.plotter_pb2_grpc as plotter_grpc
+
+from server import (
+    PlotterServiceServicer,
+    cacheable,
+    create_cache,
+    create_datasets,
+    create_pool,
+    create_sessions,
+    logger,
+    start_metrics,
+    request_data,
+    request_key,
+    request_payload,
+)
+from service import checkpoint, decode, render, render_tiles
+from utils import metrics
+from utils.metrics import merge, stage, timed
+from utils.cache import RenderCache
+from utils.compression import compress_response, grpc_compression
+from utils.datasets import DatasetRegistry
+from utils.exceptions import DatasetNotFoundError, InvalidRequestError, RenderCancelledError
+from utils.pool import RenderPool
+from utils.sessions import SessionStore
+from utils.tiles import tiled
+
+
+class AioPlotterServiceServicer(PlotterServiceServicer):
+    """AioPlotterServiceServicer serves GeneratePlot on asyncio with a bounded number of
+    concurrent renders and a bounded queue, the other RPCs run on the migration thread pool"""
+
+    _semaphore: asyncio.Semaphore
+    _max_queue: int
+    _queued: int
+
+    def __init__(
+        self,
+        pool: RenderPool,
+        cache: RenderCache,
+        chunk_size: int = 1024 * 1024,
+        concurrency: int = None,
+        max_queue: int = 64,
+        sessions: SessionStore = None,
+        datasets: DatasetRegistry = None,
+    ) -> None:
+        super().__init__(pool, cache, chunk_size=chunk_size, sessions=sessions, datasets=datasets)
+        self._semaphore = asyncio.Semaphore(concurrency or pool.workers)
+        self._max_queue = max_queue
+        self._queued = 0
+
+    async def GeneratePlot(self, request: PlotRequest, context: grpc.aio.ServicerContext):
+        with metrics.request("GeneratePlot", context, payload_bytes=request.ByteSize()):
+            try:
+                if cacheable(request):
+                    image = await self._cache.get_or_render_async(
+                        request_key(request), lambda: self._render(request, context)
+                    )
+                else:
+                    image = await self._render(request, context)
+            except InvalidRequestError as e:
+                await context.abort(grpc.StatusCode.INVALID_ARGUMENT, e.details())
+            except DatasetNotFoundError as e:
+                await context.abort(grpc.StatusCode.NOT_FOUND, e.message)
+            except RenderCancelledError as e:
+                await context.abort(grpc.StatusCode.DEADLINE_EXCEEDED, e.message)
+            metrics.IMAGE_BYTES.observe(len(image), method="GeneratePlot")
+            compress_response(context, len(image))
+
+        return PlotResponse(image=image)
+
+    async def _render(self, request: PlotRequest, context: grpc.aio.ServicerContext) -> bytes:
+        # NOTE: fail fast rather than queueing a burst without bound
+        if self._semaphore.locked() and self._queued >= self._max_queue:
+            await context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, "Render queue is full")
+
+        self._queued += 1
+        try:
+            with stage("queue"):
+                await self._semaphore.acquire()
+        finally:
+            self._queued -= 1
+
+        try:
+            remaining = context.time_remaining()
+            if remaining is not None and remaining <= 0:
+                raise RenderCancelledError("Request deadline exceeded while queued")
+            deadline = None if remaining is None else time.time() + remaining
+
+            encodedPayload = request_payload(request)
+            rawData, blobs = request_data(request, context)
+            with stage("decode"):
+                payload = decode(encodedPayload)
+            datasets = self._datasets.resolve(payload)
+            cancelled = Event()
+            if tiled(payload):
+                check = checkpoint(deadline=deadline, cancelled=cancelled)
+                rendered = asyncio.to_thread(
+                    timed,
+                    None,
+                    render_tiles,
+                    self._pool.submit,
+                    payload,
+                    rawData,
+                    blobs,
+                    check,
+                    datasets,
+                )
+            else:
+                # NOTE: a thread render also watches for cancellation, a render process
+                # only for the deadline, it can't share the event
+                watched = cancelled if self._pool.mode == "thread" else None
+                args = (encodedPayload, rawData, blobs, deadline, watched, datasets)
+                rendered = asyncio.wrap_future(
+                    self._pool.submit(timed, time.perf_counter(), render, *args)
+                )
+
+            try:
+                image, stages = await rendered
+                merge(stages)
+                return image
+            except asyncio.CancelledError:
+                # NOTE: the client went away, a queued render is dropped by the
+                # cancelled future and a running one stops at its next stage
+                cancelled.set()
+                raise
+        finally:
+            self._semaphore.release()
+
+
+async def serve(started: float = None):
+    address = config("SERVER_ADDRESS")
+    pool = create_pool()
+    cache = create_cache()
+    sessions = create_sessions()
+    datasets = create_datasets()
+    start_metrics(pool, sessions, datasets)
+
+    server = grpc.aio.server(
+        migration_thread_pool=futures.ThreadPoolExecutor(
+            max_workers=config("SERVER_THREADS", default=10, cast=int)
+        ),
+        compression=grpc_compression(),
+    )
+
+    plotter_grpc.add_PlotterServiceServicer_to_server(
+        AioPlotterServiceServicer(
+            pool,
+            cache,
+            chunk_size=config("IMAGE_CHUNK_SIZE", default=1024 * 1024, cast=int),
+            concurrency=config("RENDER_CONCURRENCY", default=0, cast=int),
+            max_queue=config("RENDER_MAX_QUEUE", default=64, cast=int),
+            sessions=sessions,
+            datasets=datasets,
+        ),
+        server,
+    )
+    server.add_insecure_port(address)
+    await server.start()
+    if started is not None:
+        logger.info(
+            "Listening on %s (aio), ready %.2fs after start", address, time.perf_counter() - started
+        )
+    try:
+        await server.wait_for_termination()
+    finally:
+        sessions.shutdown()
+        pool.shutdown()
@@ -0,0 +1,62 @@
+import json
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from models.payload import PayloadModel
+from proto.plotter_pb2 import Payload
+from service import decode
+
+
+"""
+Compares the payload decoding paths of a small chart request,
+run from services/plotter with `python benchmarks/decode.py [repeat]`
+"""
+
+
+PAYLOAD = {
+    "data": [
+        {"datatype": "file", "filename": "a.csv", "plotID": 0},
+        {"datatype": "Function", "function": "\\\\sin(x)", "limits": [0, 10], "plotID": 1},
+    ],
+    "image": {
+        "figure": {"figsize": [4, 3], "dpi": 80},
+        "graphs": {"0": {"graphID": 0, "plot_id_list": [0, 1]}},
+        "plots": {"0": {"plotID": 0, "decimation": "lttb"}, "1": {"plotID": 1}},
+    },
+}
+
+
+def proto_payload() -> bytes:
+    message = Payload()
+    message.data.add(plotID=0).file.filename = "a.csv"
+    function = message.data.add(plotID=1)
+    function.function.function = "\\\\sin(x)"
+    function.limits.extend([0, 10])
+    message.image.figure.figsize.extend([4, 3])
+    message.image.figure.dpi = 80
+    message.image.graphs[0].plot_id_list.extend([0, 1])
+    message.image.plots[0].decimation = "lttb"
+    message.image.plots[1].plotID = 1
+
+    return message.SerializeToString()
+
+
+def main(repeat: int = 10_000) -> None:
+    encodedPayload = json.dumps(PAYLOAD).encode("utf8")
+    serialized = proto_payload()
+
+    cases = {
+        "json.loads + PayloadModel(**)": lambda: PayloadModel(**json.loads(encodedPayload.decode("utf8"))),
+        "model_validate_json": lambda: decode(encodedPayload),
+        "protobuf + model_validate": lambda: decode(Payload.FromString(serialized)),
+    }
+    for name, case in cases.items():
+        seconds = min(timeit.repeat(case, number=repeat, repeat=5)) / repeat
+        print(f"{name:32} {seconds * 1e6:8.1f} us")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
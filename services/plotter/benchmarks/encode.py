@@ -0,0 +1,38 @@
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import numpy as np
+
+from models.figure import FigureModel
+from utils.encoder import encode
+from utils.figures import new_figure
+
+
+"""
+Compares the render profiles on a 1280x960 line chart,
+run from services/plotter with `python benchmarks/encode.py [repeat]`
+"""
+
+
+def main(repeat: int = 5) -> None:
+    fig = new_figure(FigureModel(dpi=200))
+    axes = fig.subplots(1, 1)
+    x = np.linspace(0, 100, 20_000)
+    axes.plot(x, np.sin(x) * np.cos(x / 7))
+    axes.plot(x, np.cos(x))
+    axes.grid()
+
+    for format in ("png", "jpeg", "webp"):
+        for profile in ("default", "fast", "small"):
+            size = len(encode(fig, format=format, profile=profile))
+            seconds = min(
+                timeit.repeat(lambda: encode(fig, format=format, profile=profile), number=repeat, repeat=3)
+            )
+            print(f"{format:5} {profile:8} {seconds / repeat * 1e3:8.1f} ms {size / 1024:8.1f} KiB")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
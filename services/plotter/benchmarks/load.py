@@ -0,0 +1,545 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import secrets
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+PLOTTER_DIR = Path(__file__).resolve().parents[1]
+USER_DIR = PLOTTER_DIR.parent / "user"
+sys.path[:0] = [str(PLOTTER_DIR), str(USER_DIR)]
+
+import grpc
+import numpy as np
+
+from benchmarks.suite import PLOTS, Case, metadata, write_dataset
+from utils.compression import call_compression
+
+try:
+    import proto.plotter_pb2_grpc as plotter_grpc
+    import user_pb2
+    import user_pb2_grpc
+    from proto.plotter_pb2 import PlotRequest
+except ImportError as e:
+    sys.exit(f"{e}, generate the gRPC stubs of services/plotter and services/user (just proto)")
+
+
+"""
+Closed-loop load generator for the plotter and user services.
+Starts the servers itself on free local ports, the plotter once per --config so that server
+modes and pool sizes are compared on one machine, then runs --concurrency workers which each
+send their next request once the previous one returned (or at their share of --rps).
+Reports per method the latency percentiles, throughput and status codes, and the CPU used by
+each server process with its render workers over the measured window. Run from services/plotter:
+
+    python benchmarks/load.py --mix GeneratePlot=8,Login=1,RefreshToken=1,GetUserInfo=2
+    python benchmarks/load.py --mix GeneratePlot --rows 1e3=3,1e5 --concurrency 16 \
+        --config sync --config aio-process:SERVER_MODE=aio,RENDER_MODE=process,RENDER_WORKERS=4
+
+The client shares the machine with the servers, its own CPU is reported to spot when it,
+rather than the servers, is the bottleneck.
+"""
+
+
+PLOTTER_METHODS = ("GeneratePlot",)
+USER_METHODS = ("Login", "RefreshToken", "GetUserInfo")
+PERCENTILES = (50, 95, 99, 99.9)
+# NOTE: the render cache would answer the repeated payloads, the metrics port could clash
+PLOTTER_ENV = {"RENDER_CACHE_BYTES": "0", "RENDER_CACHE_DIR": "", "METRICS_ADDRESS": ""}
+# NOTE: the largest payloads exceed gRPC's default 4 MiB message limit
+OPTIONS = [("grpc.max_receive_message_length", -1), ("grpc.max_send_message_length", -1)]
+PASSWORD = "load-test-password"
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def cpu_seconds(pid: int) -> Optional[float]:
+    """User and system CPU seconds of pid and its descendants, including the exited ones
+    (recycled render workers), read from /proc so only on Linux"""
+    if not os.path.isdir("/proc"):
+        return None
+
+    stats, children = {}, {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # NOTE: the command name is parenthesized and may contain spaces
+                fields = f.read().rpartition(")")[2].split()
+        except OSError:
+            continue
+        stats[int(entry)] = fields
+        children.setdefault(int(fields[1]), []).append(int(entry))
+
+    total, pending = 0, [pid]
+    while pending:
+        current = pending.pop()
+        if current in stats:
+            # NOTE: utime, stime, cutime and cstime, in clock ticks
+            total += sum(int(value) for value in stats[current][11:15])
+        pending.extend(children.get(current, ()))
+
+    return total / os.sysconf("SC_CLK_TCK")
+
+
+class Server(object):
+    """Server is a service started as a child process on a free local port"""
+
+    name: str
+    address: str
+    process: subprocess.Popen
+    _log: Path
+
+    def __init__(
+        self, name: str, directory: Path, script: str, env: Dict[str, str], log: Path
+    ) -> None:
+        self.name = name
+        self.address = f"127.0.0.1:{free_port()}"
+        self._log = log
+        with open(log, "wb") as f:
+            self.process = subprocess.Popen(
+                [sys.executable, script],
+                cwd=directory,
+                env={**os.environ, **env, "SERVER_ADDRESS": self.address},
+                stdout=f,
+                stderr=subprocess.STDOUT,
+            )
+
+    def wait(self, timeout: float = 60) -> None:
+        """Waits for the server to accept connections"""
+        deadline = time.monotonic() + timeout
+        with grpc.insecure_channel(self.address) as channel:
+            while True:
+                if self.process.poll() is not None:
+                    raise RuntimeError(f"{self.name} server exited:\n{self.log()}")
+                try:
+                    grpc.channel_ready_future(channel).result(timeout=0.5)
+                    return
+                except grpc.FutureTimeoutError:
+                    if time.monotonic() > deadline:
+                        raise RuntimeError(f"{self.name} server not ready:\n{self.log()}")
+
+    def cpu_seconds(self) -> Optional[float]:
+        return cpu_seconds(self.process.pid)
+
+    def log(self, lines: int = 20) -> str:
+        return "\n".join(self._log.read_text(errors="replace").splitlines()[-lines:])
+
+    def stop(self) -> None:
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+
+
+def start_user_server(directory: Path, users: int) -> Server:
+    """User service on a fresh sqlite database, with users signed up"""
+    database = directory / "users.sqlite3"
+    with sqlite3.connect(database) as connection:
+        connection.executescript((USER_DIR / "dbinit-up.sql").read_text())
+
+    env = {"DATABASE_ADDRESS": str(database), "JWK": secrets.token_hex(32)}
+    server = Server("user", USER_DIR, "main.py", env, directory / "user.log")
+    server.wait()
+    with grpc.insecure_channel(server.address) as channel:
+        stub = user_pb2_grpc.UserServiceStub(channel)
+        for user in range(users):
+            stub.SignUp(
+                user_pb2.SignUpRequest(
+                    user_info=user_pb2.UserInfo(
+                        user_name=f"user{user}", full_name=f"User {user}", email=email(user)
+                    ),
+                    hashed_password=PASSWORD,
+                )
+            )
+
+    return server
+
+
+def email(user: int) -> str:
+    return f"user{user}@load.test"
+
+
+class Worker(object):
+    """Worker sends one request at a time, with its own logged-in user sessions.
+    Preparing the session that a request needs is not timed"""
+
+    plotter: plotter_grpc.PlotterServiceStub
+    user: user_pb2_grpc.UserServiceStub
+    rng: random.Random
+    compression: str
+    _users: int
+    # NOTE: [access token, refresh token, second the refresh token was issued]
+    _sessions: List[list]
+
+    def __init__(self, plotter, user, seed: int, users: int, compression: str = "none") -> None:
+        self.plotter = plotter
+        self.user = user
+        self.rng = random.Random(seed)
+        self.compression = compression
+        self._users = users
+        self._sessions = []
+
+    async def login(self) -> list:
+        response = await self.user.Login(
+            user_pb2.LoginRequest(
+                email=email(self.rng.randrange(self._users)), hashed_password=PASSWORD
+            )
+        )
+
+        return [response.access_token, response.refresh_token, int(time.time())]
+
+    async def prepare(self, method: str) -> Optional[list]:
+        """Session used by the next request of method"""
+        if method == "GetUserInfo" and self._sessions:
+            return self._sessions[-1]
+        if method not in ("GetUserInfo", "RefreshToken"):
+            return None
+
+        # NOTE: the user service takes a refresh token expiring in the same second as the one
+        # it replaced for a reuse and ends the session, so a session whose token was issued
+        # this second waits and another one is used, the sessions double until they cover
+        # the refresh rate of the worker
+        now = int(time.time())
+        for session in self._sessions:
+            if session[2] < now:
+                return session
+
+        sessions = [await self.login() for _ in range(max(len(self._sessions), 1))]
+        self._sessions.extend(sessions)
+        await asyncio.sleep(sessions[-1][2] + 1 - time.time())
+
+        return sessions[0]
+
+    async def call(self, method: str, session: Optional[list], payloads: list) -> None:
+        if method == "GeneratePlot":
+            encodedPayload, rawData = self.rng.choices(*zip(*payloads))[0]
+            await self.plotter.GeneratePlot(
+                PlotRequest(encodedPayload=encodedPayload, rawData=rawData),
+                compression=call_compression(len(rawData), self.compression),
+            )
+        elif method == "Login":
+            await self.login()
+        elif method == "RefreshToken":
+            try:
+                response = await self.user.RefreshToken(
+                    user_pb2.RefreshRequest(refresh_token=session[1])
+                )
+            except grpc.aio.AioRpcError:
+                # NOTE: a failed refresh may have ended the session
+                self._sessions.remove(session)
+                raise
+            session[:] = [response.access_token, response.new_refresh_token, int(time.time())]
+        elif method == "GetUserInfo":
+            await self.user.GetUserInfo(
+                user_pb2.GetUserInfoRequest(), metadata=(("access_token", session[0]),)
+            )
+
+
+class Recorder(object):
+    """Recorder keeps the latencies and status codes of the requests started in the window"""
+
+    start: float
+    end: float
+    latencies: Dict[str, List[float]]
+    codes: Dict[str, Dict[str, int]]
+
+    def __init__(self, start: float, end: float) -> None:
+        self.start = start
+        self.end = end
+        self.latencies = {}
+        self.codes = {}
+
+    def record(self, method: str, started: float, code: str) -> None:
+        if not self.start <= started < self.end:
+            return
+
+        codes = self.codes.setdefault(method, {})
+        codes[code] = codes.get(code, 0) + 1
+        if code == "OK":
+            self.latencies.setdefault(method, []).append(time.perf_counter() - started)
+
+    def summary(self) -> Dict[str, dict]:
+        seconds = self.end - self.start
+        methods = {}
+        for method in sorted(self.codes):
+            methods[method] = summarize(self.latencies.get(method, []), self.codes[method], seconds)
+        methods["all"] = summarize(
+            [latency for latencies in self.latencies.values() for latency in latencies],
+            {
+                code: sum(codes.get(code, 0) for codes in self.codes.values())
+                for code in {code for codes in self.codes.values() for code in codes}
+            },
+            seconds,
+        )
+
+        return methods
+
+
+def summarize(latencies: List[float], codes: Dict[str, int], seconds: float) -> dict:
+    requests = sum(codes.values())
+    values = np.percentile(latencies, PERCENTILES) if latencies else [None] * len(PERCENTILES)
+
+    return {
+        "requests": requests,
+        "errors": requests - codes.get("OK", 0),
+        "rps": requests / seconds,
+        "codes": codes,
+        "latency": {f"p{percentile:g}": value for percentile, value in zip(PERCENTILES, values)},
+    }
+
+
+async def work(
+    worker: Worker,
+    methods: Tuple[List[str], List[float]],
+    payloads: list,
+    recorder: Recorder,
+    interval: float,
+) -> None:
+    """Sends requests until the end of the window, back to back or one per interval.
+    Paced latencies run from the scheduled start, so a late server isn't hidden by the
+    requests that the worker could not send in time"""
+    scheduled = time.perf_counter()
+    while scheduled < recorder.end:
+        if interval:
+            await asyncio.sleep(max(scheduled - time.perf_counter(), 0))
+        method = worker.rng.choices(*methods)[0]
+        started = None
+        try:
+            prepared = time.perf_counter()
+            session = await worker.prepare(method)
+            started = time.perf_counter()
+            if interval:
+                started = scheduled + started - prepared
+            await worker.call(method, session, payloads)
+            code = "OK"
+        except grpc.aio.AioRpcError as e:
+            code = e.code().name
+        recorder.record(method, time.perf_counter() if started is None else started, code)
+        scheduled = scheduled + interval if interval else time.perf_counter()
+
+
+async def load(
+    args: argparse.Namespace,
+    plotter: Optional[Server],
+    user: Optional[Server],
+    methods: Tuple[List[str], List[float]],
+    payloads: list,
+) -> dict:
+    """Runs the workers for the warm-up and the measured window, returns the summary"""
+    plotter_channel = plotter and grpc.aio.insecure_channel(plotter.address, options=OPTIONS)
+    user_channel = user and grpc.aio.insecure_channel(user.address)
+    servers = [server for server in (plotter, user) if server is not None]
+
+    now = time.perf_counter()
+    recorder = Recorder(now + args.warmup, now + args.warmup + args.duration)
+    interval = args.concurrency / args.rps if args.rps else 0.0
+    workers = [
+        Worker(
+            plotter_channel and plotter_grpc.PlotterServiceStub(plotter_channel),
+            user_channel and user_pb2_grpc.UserServiceStub(user_channel),
+            seed=args.seed + position,
+            users=args.users,
+            compression=args.compression,
+        )
+        for position in range(args.concurrency)
+    ]
+    tasks = [
+        asyncio.create_task(work(worker, methods, payloads, recorder, interval))
+        for worker in workers
+    ]
+
+    await asyncio.sleep(max(recorder.start - time.perf_counter(), 0))
+    cpu_before = {server.name: server.cpu_seconds() for server in servers}
+    client_before = time.process_time()
+    await asyncio.sleep(max(recorder.end - time.perf_counter(), 0))
+    cpu_after = {server.name: server.cpu_seconds() for server in servers}
+    client_after = time.process_time()
+    await asyncio.gather(*tasks)
+
+    for channel in (plotter_channel, user_channel):
+        if channel is not None:
+            await channel.close()
+
+    summary = recorder.summary()
+    cpu = {
+        name: None if cpu_before[name] is None else cpu_after[name] - cpu_before[name]
+        for name in cpu_before
+    }
+    cpu["client"] = client_after - client_before
+
+    return {"methods": summary, "cpu_seconds": cpu, "seconds": args.duration}
+
+
+def weights(value: str, cast: Callable = str) -> Tuple[list, List[float]]:
+    """Keys and weights of a name[=weight],... list, the weight defaults to 1"""
+    keys, values = [], []
+    for entry in value.split(","):
+        key, _, weight = entry.partition("=")
+        keys.append(cast(key.strip()))
+        values.append(float(weight or 1))
+
+    return keys, values
+
+
+def server_config(value: str) -> Tuple[str, Dict[str, str]]:
+    """Name and plotter environment of a name[:KEY=VALUE,...] configuration"""
+    name, _, settings = value.partition(":")
+    env = dict(setting.split("=", 1) for setting in settings.split(",") if setting)
+
+    return name, env
+
+
+def plot_payloads(directory: Path, plot: str, format: str, rows: list, shares: list) -> list:
+    """(encodedPayload, rawData) of every size, and the share of requests of each"""
+    payloads = []
+    for size in rows:
+        path = directory / f"{plot}_{size}.csv"
+        write_dataset(str(path), "scatter" if plot == "scatter" else "line", size)
+        case = Case("grpc", plot, size, format, "default")
+        payloads.append((case.payload(), path.read_bytes()))
+
+    return list(zip(payloads, shares))
+
+
+def report(name: str, env: Dict[str, str], result: dict) -> None:
+    print(f"\n== {name} {' '.join(f'{key}={value}' for key, value in env.items())}")
+    print(
+        f"{'method':14} {'requests':>9} {'errors':>7} {'rps':>8} "
+        + " ".join(f"{f'p{percentile:g}':>8}" for percentile in PERCENTILES)
+        + "  (ms)"
+    )
+    for method, summary in result["methods"].items():
+        latency = " ".join(
+            f"{value * 1e3:8.1f}" if value is not None else f"{'-':>8}"
+            for value in summary["latency"].values()
+        )
+        print(
+            f"{method:14} {summary['requests']:9d} {summary['errors']:7d}"
+            f" {summary['rps']:8.1f} {latency}"
+        )
+        errors = {code: count for code, count in summary["codes"].items() if code != "OK"}
+        if errors and method != "all":
+            print(f"{'':14} " + " ".join(f"{code}={count}" for code, count in errors.items()))
+
+    methods = {"plotter": PLOTTER_METHODS, "user": USER_METHODS}
+    usage = []
+    for server, seconds in result["cpu_seconds"].items():
+        if seconds is None:
+            usage.append(f"{server} n/a")
+            continue
+        # NOTE: per request of the server's own methods, of all requests for the client
+        requests = sum(
+            summary["requests"]
+            for method, summary in result["methods"].items()
+            if method in methods.get(server, ("all",))
+        )
+        usage.append(
+            f"{server} {seconds / result['seconds']:.2f} cores"
+            f" ({seconds * 1e3 / max(requests, 1):.1f} ms/request)"
+        )
+    print("cpu: " + ", ".join(usage))
+
+
+def run(args: argparse.Namespace) -> None:
+    methods = weights(args.mix)
+    unknown = set(methods[0]) - set(PLOTTER_METHODS + USER_METHODS)
+    if unknown:
+        sys.exit(f"Unknown methods {sorted(unknown)}, use {PLOTTER_METHODS + USER_METHODS}")
+    configs = [server_config(config) for config in args.config or ["default"]]
+    uses_plotter = any(method in PLOTTER_METHODS for method in methods[0])
+    uses_user = any(method in USER_METHODS for method in methods[0])
+
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        directory = Path(directory)
+        payloads = []
+        if uses_plotter:
+            rows, shares = weights(args.rows, cast=lambda size: int(float(size)))
+            payloads = plot_payloads(directory, args.plot, args.format, rows, shares)
+
+        user = start_user_server(directory, args.users) if uses_user else None
+        try:
+            for name, env in configs:
+                plotter = None
+                if uses_plotter:
+                    plotter = Server(
+                        "plotter", PLOTTER_DIR, "server.py", {**PLOTTER_ENV, **env},
+                        directory / f"plotter-{name}.log",
+                    )
+                try:
+                    if plotter is not None:
+                        plotter.wait()
+                    result = asyncio.run(load(args, plotter, user, methods, payloads))
+                finally:
+                    if plotter is not None:
+                        plotter.stop()
+                report(name, env, result)
+                results.append({"config": name, "env": env, **result})
+        finally:
+            if user is not None:
+                user.stop()
+
+    if args.output:
+        settings = {
+            key: value for key, value in vars(args).items() if key not in ("config", "output")
+        }
+        Path(args.output).write_text(
+            json.dumps({"meta": metadata(), "settings": settings, "results": results}, indent=2)
+        )
+        print(f"\nSaved {len(results)} results to {args.output}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load generator of the plotter and user services")
+    parser.add_argument(
+        "--mix",
+        default="GeneratePlot=8,Login=1,RefreshToken=1,GetUserInfo=2",
+        help="methods to call, with their relative weights",
+    )
+    parser.add_argument("--concurrency", type=int, default=8, help="requests in flight")
+    parser.add_argument(
+        "--rps", type=float, default=0, help="target requests per second, 0 sends back to back"
+    )
+    parser.add_argument("--duration", type=float, default=30, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=5, help="unmeasured seconds first")
+    parser.add_argument(
+        "--rows", default="1e3,1e5", help="data sizes of the plots, with their relative weights"
+    )
+    parser.add_argument("--plot", choices=list(PLOTS), default="line")
+    parser.add_argument("--format", default="png")
+    parser.add_argument(
+        "--compression",
+        choices=["none", "gzip", "deflate"],
+        default="none",
+        help="compression of the plot requests, the servers' is set with GRPC_COMPRESSION",
+    )
+    parser.add_argument(
+        "--config",
+        action="append",
+        help="name[:KEY=VALUE,...] plotter environment to compare, repeatable",
+    )
+    parser.add_argument("--users", type=int, default=100, help="users signed up before the run")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="JSON file of the results")
+
+    run(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
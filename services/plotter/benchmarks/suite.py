@@ -0,0 +1,356 @@
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, NamedTuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import numpy as np
+from pandas import DataFrame, Index
+
+try:
+    import resource
+except ImportError:
+    # NOTE: peak RSS is POSIX only, it is reported as null elsewhere
+    resource = None
+
+
+"""
+Benchmarks the plot pipeline on generated datasets, in-process (service.render) and through
+a local gRPC server, sweeping the data size per plot type, then the output formats and the
+figure sizes at a fixed size. Each case runs in a fresh process so that its peak RSS is its own.
+Run from services/plotter:
+
+    python benchmarks/suite.py run [--sizes 1e2,1e4] [--output results.json]
+    python benchmarks/suite.py compare baseline.json results.json [--threshold 0.1]
+
+compare exits with status 1 when a case got slower (or bigger) than the threshold allows.
+"""
+
+
+SIZES = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+PLOTS = {
+    "line": {"plotType": "LinePlotModel"},
+    "line-lttb": {"plotType": "LinePlotModel", "decimation": "lttb"},
+    "scatter": {"plotType": "ScatterPlotModel"},
+}
+FORMATS = ("png", "svg", "pdf")
+FIGURES = {
+    "small": {"figsize": [4, 3], "dpi": 72},
+    "default": {"figsize": [6.4, 4.8], "dpi": 100},
+    "large": {"figsize": [12, 8], "dpi": 200},
+}
+PATHS = ("inprocess", "grpc")
+# NOTE: the format and figure sweeps run at this size (or the largest size requested below it)
+SWEEP_ROWS = 100_000
+SEED = 1
+
+
+class Case(NamedTuple):
+    path: str
+    plot: str
+    rows: int
+    format: str
+    figure: str
+
+    @property
+    def name(self) -> str:
+        return f"{self.path}/{self.plot}/{rows_label(self.rows)}/{self.format}/{self.figure}"
+
+    def payload(self) -> bytes:
+        return json.dumps(
+            {
+                "data": [{"datatype": "file", "filename": f"{self.plot}.csv"}],
+                "image": {
+                    "format": self.format,
+                    "figure": FIGURES[self.figure],
+                    "plots": {"0": PLOTS[self.plot]},
+                },
+            }
+        ).encode("utf8")
+
+
+def rows_label(rows: int) -> str:
+    exponent = math.log10(rows)
+    return f"1e{int(exponent)}" if exponent.is_integer() else str(rows)
+
+
+def cases(
+    sizes: List[int], plots: List[str], formats: List[str], figures: List[str], paths: List[str]
+) -> List[Case]:
+    sweep_rows = max((rows for rows in sizes if rows <= SWEEP_ROWS), default=min(sizes))
+    matrix = [(plot, rows, "png", "default") for plot in plots for rows in sizes]
+    matrix += [(plot, sweep_rows, format, "default") for plot in plots for format in formats]
+    matrix += [(plot, sweep_rows, "png", figure) for plot in plots for figure in figures]
+
+    unique = list(dict.fromkeys(matrix))
+
+    return [Case(path, *case) for path in paths for case in unique]
+
+
+def write_dataset(path: str, plot: str, rows: int, chunk: int = 1_000_000) -> None:
+    """CSV of a random walk for lines, of a correlated normal cloud (with repeated x) for
+    scatters, written by chunks to bound the memory of the largest sizes"""
+    rng = np.random.default_rng(SEED)
+    last = 0.0
+    with open(path, "w", newline="") as f:
+        for start in range(0, rows, chunk):
+            size = min(chunk, rows - start)
+            if plot == "scatter":
+                x = rng.normal(size=size).round(3)
+                y = x * 0.5 + rng.normal(size=size)
+            else:
+                x = np.arange(start, start + size)
+                y = last + rng.normal(size=size).cumsum()
+                last = y[-1]
+            frame = DataFrame({"y": y}, index=Index(x, name="x"))
+            frame.to_csv(f, header=start == 0, float_format="%.6g")
+
+
+def write_datasets(directory: str, selected: List[Case]) -> Dict[tuple, str]:
+    paths = {}
+    for plot, rows in dict.fromkeys((case.plot, case.rows) for case in selected):
+        kind = "scatter" if plot == "scatter" else "line"
+        path = os.path.join(directory, f"{kind}_{rows}.csv")
+        if not os.path.exists(path):
+            write_dataset(path, kind, rows)
+        paths[(plot, rows)] = path
+
+    return paths
+
+
+def peak_rss_mb() -> float:
+    if resource is None:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # NOTE: kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def run_case(case: Case, path: str, repeat: int, budget: float) -> dict:
+    """Times case in this process, runs at least once and at most repeat times within budget"""
+    import service
+
+    service.warm_up()
+    rawData = Path(path).read_bytes()
+    encodedPayload = case.payload()
+    render = grpc_render(rawData) if case.path == "grpc" else inprocess_render(rawData)
+    base_rss = peak_rss_mb()
+
+    totals, stages, image = [], [], b""
+    started = time.perf_counter()
+    while len(totals) < repeat and (not totals or time.perf_counter() - started < budget):
+        run_started = time.perf_counter()
+        image, timings = render(encodedPayload)
+        totals.append(time.perf_counter() - run_started)
+        stages.append(timings)
+
+    names = dict.fromkeys(name for timings in stages for name in timings)
+
+    return {
+        "name": case.name,
+        **case._asdict(),
+        "runs": len(totals),
+        "seconds": {"min": min(totals), "median": statistics.median(totals)},
+        "stages": {
+            name: statistics.median(timings.get(name, 0.0) for timings in stages) for name in names
+        },
+        "image_bytes": len(image),
+        "data_bytes": len(rawData),
+        "base_rss_mb": base_rss,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def inprocess_render(rawData: bytes):
+    import service
+    from utils.metrics import stage_timings, timed
+
+    def render(encodedPayload: bytes) -> tuple:
+        image, timings = timed(None, service.render, encodedPayload, rawData)
+
+        return image, stage_timings(timings)
+
+    return render
+
+
+def grpc_render(rawData: bytes):
+    """Serves a thread-mode plotter without render cache on an ephemeral local port"""
+    from concurrent import futures
+
+    import grpc
+
+    import proto.plotter_pb2_grpc as plotter_grpc
+    from proto.plotter_pb2 import PlotRequest
+    from server import PlotterServiceServicer
+    from utils.cache import RenderCache
+    from utils.pool import RenderPool
+
+    # NOTE: the large datasets exceed gRPC's default 4 MiB message limit
+    options = [("grpc.max_receive_message_length", -1), ("grpc.max_send_message_length", -1)]
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=4), options=options)
+    plotter_grpc.add_PlotterServiceServicer_to_server(
+        PlotterServiceServicer(RenderPool(mode="thread", workers=1), RenderCache(max_bytes=0)),
+        server,
+    )
+    port = server.add_insecure_port("127.0.0.1:0")
+    server.start()
+    channel = grpc.insecure_channel(f"127.0.0.1:{port}", options=options)
+    stub = plotter_grpc.PlotterServiceStub(channel)
+
+    def render(encodedPayload: bytes) -> tuple:
+        try:
+            response, call = stub.GeneratePlot.with_call(
+                PlotRequest(encodedPayload=encodedPayload, rawData=rawData)
+            )
+        except grpc.RpcError as e:
+            # NOTE: RPC errors don't pickle back to the suite's process
+            raise RuntimeError(f"{e.code()}: {e.details()}")
+        return response.image, parse_server_timing(dict(call.trailing_metadata())["server-timing"])
+
+    # NOTE: a collected grpc.Server stops, the closure keeps it alive
+    render.server = server
+
+    return render
+
+
+def parse_server_timing(value: str) -> Dict[str, float]:
+    """Stage timings in seconds of a server-timing value, without the total"""
+    timings = {}
+    for entry in value.split(","):
+        name, _, duration = entry.strip().partition(";dur=")
+        if name != "total":
+            timings[name] = float(duration) / 1000
+
+    return timings
+
+
+def metadata() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "commit": commit,
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def run(args: argparse.Namespace) -> None:
+    selected = cases(
+        sizes=[int(float(size)) for size in args.sizes.split(",")],
+        plots=args.plots.split(","),
+        formats=args.formats.split(","),
+        figures=args.figures.split(","),
+        paths=args.paths.split(","),
+    )
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        datasets = write_datasets(directory, selected)
+        for case in selected:
+            # NOTE: a fresh process per case, ru_maxrss only ever grows
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(1, mp_context=context) as executor:
+                result = executor.submit(
+                    run_case, case, datasets[(case.plot, case.rows)], args.repeat, args.budget
+                ).result()
+            results.append(result)
+            stages = result["stages"].items()
+            stages = " ".join(f"{name}={seconds * 1e3:.1f}" for name, seconds in stages)
+            print(
+                f"{case.name:40} {result['seconds']['median'] * 1e3:10.1f} ms"
+                f" {result['peak_rss_mb'] or 0:8.0f} MB  {stages}",
+                flush=True,
+            )
+
+    Path(args.output).write_text(json.dumps({"meta": metadata(), "results": results}, indent=2))
+    print(f"Saved {len(results)} results to {args.output}")
+
+
+def compare(args: argparse.Namespace) -> int:
+    """Prints the cases of current against baseline, returns the number of regressions"""
+    baseline = json.loads(Path(args.baseline).read_text())["results"]
+    baseline = {result["name"]: result for result in baseline}
+    current = json.loads(Path(args.current).read_text())["results"]
+
+    regressions = 0
+    for result in current:
+        base = baseline.get(result["name"])
+        if base is None:
+            print(f"{result['name']:40} {'new':>10}")
+            continue
+
+        before, after = base["seconds"][args.statistic], result["seconds"][args.statistic]
+        flags = []
+        if after > before * (1 + args.threshold) and after - before > args.min_seconds:
+            flags.append("SLOWER")
+        rss_before, rss_after = base.get("peak_rss_mb"), result.get("peak_rss_mb")
+        if rss_before and rss_after:
+            if rss_after > rss_before * (1 + args.threshold) + args.min_rss_mb:
+                flags.append("MEMORY")
+        regressions += bool(flags)
+
+        print(
+            f"{result['name']:40} {before * 1e3:10.1f} -> {after * 1e3:10.1f} ms"
+            f" {(after / before - 1) * 100 if before else 0:+7.1f}%  {' '.join(flags)}"
+        )
+
+    print(f"{regressions} regression(s) above {args.threshold:.0%}")
+
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Plotter benchmark suite")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    runner = commands.add_parser("run", help="run the benchmarks and save the results as JSON")
+    runner.add_argument("--sizes", default=",".join(str(size) for size in SIZES))
+    runner.add_argument("--plots", default=",".join(PLOTS))
+    runner.add_argument("--formats", default=",".join(FORMATS))
+    runner.add_argument("--figures", default=",".join(FIGURES))
+    runner.add_argument("--paths", default=",".join(PATHS))
+    runner.add_argument("--repeat", type=int, default=5, help="maximum runs per case")
+    runner.add_argument(
+        "--budget", type=float, default=5.0, help="seconds per case after the first run"
+    )
+    runner.add_argument("--output", default="benchmarks/results.json")
+
+    comparer = commands.add_parser("compare", help="flag the regressions against a baseline")
+    comparer.add_argument("baseline")
+    comparer.add_argument("current")
+    comparer.add_argument("--statistic", choices=("median", "min"), default="median")
+    comparer.add_argument("--threshold", type=float, default=0.10, help="relative slowdown allowed")
+    comparer.add_argument(
+        "--min-seconds", type=float, default=0.002, help="ignore smaller slowdowns"
+    )
+    comparer.add_argument(
+        "--min-rss-mb", type=float, default=16.0, help="ignore smaller RSS growth"
+    )
+
+    args = parser.parse_args()
+    if args.command == "run":
+        run(args)
+    else:
+        sys.exit(1 if compare(args) else 0)
+
+
+if __name__ == "__main__":
+    main()
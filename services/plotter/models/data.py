@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import List, Callable
+from pydantic import BaseModel, Field, model_validator
+from typing import List, Callable, Literal
 
 from pandas import DataFrame
 
@@ -16,12 +16,28 @@ class DataModel(BaseModel):
 
 
 class FileModel(DataModel):
-    filename: str
-    axis: List[str] = ["y"]
-    column_names: dict = {"y": "y"}
+    filename: str = None
+    # NOTE: id returned by UploadDataset, the data is then read from the server's datasets
+    dataset_id: str = None
+    format: Literal["csv", "arrow", "parquet", "npy", "npz"] = "csv"
+    # NOTE: blobs compressed by the client are decompressed while they are parsed
+    compression: Literal["gzip", "zstd"] = None
+    axis: List[str] = Field(default_factory=lambda: ["y"])
+    column_names: dict = Field(default_factory=lambda: {"y": "y"})
+
+    @model_validator(mode="after")
+    def data_source(self):
+        if self.filename is None and self.dataset_id is None:
+            raise ValueError("Expected a filename or a dataset_id")
+
+        return self
 
 
 class FunctionModel(DataModel):
     function: str
+    # NOTE: resolution uniform samples over limits, refined where the curvature is high
     resolution: int = 100
+    adaptive: bool = True
+    tolerance: float = 1e-3
+    max_points: int = 10_000
     lambda_f: Callable = None
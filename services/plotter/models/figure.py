@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, Literal
 from uuid import UUID, uuid4
 
@@ -26,8 +26,8 @@ class SubplotParamsModel(BaseModel):
 
 
 class FigureModel(BaseModel):
-    num: UUID = uuid4()
-    figsize: tuple[float] = (6.4, 4.8)
+    num: UUID = Field(default_factory=uuid4)
+    figsize: tuple[float, float] = (6.4, 4.8)
     dpi: float = 100.0
     facecolor: str = "white"
     edgecolor: str = "white"
@@ -41,7 +41,7 @@ class FigureModel(BaseModel):
         arbitrary_types_allowed = True
 
 class FigureBaseModel(BaseModel):
-    figsize: tuple[float] = (6.4, 4.8)
+    figsize: tuple[float, float] = (6.4, 4.8)
     dpi: float = 100.0
     facecolor: str = "white"
     edgecolor: str = "white"
@@ -52,4 +52,5 @@ class FigureBaseModel(BaseModel):
     kwargs: Optional[KwargsFigureModel] = None
 
     class Config:
-        arbitrary_types_allowed = True
\ No newline at end of file
+        arbitrary_types_allowed = True
+        defer_build = True
\ No newline at end of file
@@ -1,9 +1,9 @@
-from pydantic import BaseModel
-from typing import List, Dict
+from pydantic import BaseModel, Field, field_validator
+from typing import List, Dict, Literal
 
 from models.figure import FigureModel
 from models.layout import LayoutModel
-from models.plot import PlotModel
+from models.plot import PLOT_MODELS, PlotModel
 
 
 class GraphModel(BaseModel):
@@ -14,10 +14,27 @@ class GraphModel(BaseModel):
 class ImageModel(BaseModel):
     save: bool = True
     format: str = "png"
-    figure: FigureModel = FigureModel()
-    layout: LayoutModel = LayoutModel()
-    graphs: Dict[int, GraphModel] = {0: GraphModel()}
-    plots: Dict[int, PlotModel] = {0: PlotModel()}
+    # NOTE: fast and small trade png/jpeg/webp encoding speed against size, default is savefig's
+    profile: Literal["default", "fast", "small"] = "default"
+    # NOTE: factories, pydantic deep copies model instance defaults on every validation
+    figure: FigureModel = Field(default_factory=FigureModel)
+    layout: LayoutModel = Field(default_factory=LayoutModel)
+    graphs: Dict[int, GraphModel] = Field(default_factory=lambda: {0: GraphModel()})
+    plots: Dict[int, PlotModel] = Field(default_factory=lambda: {0: PlotModel()})
 
     class Config:
         arbitrary_types_allowed = True
+
+    @field_validator("plots", mode="before")
+    @classmethod
+    def plot_models(cls, plots):
+        """Validates every plot with the model named by its plotType, PlotModel otherwise"""
+        if not isinstance(plots, dict):
+            return plots
+
+        return {
+            key: PLOT_MODELS.get(plot.get("plotType"), PlotModel).model_validate(plot)
+            if isinstance(plot, dict)
+            else plot
+            for key, plot in plots.items()
+        }
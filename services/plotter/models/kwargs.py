@@ -4,7 +4,7 @@ from typing import Optional, Callable, Literal, Any, List
 from matplotlib.patches import Patch
 from matplotlib.colors import Colormap, Normalize
 from matplotlib.path import Path
-from matplotlib.pyplot import Figure
+from matplotlib.figure import Figure
 from matplotlib.markers import MarkerStyle
 from matplotlib.transforms import Bbox, Transform, IdentityTransform
 from matplotlib._enums import CapStyle, JoinStyle
@@ -15,6 +15,8 @@ from matplotlib.layout_engine import LayoutEngine
 class KwargsModel(BaseModel):
     class Config:
         arbitrary_types_allowed = True
+        # NOTE: these schemas are large and rarely used, build them on first validation
+        defer_build = True
 
 
 class KwargsFigureModel(KwargsModel):
@@ -1,5 +1,9 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class LayoutModel(BaseModel):
-    pass
+    # NOTE: graphs fill the grid row by row, graph k is drawn in cell (k // ncols, k % ncols)
+    nrows: int = Field(default=1, ge=1)
+    ncols: int = Field(default=1, ge=1)
+    # NOTE: raster images draw every cell as its own tile on the render pool, then composite them
+    parallel: bool = False
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, List
 
 from models.image import ImageModel
@@ -7,4 +7,4 @@ from models.data import FileModel, FunctionModel
 
 class PayloadModel(BaseModel):
     data: Optional[List[FileModel | FunctionModel]] = None
-    image: ImageModel = ImageModel()
+    image: ImageModel = Field(default_factory=ImageModel)
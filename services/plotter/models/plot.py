@@ -1,4 +1,4 @@
-from typing import List, Literal, Optional
+from typing import ClassVar, List, Literal, Optional
 from matplotlib.colors import Colormap, Normalize
 from matplotlib.markers import MarkerStyle
 from models.kwargs import KwargsCollectionModel, KwargsLine2DModel
@@ -7,11 +7,19 @@ from pydantic import BaseModel
 
 
 class PlotModel(BaseModel):
+    # NOTE: lines need one y per x, the data of other plots may repeat index values
+    unique_index: ClassVar[bool] = True
+
     plotID: int = 0
     plotType: str = "LinePlotModel"
+    # NOTE: series longer than the axes width times points_per_pixel are decimated
+    decimation: Optional[Literal["lttb", "minmax"]] = None
+    points_per_pixel: float = 2.0
 
     class Config:
         arbitrary_types_allowed = True
+        # NOTE: the concrete plot models embed the kwargs models, build them on first validation
+        defer_build = True
 
 
 class BasicPlotModel(PlotModel):
@@ -45,18 +53,28 @@ class LinePlotModel(BasicPlotModel):
 
 
 class ScatterPlotModel(BasicPlotModel):
-    x: List[float]
-    y: List[float]
-    s: Optional[float | List[float]]
-    c: Optional[str | List[str]]
-    marker: MarkerStyle = "o"
+    unique_index: ClassVar[bool] = False
+
+    plotType: Literal["ScatterPlotModel"] = "ScatterPlotModel"
+    x: Optional[List[float]] = None
+    y: Optional[List[float]] = None
+    s: Optional[float | List[float]] = None
+    c: Optional[str | List[str]] = None
+    marker: str | MarkerStyle = "o"
     cmap: str | Colormap = "viridis"
-    norm: Optional[str | Normalize]
-    vmin: Optional[float]
-    vax: Optional[float]
+    norm: Optional[str | Normalize] = None
+    vmin: Optional[float] = None
+    vmax: Optional[float] = None
     alpha: float = None
     linewidths: float | List[float] = 1.5
     edgecolors: Literal["face", "none", None] | str | List[str] = "face"
     plotnonfinite: bool = False
-    data: Optional[dict | DataFrame]
-    kwargs: Optional[KwargsCollectionModel]
+    # NOTE: above density_threshold points (or with density set) the points are binned into
+    # a 2D histogram at the axes resolution and drawn as one image colored by cmap/norm
+    density: Optional[bool] = None
+    density_threshold: int = 100_000
+    data: Optional[dict | DataFrame] = None
+    kwargs: Optional[KwargsCollectionModel] = None
+
+
+PLOT_MODELS = {"ScatterPlotModel": ScatterPlotModel}
@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+from typing import Dict, List
+
+
+class IssueModel(BaseModel):
+    count: int = 0
+    rows: List[int] = []
+
+
+class ValidationReportModel(BaseModel):
+    valid: bool = True
+    rows: int = 0
+    columns: List[str] = []
+    non_numeric: Dict[str, IssueModel] = {}
+    non_finite: IssueModel = IssueModel()
+    duplicated_index: IssueModel = IssueModel()
+    monotonic_index: bool = True
@@ -0,0 +1,747 @@
+import asyncio
+import gzip
+import json
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import time
+import unittest
+from contextlib import contextmanager
+from io import BytesIO
+from unittest import mock
+
+import grpc
+import numpy as np
+import PIL.Image as Image
+import pyarrow as pa
+from pandas import DataFrame, date_range
+
+import proto.plotter_pb2_grpc as plotter_grpc
+import server
+import service
+from aio_server import AioPlotterServiceServicer
+from models.figure import FigureModel
+from models.data import FileModel, FunctionModel
+from proto.plotter_pb2 import BatchPlotRequest, Payload, PlotChunk, PlotRequest
+from server import PlotterServiceServicer
+from utils.cache import RenderCache
+from utils.compression import call_compression
+from utils.datasets import DatasetRegistry
+from utils.decimate import decimate
+from utils.exceptions import (
+    DatasetNotFoundError,
+    InvalidRequestError,
+    RenderCancelledError,
+    SessionNotFoundError,
+)
+from utils.figures import FigurePool
+from utils.functions import compile_function, sample_function
+from utils.metrics import REQUESTS, Histogram, timed
+from utils.pool import RenderPool, _init_worker
+from utils.sessions import SessionStore
+from utils.shared import SharedBlob, local_peer
+from utils.stream import open_chunks
+from utils import validator
+from utils.validator import validate_data
+from utils import wrapper
+from utils.wrapper import density_grid
+
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+@contextmanager
+def serve(mode: str = "sync", **kwargs):
+    """Stub of a plotter served on an ephemeral local port, by the asyncio server in aio mode"""
+    pool = RenderPool(mode="thread", workers=1)
+    if mode == "sync":
+        server = grpc.server(ThreadPoolExecutor(max_workers=4))
+        servicer = PlotterServiceServicer(pool, RenderCache(max_bytes=0), **kwargs)
+        plotter_grpc.add_PlotterServiceServicer_to_server(servicer, server)
+        port = server.add_insecure_port("127.0.0.1:0")
+        server.start()
+        stop = lambda: server.stop(None)
+    else:
+        loop = asyncio.new_event_loop()
+        threading.Thread(target=loop.run_forever, daemon=True).start()
+
+        async def start():
+            server = grpc.aio.server(migration_thread_pool=ThreadPoolExecutor(max_workers=4))
+            servicer = AioPlotterServiceServicer(pool, RenderCache(max_bytes=0), **kwargs)
+            plotter_grpc.add_PlotterServiceServicer_to_server(servicer, server)
+            port = server.add_insecure_port("127.0.0.1:0")
+            await server.start()
+            return server, port
+
+        server, port = asyncio.run_coroutine_threadsafe(start(), loop).result()
+        stop = lambda: asyncio.run_coroutine_threadsafe(server.stop(None), loop).result()
+
+    try:
+        with grpc.insecure_channel(f"127.0.0.1:{port}") as channel:
+            yield plotter_grpc.PlotterServiceStub(channel)
+    finally:
+        stop()
+        pool.shutdown()
+
+
+def requests_total(method: str, status: str) -> float:
+    sample = f'plotter_requests_total{{method="{method}",status="{status}"}} '
+    lines = [line for line in REQUESTS.samples() if line.startswith(sample)]
+
+    return float(lines[0][len(sample) :]) if lines else 0.0
+
+
+class TestPlotterService(unittest.TestCase):
+    rawData: bytes = None
+    encodedPayload: bytes = b'{ "data": [{"datatype":"file", "filename":"test_01.csv"}]}'
+
+    @classmethod
+    def setUpClass(cls):
+        with open("../../tests/data/test_01.csv", "rb") as f:
+            cls.rawData = f.read()
+
+    # NOTE: tests begin here
+
+    def test_render(self):
+        image = service.render(self.encodedPayload, self.rawData)
+        self.assertTrue(image.startswith(PNG_SIGNATURE))
+
+    def test_proto_payload(self):
+        payload = Payload()
+        payload.data.add().file.filename = "test_01.csv"
+        payload.image.figure.figsize.extend([4, 3])
+        payload.image.plots[0].decimation = "lttb"
+
+        encodedPayload = (
+            b'{"data": [{"datatype": "file", "filename": "test_01.csv"}],'
+            b' "image": {"figure": {"figsize": [4, 3]}, "plots": {"0": {"decimation": "lttb"}}}}'
+        )
+        exclude = {"image": {"figure": {"num"}}}
+        self.assertEqual(
+            service.decode(payload).model_dump(exclude=exclude),
+            service.decode(encodedPayload).model_dump(exclude=exclude),
+        )
+        self.assertTrue(service.render(payload, self.rawData).startswith(PNG_SIGNATURE))
+
+        payload.image.plots[0].decimation = "average"
+        with self.assertRaises(InvalidRequestError):
+            service.decode(payload)
+
+    def test_validation_report(self):
+        dataList = [FileModel(datatype="file", filename="test.csv")]
+        rawData = b"x,y,z\n0,1,2\n1,a,3\n1,nan,inf\n3,4,5\n"
+
+        with self.assertRaises(InvalidRequestError) as error:
+            validate_data(dataList=dataList, rawData=rawData)
+
+        report = error.exception.report
+        self.assertFalse(report.valid)
+        self.assertEqual(report.non_numeric["y"].rows, [1])
+        self.assertEqual(report.non_finite.rows, [2])
+        self.assertEqual(report.duplicated_index.rows, [2])
+        self.assertTrue(report.monotonic_index)
+
+    def test_csv_engines(self):
+        blobs = [
+            self.rawData,
+            b"x,y\n0.5,1\n1.5,2",
+            b"t,y\n2024-01-01,1\n2024-01-02,2\n",
+            b"t,y\n2024-01-01 10:00:00,1\n2024-01-01 11:00:00,2\n",
+            b"t,y\n10:00:00,1\n11:00:00,2\n",
+        ]
+        for rawData in blobs:
+            with self.subTest(rawData=rawData):
+                expected = validator.read_data(rawData, engine="c")
+                dataframe = validator.read_data(rawData, engine="pyarrow")
+                self.assertTrue(dataframe.equals(expected))
+                self.assertTrue(dataframe.index.equals(expected.index))
+                self.assertEqual(dataframe.index.dtype, expected.index.dtype)
+
+    def test_parse_once(self):
+        dataList = [
+            FileModel(datatype="file", filename="a.csv", plotID=plotID) for plotID in range(3)
+        ]
+        dataList.append(FileModel(datatype="file", filename="b.csv", plotID=3))
+        blobs = {"a.csv": self.rawData, "b.csv": b"x,y\n0,1\n1,2\n"}
+
+        with mock.patch.object(validator, "read_data", wraps=validator.read_data) as read_data:
+            validate_data(dataList=dataList, blobs=blobs)
+        self.assertEqual(read_data.call_count, 2)
+        # NOTE: the plots of a blob share its parsed frame
+        self.assertTrue(all(data.dataframe is not None for data in dataList))
+        self.assertTrue(
+            np.shares_memory(dataList[0].dataframe.to_numpy(), dataList[2].dataframe.to_numpy())
+        )
+
+    def test_named_blobs(self):
+        blobs = {"a.csv": self.rawData, "b.csv": gzip.compress(b"x,w\n0,-1\n1,-2\n2,-3\n")}
+        encodedPayload = json.dumps(
+            {
+                "data": [
+                    {"datatype": "file", "filename": "a.csv"},
+                    {"datatype": "file", "filename": "b.csv", "compression": "gzip"},
+                ]
+            }
+        )
+        payload = service.decode(encodedPayload)
+        keys = [validator.resolve_blob(data, blobs=blobs)[0] for data in payload.data]
+        self.assertEqual(keys, ["a.csv:csv:None", "b.csv:csv:gzip"])
+
+        frames = {}
+        validate_data(dataList=payload.data, blobs=blobs, frames=frames)
+        self.assertEqual(set(frames), {f"{key}:unique" for key in keys})
+
+        # NOTE: both blobs overlay on the axes of plot 0
+        with mock.patch.object(wrapper, "build_plots", wraps=wrapper.build_plots) as build_plots:
+            image = service.render(encodedPayload, blobs=blobs)
+        self.assertTrue(image.startswith(PNG_SIGNATURE))
+        drawn = [call.args for call in build_plots.call_args_list]
+        self.assertEqual(len(drawn), 2)
+        self.assertIs(drawn[0][0], drawn[1][0])
+        self.assertEqual([list(args[2].columns) for args in drawn], [["y", "z"], ["w"]])
+        empty = {**blobs, "b.csv": gzip.compress(b"x,w\n")}
+        self.assertNotEqual(image, service.render(encodedPayload, blobs=empty))
+
+        with self.assertRaises(InvalidRequestError) as raised:
+            service.render(encodedPayload, blobs={"a.csv": self.rawData})
+        self.assertIn("b.csv", raised.exception.details())
+
+    def test_binary_formats(self):
+        buffer = BytesIO()
+        np.save(buffer, np.asfortranarray([[0.0, 1.0], [1.0, 4.0], [2.0, 9.0]]))
+        rawData = buffer.getvalue()
+
+        dataList = [FileModel(datatype="file", filename="test.npy", format="npy")]
+        validate_data(dataList=dataList, rawData=rawData)
+
+        dataframe = dataList[0].dataframe
+        self.assertEqual(dataframe.index.tolist(), [0.0, 1.0, 2.0])
+        self.assertEqual(dataframe["y"].tolist(), [1.0, 4.0, 9.0])
+        # NOTE: the frame is a view of the received buffer
+        self.assertTrue(
+            np.shares_memory(dataframe["y"].to_numpy(), np.frombuffer(rawData, dtype=np.uint8))
+        )
+
+    def test_compressed_data(self):
+        image = service.render(self.encodedPayload, self.rawData)
+        compressed = {
+            "gzip": gzip.compress(self.rawData),
+            "zstd": pa.compress(self.rawData, "zstd", asbytes=True),
+        }
+        for compression, rawData in compressed.items():
+            with self.subTest(compression=compression):
+                encodedPayload = json.dumps(
+                    {"data": [{"datatype": "file", "filename": "t", "compression": compression}]}
+                )
+                self.assertEqual(service.render(encodedPayload, rawData), image)
+                # NOTE: a streamed blob is decompressed while its chunks arrive
+                chunks = open_chunks(rawData[i : i + 16] for i in range(0, len(rawData), 16))
+                self.assertEqual(service.render(encodedPayload, chunks), image)
+                with self.assertRaises(InvalidRequestError):
+                    service.render(encodedPayload, rawData[: len(rawData) // 2])
+
+        self.assertEqual(call_compression(100, "gzip", min_bytes=1024), grpc.Compression.NoCompression)
+        self.assertEqual(call_compression(4096, "gzip", min_bytes=1024), grpc.Compression.Gzip)
+
+    def test_decimation(self):
+        x = np.arange(100_000, dtype="float64")
+        y = np.sin(x / 500)
+        y[54_321] = 10.0
+
+        for method in ("lttb", "minmax"):
+            with self.subTest(method=method):
+                positions = decimate(x, y, method, 1000)
+                self.assertLessEqual(len(positions), 1000)
+                self.assertIn(54_321, positions)
+                self.assertEqual((positions[0], positions[-1]), (0, len(x) - 1))
+                self.assertTrue(np.all(np.diff(positions) > 0))
+
+    def test_function(self):
+        function = compile_function(r"$y = \frac{1}{2}x^2 + 3\sin x$")
+        self.assertIs(function, compile_function(r"$y = \frac{1}{2}x^2 + 3\sin x$"))
+        np.testing.assert_allclose(function(np.array([0.0, 2.0])), [0.0, 2.0 + 3 * np.sin(2.0)])
+
+        with self.assertRaises(InvalidRequestError):
+            compile_function("__import__('os').getcwd()")
+
+        # NOTE: exact integer powers would grow for minutes, float ones overflow at once
+        started = time.perf_counter()
+        for expression in ("9^9^9 x", "x^{99999}", "1/0 + x"):
+            with self.subTest(expression=expression):
+                dataList = [FunctionModel(datatype="Function", function=expression, limits=(0, 1))]
+                with self.assertRaises(InvalidRequestError):
+                    validate_data(dataList=dataList)
+        self.assertLess(time.perf_counter() - started, 1)
+
+        for samples in ({"resolution": 2_000_000_000}, {"max_points": 2_000_000_000}):
+            with self.subTest(**samples):
+                function = {"datatype": "Function", "function": "x", "limits": [0, 1], **samples}
+                with self.assertRaises(InvalidRequestError):
+                    validate_data(dataList=[FunctionModel(**function)])
+        with serve() as stub, self.assertRaises(grpc.RpcError) as raised:
+            stub.GeneratePlot(PlotRequest(encodedPayload=json.dumps({"data": [function]}).encode()))
+        self.assertEqual(raised.exception.code(), grpc.StatusCode.INVALID_ARGUMENT)
+
+        dataframe = sample_function(compile_function("sin(1/x)"), limits=(0.01, 1.0), resolution=50)
+        self.assertTrue(dataframe.index.is_monotonic_increasing)
+        self.assertGreater(len(dataframe), 50)
+        self.assertLess(len(dataframe), 10_000)
+
+    def test_figure_pool(self):
+        pool = FigurePool(size=1)
+        figureModel = FigureModel(figsize=(4, 3), dpi=50)
+
+        with pool.figure(figureModel) as fig:
+            fig.subplots(1, 1).plot([0, 1], [1, 0])
+        with pool.figure(FigureModel()) as recycled:
+            self.assertIs(recycled, fig)
+            self.assertEqual(len(recycled.axes), 0)
+            self.assertEqual(tuple(recycled.get_size_inches()), (6.4, 4.8))
+            self.assertEqual(recycled.dpi, 100.0)
+
+    def test_figure_templates(self):
+        dates = DataFrame({"y": [1.0, 3.0, 2.0]}, index=date_range("2024-01-01", periods=3))
+        dates = dates.to_csv().encode("utf8")
+        wide = DataFrame({name: np.arange(10.0) * 1e4 for name in "abc"}, index=np.arange(-5.0, 5.0))
+        wide = wide.to_csv().encode("utf8")
+        grid = b', "image": {"layout": {"nrows": 2, "ncols": 2}, "graphs": {"0": {"plot_id_list": [0]}}}}'
+        grid = self.encodedPayload[:-1] + grid
+        figure_pool = wrapper.figure_pool
+        try:
+            for name, encodedPayload, rawData in (
+                ("line", self.encodedPayload, self.rawData),
+                ("grid", grid, self.rawData),
+                ("dates", self.encodedPayload, dates),
+            ):
+                with self.subTest(name=name):
+                    wrapper.figure_pool = FigurePool(size=2)
+                    fresh = service.render(encodedPayload, rawData)
+                    # NOTE: same settings, other data, the template is drawn on twice
+                    service.render(encodedPayload, wide)
+                    self.assertEqual(service.render(encodedPayload, rawData), fresh)
+                    self.assertGreaterEqual(wrapper.figure_pool.stats()["hits"], 1)
+        finally:
+            wrapper.figure_pool = figure_pool
+
+    def test_template_limits(self):
+        blobs = {"wide.csv": b"x,y\n1000,5000\n2000,9000\n", "unit.csv": b"x,y\n0,0\n1,1\n"}
+        empty = json.dumps({"data": [], "image": {"graphs": {"0": {"plot_id_list": []}}}})
+        unit = json.dumps({"data": [{"datatype": "file", "filename": "unit.csv"}]})
+        data = [{"datatype": "file", "filename": "wide.csv"}]
+        interlopers = {
+            "line": json.dumps({"data": data}),
+            "density": json.dumps(
+                {"data": data, "image": {"plots": {"0": {"plotType": "ScatterPlotModel", "density": True}}}}
+            ),
+        }
+        figure_pool = wrapper.figure_pool
+        try:
+            for encodedPayload in (empty, unit):
+                wrapper.figure_pool = FigurePool(size=1)
+                fresh = service.render(encodedPayload, blobs=blobs)
+                for name, interloper in interlopers.items():
+                    with self.subTest(encodedPayload=encodedPayload, interloper=name):
+                        # NOTE: the template of the populated chart shows its data range no more
+                        service.render(interloper, blobs=blobs)
+                        self.assertEqual(service.render(encodedPayload, blobs=blobs), fresh)
+
+            pool = FigurePool(size=1)
+            layoutModel = service.decode(unit).image.layout
+            with pool.figure(FigureModel(), layoutModel) as fig:
+                fig.axes[0].set_xscale("log")
+                fig.axes[0].plot([1, 10], [1, 10])
+            with pool.figure(FigureModel(), layoutModel) as recycled:
+                self.assertIs(recycled, fig)
+                self.assertEqual(recycled.axes[0].get_xscale(), "linear")
+                self.assertEqual(recycled.axes[0].get_xlim(), (0.0, 1.0))
+            self.assertEqual(pool.stats()["hits"], 1)
+        finally:
+            wrapper.figure_pool = figure_pool
+
+    def test_render_cache(self):
+        key = RenderCache.key(self.encodedPayload, self.rawData)
+        self.assertEqual(
+            key, RenderCache.key(b'{"data":[{"filename":"test_01.csv","datatype":"file"}]}', self.rawData)
+        )
+
+        with tempfile.TemporaryDirectory() as directory:
+            cache = RenderCache(max_bytes=8, directory=directory, disk_max_bytes=100)
+            started, release = threading.Event(), threading.Event()
+
+            def slow_render():
+                started.set()
+                release.wait()
+                return b"image"
+
+            owner = threading.Thread(target=cache.get_or_render, args=(key, slow_render))
+            owner.start()
+            started.wait()
+            waiter = threading.Thread(target=cache.get_or_render, args=(key, self.fail))
+            waiter.start()
+            release.set()
+            owner.join()
+            waiter.join()
+
+            cache.get_or_render("other", lambda: b"other")
+            self.assertEqual(cache.get_or_render(key, self.fail), b"image")
+
+            stats = cache.stats()
+            self.assertEqual(stats["misses"], 2)
+            self.assertEqual(stats["coalesced"], 1)
+            self.assertEqual(stats["evictions"], 2)
+            self.assertEqual(stats["disk_hits"], 1)
+
+    def test_recycled_figure_dpi(self):
+        for dpi in (50, 60):
+            with self.subTest(dpi=dpi):
+                encodedPayload = self.encodedPayload[:-1] + b', "image": {"figure": {"dpi": %d}}}' % dpi
+                image = Image.open(BytesIO(service.render(encodedPayload, self.rawData)))
+                self.assertEqual(image.size, (6.4 * dpi, 4.8 * dpi))
+
+    def test_render_profiles(self):
+        for format, profile, mode in (
+            ("png", "fast", "RGBA"),
+            ("png", "small", "P"),
+            ("jpeg", "fast", "RGB"),
+            ("webp", "small", "RGB"),
+        ):
+            with self.subTest(format=format, profile=profile):
+                image = b', "image": {"format": "%s", "profile": "%s"}}' % (format.encode(), profile.encode())
+                encodedPayload = self.encodedPayload[:-1] + image
+                image = Image.open(BytesIO(service.render(encodedPayload, self.rawData)))
+                self.assertEqual((image.format.lower(), image.mode), (format, mode))
+                self.assertEqual(image.size, (640, 480))
+
+        encodedPayload = self.encodedPayload[:-1] + b', "image": {"format": "rgba", "profile": "fast"}}'
+        self.assertEqual(len(service.render(encodedPayload, self.rawData)), 640 * 480 * 4)
+
+    def test_tiled_layout(self):
+        encodedPayload = (
+            b'{"data": [{"datatype": "file", "filename": "test_01.csv"}], "image": {'
+            b'"layout": {"nrows": 2, "ncols": 2, "parallel": true},'
+            b' "graphs": {"0": {"plot_id_list": [0]}, "3": {"plot_id_list": [0]}}}}'
+        )
+        payload = service.decode(encodedPayload)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            tiled = Image.open(BytesIO(service.render_tiles(executor.submit, payload, self.rawData)))
+        whole = Image.open(BytesIO(service.render(encodedPayload, self.rawData)))
+
+        self.assertEqual(tiled.size, whole.size)
+        # NOTE: cells 1 and 2 have no graph and show the white figure background
+        self.assertEqual(tiled.convert("RGB").getpixel((480, 120)), (255, 255, 255))
+        self.assertLess(np.asarray(tiled.convert("L").crop((0, 0, 320, 240))).min(), 255)
+
+    def test_scatter_density(self):
+        x = np.repeat(np.arange(1000.0), 200)
+        rawData = DataFrame({"y": np.sin(x) + np.tile(np.linspace(0, 1, 200), 1000)}, index=x)
+        rawData = rawData.to_csv().encode("utf8")
+        scatter = b'{"plotType": "ScatterPlotModel", "cmap": "magma", "density_threshold": 100000}'
+        encodedPayload = (
+            b'{"data": [{"datatype": "file", "filename": "scatter.csv"}], "image": {'
+            b'"plots": {"0": ' + scatter + b"}}}"
+        )
+        self.assertTrue(service.render(encodedPayload, rawData).startswith(PNG_SIGNATURE))
+        # NOTE: repeated x values are fine for a scatter, a line plot needs a unique index
+        with self.assertRaises(InvalidRequestError):
+            service.render(encodedPayload.replace(scatter, b"{}"), rawData)
+
+        counts, extent = density_grid(x, [x * 2], (40, 60))
+        self.assertEqual(counts.sum(), len(x))
+        self.assertEqual(extent[0], 0)
+
+    def test_live_session(self):
+        store = SessionStore(idle_timeout=60)
+        session_id, image = store.open(service.decode(self.encodedPayload), self.rawData)
+        self.assertTrue(image.startswith(PNG_SIGNATURE))
+
+        image = store.append(session_id, rawData=b"x,y,z\n9,81,0\n10,100,-1\n")
+        self.assertTrue(image.startswith(PNG_SIGNATURE))
+        with self.assertRaises(InvalidRequestError):
+            store.append(session_id, rawData=b"x,y\n11,121\n")
+
+        # NOTE: the lines copied the data they draw, the session doesn't keep the frames
+        session = store._sessions[session_id]
+        self.assertTrue(all(data.dataframe is None for data in session.payload.data))
+        self.assertEqual(store.stats()["bytes"], session.nbytes)
+
+        store.close(session_id)
+        with self.assertRaises(SessionNotFoundError):
+            store.append(session_id, rawData=b"x,y,z\n11,121,-2\n")
+
+        expiring = SessionStore(idle_timeout=0)
+        session_id, _ = expiring.open(service.decode(self.encodedPayload), self.rawData)
+        expiring.expire()
+        self.assertEqual(expiring.stats()["sessions"], 0)
+
+    def test_session_sweeper(self):
+        store = SessionStore(idle_timeout=1, sweep_interval=0.05)
+        try:
+            store.open(service.decode(self.encodedPayload), self.rawData)
+            self.assertEqual(store.stats()["sessions"], 1)
+            # NOTE: no further calls, the sweeper closes the idle session on its own
+            deadline = time.monotonic() + 5
+            while store.stats()["sessions"] and time.monotonic() < deadline:
+                time.sleep(0.05)
+            self.assertEqual(store.stats(), {"sessions": 0, "bytes": 0})
+        finally:
+            store.shutdown()
+
+    def test_session_close_race(self):
+        store = SessionStore(idle_timeout=60)
+        session_id, _ = store.open(service.decode(self.encodedPayload), self.rawData)
+        session = store._sessions[session_id]
+
+        # NOTE: an eviction closing the session waits for the update drawing into it
+        drawing, release = threading.Event(), threading.Event()
+        encode = session.encode
+
+        def slow_encode():
+            drawing.set()
+            release.wait()
+            return encode()
+
+        with mock.patch.object(session, "encode", slow_encode):
+            appender = ThreadPoolExecutor(max_workers=1).submit(
+                store.append, session_id, b"x,y,z\n9,81,0\n"
+            )
+            drawing.wait()
+            closer = threading.Thread(target=store.close, args=(session_id,))
+            closer.start()
+            try:
+                closer.join(0.2)
+                self.assertTrue(closer.is_alive())
+                self.assertTrue(session._fig.axes)
+            finally:
+                release.set()
+            self.assertTrue(appender.result().startswith(PNG_SIGNATURE))
+            closer.join()
+        self.assertTrue(session.closed)
+        self.assertFalse(session._fig.axes)
+
+        # NOTE: closed between its lookup and its update, the session isn't drawn into
+        session_id, _ = store.open(service.decode(self.encodedPayload), self.rawData)
+        session = store._sessions[session_id]
+        session.close()
+        with mock.patch.object(store, "_get", return_value=session):
+            with self.assertRaises(SessionNotFoundError):
+                store.append(session_id, rawData=b"x,y,z\n9,81,0\n")
+
+    def test_shared_data(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = f"{directory}/shared.csv"
+            with open(path, "wb") as f:
+                f.write(b"header" + self.rawData + b"trailer")
+            shared = SharedBlob(path, offset=6, length=len(self.rawData))
+            self.assertEqual(shared.map().tobytes(), self.rawData)
+            image = service.render(self.encodedPayload, shared)
+            self.assertTrue(image.startswith(PNG_SIGNATURE))
+
+        self.assertTrue(local_peer("ipv4:127.0.0.1:50000"))
+        self.assertTrue(local_peer("ipv6:[::1]:50000"))
+        self.assertTrue(local_peer("unix:/tmp/plotter.sock"))
+        self.assertFalse(local_peer("ipv4:10.0.0.2:50000"))
+
+    def test_datasets(self):
+        with tempfile.TemporaryDirectory() as directory:
+            registry = DatasetRegistry(max_bytes=1024 * 1024, spill_directory=directory)
+            dataset_id, dataframe = registry.upload(self.rawData)
+            self.assertEqual(registry.upload(self.rawData)[0], dataset_id)
+            self.assertEqual(registry.stats()["uploads"], 1)
+
+            encodedPayload = f'{{"data": [{{"datatype": "file", "dataset_id": "{dataset_id}"}}]}}'
+            datasets = registry.resolve(service.decode(encodedPayload))
+            image = service.render(encodedPayload, datasets=datasets)
+            self.assertTrue(image.startswith(PNG_SIGNATURE))
+
+            # NOTE: a second dataset beyond the budget spills the first, read back on use
+            registry._max_bytes = dataframe.memory_usage().sum() + 1
+            registry.upload(b"x,y\n1,1\n2,2\n")
+            self.assertEqual(registry.stats()["spilled"], 1)
+            self.assertTrue(registry.get(dataset_id).equals(dataframe))
+
+            duplicated = registry.upload(b"x,y\n1,1\n1,2\n")[0]
+            scatter = {"plots": {"0": {"plotType": "ScatterPlotModel"}}}
+            data = [{"datatype": "file", "dataset_id": duplicated}]
+            datasets = {duplicated: registry.get(duplicated)}
+            service.render(json.dumps({"data": data, "image": scatter}), datasets=datasets)
+            with self.assertRaises(InvalidRequestError):
+                service.render(json.dumps({"data": data}), datasets=datasets)
+
+            registry._ttl = -1
+            registry.expire()
+            with self.assertRaises(DatasetNotFoundError):
+                registry.get(dataset_id)
+
+    def test_stream_dataset(self):
+        registry = DatasetRegistry()
+        dataset_id, _ = registry.upload(self.rawData)
+        encodedPayload = json.dumps({"data": [{"datatype": "file", "dataset_id": dataset_id}]})
+        with serve(datasets=registry) as stub:
+            chunks = stub.GeneratePlotStream(iter([PlotChunk(encodedPayload=encodedPayload.encode())]))
+            self.assertTrue(b"".join(chunk.image for chunk in chunks).startswith(PNG_SIGNATURE))
+
+            with self.assertRaises(grpc.RpcError) as raised:
+                unknown = encodedPayload.replace(dataset_id, "0" * 64).encode()
+                list(stub.GeneratePlotStream(iter([PlotChunk(encodedPayload=unknown)])))
+            self.assertEqual(raised.exception.code(), grpc.StatusCode.NOT_FOUND)
+
+    def test_stage_metrics(self):
+        image, stages = timed(time.perf_counter(), service.render, self.encodedPayload, self.rawData)
+        self.assertTrue(image.startswith(PNG_SIGNATURE))
+        self.assertLessEqual({"queue", "decode", "validate", "figure", "plots", "encode"}, set(stages))
+
+        histogram = Histogram("test_seconds", "Test", ("stage",), buckets=(0.1, 1))
+        histogram.observe(0.05, stage="decode")
+        histogram.observe(2, stage="decode")
+        exposed = histogram.expose()
+        self.assertIn('test_seconds_bucket{stage="decode",le="0.1"} 1', exposed)
+        self.assertIn('test_seconds_bucket{stage="decode",le="+Inf"} 2', exposed)
+        self.assertIn('test_seconds_count{stage="decode"} 2', exposed)
+
+    def test_request_status(self):
+        for mode in ("sync", "aio"):
+            with self.subTest(mode=mode), serve(mode) as stub:
+                failed = requests_total("GeneratePlotStream", "INVALID_ARGUMENT")
+                with self.assertRaises(grpc.RpcError) as raised:
+                    list(stub.GeneratePlotStream(iter([PlotChunk(rawData=b"x,y\n")])))
+                self.assertEqual(raised.exception.code(), grpc.StatusCode.INVALID_ARGUMENT)
+                self.assertIn("encodedPayload first", raised.exception.details())
+                # NOTE: the failure is counted under the status the handler aborted with, once
+                # the handler unwound, which can be just after the client got the status
+                deadline = time.monotonic() + 1
+                while requests_total("GeneratePlotStream", "INVALID_ARGUMENT") == failed:
+                    if time.monotonic() > deadline:
+                        break
+                    time.sleep(0.01)
+                self.assertEqual(
+                    requests_total("GeneratePlotStream", "INVALID_ARGUMENT"), failed + 1
+                )
+
+    def test_batch_errors(self):
+        blobs = {"good.csv": self.rawData, "bad.csv": b"x,y\n1,a\n", "dup.csv": b"x,y\n1,1\n1,2\n"}
+        scatter = {"plots": {"0": {"plotType": "ScatterPlotModel"}}}
+        payloads = [
+            {"data": [{"datatype": "file", "filename": "good.csv"}]},
+            {"data": [{"datatype": "file", "filename": "bad.csv"}]},
+            {"data": [{"datatype": "file", "filename": "dup.csv"}]},
+            {"data": [{"datatype": "file", "filename": "dup.csv"}], "image": scatter},
+            {"data": [{"datatype": "file", "filename": "missing.csv"}]},
+        ]
+        valid = [True, False, False, True, False]
+
+        # NOTE: every blob is parsed once, however many payloads fail on it
+        with mock.patch.object(validator, "read_data", wraps=validator.read_data) as read_data:
+            errors = service.validate_batch(
+                [service.decode(json.dumps(payload)) for payload in payloads], blobs=blobs
+            )
+        self.assertEqual([error is None for error in errors], valid)
+        self.assertEqual(read_data.call_count, 3)
+
+        with serve() as stub:
+            request = BatchPlotRequest(
+                encodedPayloads=[json.dumps(payload).encode() for payload in payloads],
+                dataBlobs=blobs,
+            )
+            responses = {response.index: response for response in stub.GeneratePlots(request)}
+        self.assertEqual([responses[index].image != b"" for index in range(len(payloads))], valid)
+        self.assertEqual([responses[index].error == "" for index in range(len(payloads))], valid)
+
+    def test_batch_render_errors(self):
+        def build(payload):
+            if payload.image.figure.dpi == 51:
+                raise RuntimeError("draw failed")
+            return service.build(payload)
+
+        data = [{"datatype": "file", "filename": "good.csv"}]
+        payloads = [
+            {"data": data},
+            {"data": data, "image": {"figure": {"dpi": 51}}},
+            {"data": data, "image": {"figure": {"dpi": 50}}},
+        ]
+        request = BatchPlotRequest(
+            encodedPayloads=[json.dumps(payload).encode() for payload in payloads],
+            dataBlobs={"good.csv": self.rawData},
+        )
+        with serve() as stub, mock.patch.object(server, "build", build):
+            with self.assertLogs("plotter", level="ERROR"):
+                responses = {response.index: response for response in stub.GeneratePlots(request)}
+
+        self.assertEqual(sorted(responses), [0, 1, 2])
+        self.assertIn("draw failed", responses[1].error)
+        self.assertEqual(responses[1].image, b"")
+        for index in (0, 2):
+            self.assertEqual(responses[index].error, "")
+            self.assertTrue(responses[index].image.startswith(PNG_SIGNATURE))
+
+    def test_stream_header(self):
+        with serve() as stub:
+            for encodedPayload in (b"{not json", b'{"data": [{"datatype": "file"}]}'):
+                with self.subTest(encodedPayload=encodedPayload):
+                    chunks = [PlotChunk(encodedPayload=encodedPayload), PlotChunk(rawData=self.rawData)]
+                    with self.assertRaises(grpc.RpcError) as raised:
+                        list(stub.GeneratePlotStream(iter(chunks)))
+                    self.assertEqual(raised.exception.code(), grpc.StatusCode.INVALID_ARGUMENT)
+
+    def test_stream_chunks(self):
+        with serve(chunk_size=1024) as stub:
+            expected = stub.GeneratePlot(
+                PlotRequest(encodedPayload=self.encodedPayload, rawData=self.rawData)
+            ).image
+
+            # NOTE: rows split across the data chunks, reassembled by the server
+            size = len(self.rawData) // 3 + 1
+            chunks = [PlotChunk(encodedPayload=self.encodedPayload)] + [
+                PlotChunk(rawData=self.rawData[offset : offset + size])
+                for offset in range(0, len(self.rawData), size)
+            ]
+            images = [chunk.image for chunk in stub.GeneratePlotStream(iter(chunks))]
+
+        self.assertGreater(len(images), 1)
+        self.assertTrue(all(len(image) <= 1024 for image in images))
+        image = b"".join(images)
+        self.assertEqual(image, expected)
+        Image.open(BytesIO(image)).verify()
+
+    def test_render_pool(self):
+        for mode in ("thread", "process"):
+            with self.subTest(mode=mode):
+                pool = RenderPool(mode=mode, workers=2, max_tasks_per_worker=1)
+                try:
+                    images = [
+                        pool.submit(service.render, self.encodedPayload, self.rawData)
+                        for _ in range(4)
+                    ]
+                    for image in images:
+                        self.assertTrue(image.result().startswith(PNG_SIGNATURE))
+                finally:
+                    pool.shutdown()
+
+    def test_warm_up(self):
+        duration = service.warm_up()
+        self.assertIsInstance(duration, float)
+        self.assertGreater(duration, 0)
+        # NOTE: the initializer of the render processes, without a memory ceiling
+        _init_worker(memory_limit_mb=0, warm_up=True)
+
+        for mode in ("thread", "process"):
+            with self.subTest(mode=mode):
+                pool = RenderPool(mode=mode, workers=1, warm_up=True)
+                try:
+                    pool.warm_up()
+                    image = pool.run(service.render, self.encodedPayload, self.rawData)
+                    self.assertTrue(image.startswith(PNG_SIGNATURE))
+                finally:
+                    pool.shutdown()
+
+    def test_render_cancelled(self):
+        with self.assertRaises(RenderCancelledError):
+            service.render(self.encodedPayload, self.rawData, deadline=time.time() - 1)
+
+        cancelled = threading.Event()
+        cancelled.set()
+        with self.assertRaises(RenderCancelledError):
+            service.render(self.encodedPayload, self.rawData, cancelled=cancelled)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# source: proto/plotter.proto
+"""Generated protocol buffer code."""
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x13proto/plotter.proto\x12\x07plotter\"\xf1\x02\n\x0bPlotRequest\x12\x0f\n\x07rawData\x18\x01 \x01(\x0c\x12\x16\n\x0e\x65ncodedPayload\x18\x02 \x01(\x0c\x12\x36\n\tdataBlobs\x18\x03 \x03(\x0b\x32#.plotter.PlotRequest.DataBlobsEntry\x12!\n\x07payload\x18\x04 \x01(\x0b\x32\x10.plotter.Payload\x12\'\n\nsharedData\x18\x05 \x01(\x0b\x32\x13.plotter.SharedData\x12:\n\x0bsharedBlobs\x18\x06 \x03(\x0b\x32%.plotter.PlotRequest.SharedBlobsEntry\x1a\x30\n\x0e\x44\x61taBlobsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x0c:\x02\x38\x01\x1aG\n\x10SharedBlobsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\"\n\x05value\x18\x02 \x01(\x0b\x32\x13.plotter.SharedData:\x02\x38\x01\":\n\nSharedData\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x0e\n\x06offset\x18\x02 \x01(\x04\x12\x0e\n\x06length\x18\x03 \x01(\x04\"\x1d\n\x0cPlotResponse\x12\r\n\x05image\x18\x01 \x01(\x0c\"\xde\x02\n\x10\x42\x61tchPlotRequest\x12\x0f\n\x07rawData\x18\x01 \x01(\x0c\x12;\n\tdataBlobs\x18\x02 \x03(\x0b\x32(.plotter.BatchPlotRequest.DataBlobsEntry\x12\x17\n\x0f\x65ncodedPayloads\x18\x03 \x03(\x0c\x12\'\n\nsharedData\x18\x04 \x01(\x0b\x32\x13.plotter.SharedData\x12?\n\x0bsharedBlobs\x18\x05 \x03(\x0b\x32*.plotter.BatchPlotRequest.SharedBlobsEntry\x1a\x30\n\x0e\x44\x61taBlobsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x0c:\x02\x38\x01\x1aG\n\x10SharedBlobsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\"\n\x05value\x18\x02 \x01(\x0b\x32\x13.plotter.SharedData:\x02\x38\x01\"@\n\x11\x42\x61tchPlotResponse\x12\r\n\x05index\x18\x01 \x01(\r\x12\r\n\x05image\x18\x02 \x01(\x0c\x12\r\n\x05\x65rror\x18\x03 \x01(\t\"A\n\tPlotChunk\x12\x18\n\x0e\x65ncodedPayload\x18\x01 \x01(\x0cH\x00\x12\x11\n\x07rawData\x18\x02 \x01(\x0cH\x00\x42\x07\n\x05\x63hunk\"\x1b\n\nImageChunk\x12\r\n\x05image\x18\x01 \x01(\x0c\"4\n\x0fSessionResponse\x12\x12\n\nsession_id\x18\x01 \x01(\t\x12\r\n\x05image\x18\x02 \x01(\x0c\"\xa8\x01\n\x11\x41ppendDataRequest\x12\x12\n\nsession_id\x18\x01 \x01(\t\x12\x0f\n\x07rawData\x18\x02 \x01(\x0c\x12<\n\tdataBlobs\x18\x03 \x03(\x0b\x32).plotter.AppendDataRequest.DataBlobsEntry\x1a\x30\n\x0e\x44\x61taBlobsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x0c:\x02\x38\x01\")\n\x13\x43loseSessionRequest\x12\x12\n\nsession_id\x18\x01 \x01(\t\"\x16\n\x14\x43loseSessionResponse\"L\n\x14UploadDatasetRequest\x12\x0f\n\x07rawData\x18\x01 \x01(\x0c\x12\x0e\n\x06\x66ormat\x18\x02 \x01(\t\x12\x13\n\x0b\x63ompression\x18\x03 \x01(\t\"J\n\x15UploadDatasetResponse\x12\x12\n\ndataset_id\x18\x01 \x01(\t\x12\x0c\n\x04rows\x18\x02 \x01(\x04\x12\x0f\n\x07\x63olumns\x18\x03 \x03(\t\"\x13\n\x11\x43\x61\x63heStatsRequest\"\xf8\x01\n\x12\x43\x61\x63heStatsResponse\x12\x0c\n\x04hits\x18\x01 \x01(\x04\x12\x11\n\tdisk_hits\x18\x02 \x01(\x04\x12\x0e\n\x06misses\x18\x03 \x01(\x04\x12\x11\n\tcoalesced\x18\x04 \x01(\x04\x12\x11\n\tevictions\x18\x05 \x01(\x04\x12\x16\n\x0e\x64isk_evictions\x18\x06 \x01(\x04\x12\x0f\n\x07\x65ntries\x18\x07 \x01(\x04\x12\r\n\x05\x62ytes\x18\x08 \x01(\x04\x12\x11\n\tmax_bytes\x18\t \x01(\x04\x12\x14\n\x0c\x64isk_entries\x18\n \x01(\x04\x12\x12\n\ndisk_bytes\x18\x0b \x01(\x04\x12\x16\n\x0e\x64isk_max_bytes\x18\x0c \x01(\x04\"E\n\x07Payload\x12\x1b\n\x04\x64\x61ta\x18\x01 \x03(\x0b\x32\r.plotter.Data\x12\x1d\n\x05image\x18\x02 \x01(\x0b\x32\x0e.plotter.Image\"\x8f\x01\n\x04\x44\x61ta\x12\x0e\n\x06plotID\x18\x01 \x01(\r\x12\x0f\n\x07graphID\x18\x02 \x01(\r\x12\x0e\n\x06limits\x18\x03 \x03(\x01\x12!\n\x04\x66ile\x18\x04 \x01(\x0b\x32\x11.plotter.FileDataH\x00\x12)\n\x08\x66unction\x18\x05 \x01(\x0b\x32\x15.plotter.FunctionDataH\x00\x42\x08\n\x06source\"\xf6\x01\n\x08\x46ileData\x12\x10\n\x08\x66ilename\x18\x01 \x01(\t\x12\x13\n\x06\x66ormat\x18\x02 \x01(\tH\x00\x88\x01\x01\x12\x0c\n\x04\x61xis\x18\x03 \x03(\t\x12\x38\n\x0c\x63olumn_names\x18\x04 \x03(\x0b\x32\".plotter.FileData.ColumnNamesEntry\x12\x12\n\ndataset_id\x18\x05 \x01(\t\x12\x18\n\x0b\x63ompression\x18\x06 \x01(\tH\x01\x88\x01\x01\x1a\x32\n\x10\x43olumnNamesEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\x42\t\n\x07_formatB\x0e\n\x0c_compression\"\xba\x01\n\x0c\x46unctionData\x12\x10\n\x08\x66unction\x18\x01 \x01(\t\x12\x17\n\nresolution\x18\x02 \x01(\rH\x00\x88\x01\x01\x12\x15\n\x08\x61\x64\x61ptive\x18\x03 \x01(\x08H\x01\x88\x01\x01\x12\x16\n\ttolerance\x18\x04 \x01(\x01H\x02\x88\x01\x01\x12\x17\n\nmax_points\x18\x05 \x01(\rH\x03\x88\x01\x01\x42\r\n\x0b_resolutionB\x0b\n\t_adaptiveB\x0c\n\n_toleranceB\r\n\x0b_max_points\"\xf9\x02\n\x05Image\x12\x11\n\x04save\x18\x01 \x01(\x08H\x00\x88\x01\x01\x12\x13\n\x06\x66ormat\x18\x02 \x01(\tH\x01\x88\x01\x01\x12\x1f\n\x06\x66igure\x18\x03 \x01(\x0b\x32\x0f.plotter.Figure\x12*\n\x06graphs\x18\x04 \x03(\x0b\x32\x1a.plotter.Image.GraphsEntry\x12(\n\x05plots\x18\x05 \x03(\x0b\x32\x19.plotter.Image.PlotsEntry\x12\x14\n\x07profile\x18\x06 \x01(\tH\x02\x88\x01\x01\x12\x1f\n\x06layout\x18\x07 \x01(\x0b\x32\x0f.plotter.Layout\x1a=\n\x0bGraphsEntry\x12\x0b\n\x03key\x18\x01 \x01(\r\x12\x1d\n\x05value\x18\x02 \x01(\x0b\x32\x0e.plotter.Graph:\x02\x38\x01\x1a;\n\nPlotsEntry\x12\x0b\n\x03key\x18\x01 \x01(\r\x12\x1c\n\x05value\x18\x02 \x01(\x0b\x32\r.plotter.Plot:\x02\x38\x01\x42\x07\n\x05_saveB\t\n\x07_formatB\n\n\x08_profile\"h\n\x06Layout\x12\x12\n\x05nrows\x18\x01 \x01(\rH\x00\x88\x01\x01\x12\x12\n\x05ncols\x18\x02 \x01(\rH\x01\x88\x01\x01\x12\x15\n\x08parallel\x18\x03 \x01(\x08H\x02\x88\x01\x01\x42\x08\n\x06_nrowsB\x08\n\x06_ncolsB\x0b\n\t_parallel\"\xc1\x01\n\x06\x46igure\x12\x0f\n\x07\x66igsize\x18\x01 \x03(\x01\x12\x10\n\x03\x64pi\x18\x02 \x01(\x01H\x00\x88\x01\x01\x12\x16\n\tfacecolor\x18\x03 \x01(\tH\x01\x88\x01\x01\x12\x16\n\tedgecolor\x18\x04 \x01(\tH\x02\x88\x01\x01\x12\x14\n\x07\x66rameon\x18\x05 \x01(\x08H\x03\x88\x01\x01\x12\x13\n\x06layout\x18\x06 \x01(\tH\x04\x88\x01\x01\x42\x06\n\x04_dpiB\x0c\n\n_facecolorB\x0c\n\n_edgecolorB\n\n\x08_frameonB\t\n\x07_layout\".\n\x05Graph\x12\x0f\n\x07graphID\x18\x01 \x01(\r\x12\x14\n\x0cplot_id_list\x18\x02 \x03(\r\"\xc8\x03\n\x04Plot\x12\x0e\n\x06plotID\x18\x01 \x01(\r\x12\x15\n\x08plotType\x18\x02 \x01(\tH\x00\x88\x01\x01\x12\x17\n\ndecimation\x18\x03 \x01(\tH\x01\x88\x01\x01\x12\x1d\n\x10points_per_pixel\x18\x04 \x01(\x01H\x02\x88\x01\x01\x12\x13\n\x06marker\x18\x05 \x01(\tH\x03\x88\x01\x01\x12\x0e\n\x01s\x18\x06 \x01(\x01H\x04\x88\x01\x01\x12\x0e\n\x01\x63\x18\x07 \x01(\tH\x05\x88\x01\x01\x12\x11\n\x04\x63map\x18\x08 \x01(\tH\x06\x88\x01\x01\x12\x11\n\x04norm\x18\t \x01(\tH\x07\x88\x01\x01\x12\x11\n\x04vmin\x18\n \x01(\x01H\x08\x88\x01\x01\x12\x11\n\x04vmax\x18\x0b \x01(\x01H\t\x88\x01\x01\x12\x12\n\x05\x61lpha\x18\x0c \x01(\x01H\n\x88\x01\x01\x12\x14\n\x07\x64\x65nsity\x18\r \x01(\x08H\x0b\x88\x01\x01\x12\x1e\n\x11\x64\x65nsity_threshold\x18\x0e \x01(\rH\x0c\x88\x01\x01\x42\x0b\n\t_plotTypeB\r\n\x0b_decimationB\x13\n\x11_points_per_pixelB\t\n\x07_markerB\x04\n\x02_sB\x04\n\x02_cB\x07\n\x05_cmapB\x07\n\x05_normB\x07\n\x05_vminB\x07\n\x05_vmaxB\x08\n\x06_alphaB\n\n\x08_densityB\x14\n\x12_density_threshold2\xc4\x04\n\x0ePlotterService\x12;\n\x0cGeneratePlot\x12\x14.plotter.PlotRequest\x1a\x15.plotter.PlotResponse\x12\x41\n\x12GeneratePlotStream\x12\x12.plotter.PlotChunk\x1a\x13.plotter.ImageChunk(\x01\x30\x01\x12H\n\rGeneratePlots\x12\x19.plotter.BatchPlotRequest\x1a\x1a.plotter.BatchPlotResponse0\x01\x12H\n\rGetCacheStats\x12\x1a.plotter.CacheStatsRequest\x1a\x1b.plotter.CacheStatsResponse\x12=\n\x0bOpenSession\x12\x14.plotter.PlotRequest\x1a\x18.plotter.SessionResponse\x12\x42\n\nAppendData\x12\x1a.plotter.AppendDataRequest\x1a\x18.plotter.SessionResponse\x12K\n\x0c\x43loseSession\x12\x1c.plotter.CloseSessionRequest\x1a\x1d.plotter.CloseSessionResponse\x12N\n\rUploadDataset\x12\x1d.plotter.UploadDatasetRequest\x1a\x1e.plotter.UploadDatasetResponseb\x06proto3')
+
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'proto.plotter_pb2', _globals)
+if _descriptor._USE_C_DESCRIPTORS == False:
+  DESCRIPTOR._options = None
+  _PLOTREQUEST_DATABLOBSENTRY._options = None
+  _PLOTREQUEST_DATABLOBSENTRY._serialized_options = b'8\001'
+  _PLOTREQUEST_SHAREDBLOBSENTRY._options = None
+  _PLOTREQUEST_SHAREDBLOBSENTRY._serialized_options = b'8\001'
+  _BATCHPLOTREQUEST_DATABLOBSENTRY._options = None
+  _BATCHPLOTREQUEST_DATABLOBSENTRY._serialized_options = b'8\001'
+  _BATCHPLOTREQUEST_SHAREDBLOBSENTRY._options = None
+  _BATCHPLOTREQUEST_SHAREDBLOBSENTRY._serialized_options = b'8\001'
+  _APPENDDATAREQUEST_DATABLOBSENTRY._options = None
+  _APPENDDATAREQUEST_DATABLOBSENTRY._serialized_options = b'8\001'
+  _FILEDATA_COLUMNNAMESENTRY._options = None
+  _FILEDATA_COLUMNNAMESENTRY._serialized_options = b'8\001'
+  _IMAGE_GRAPHSENTRY._options = None
+  _IMAGE_GRAPHSENTRY._serialized_options = b'8\001'
+  _IMAGE_PLOTSENTRY._options = None
+  _IMAGE_PLOTSENTRY._serialized_options = b'8\001'
+  _globals['_PLOTREQUEST']._serialized_start=33
+  _globals['_PLOTREQUEST']._serialized_end=402
+  _globals['_PLOTREQUEST_DATABLOBSENTRY']._serialized_start=281
+  _globals['_PLOTREQUEST_DATABLOBSENTRY']._serialized_end=329
+  _globals['_PLOTREQUEST_SHAREDBLOBSENTRY']._serialized_start=331
+  _globals['_PLOTREQUEST_SHAREDBLOBSENTRY']._serialized_end=402
+  _globals['_SHAREDDATA']._serialized_start=404
+  _globals['_SHAREDDATA']._serialized_end=462
+  _globals['_PLOTRESPONSE']._serialized_start=464
+  _globals['_PLOTRESPONSE']._serialized_end=493
+  _globals['_BATCHPLOTREQUEST']._serialized_start=496
+  _globals['_BATCHPLOTREQUEST']._serialized_end=846
+  _globals['_BATCHPLOTREQUEST_DATABLOBSENTRY']._serialized_start=281
+  _globals['_BATCHPLOTREQUEST_DATABLOBSENTRY']._serialized_end=329
+  _globals['_BATCHPLOTREQUEST_SHAREDBLOBSENTRY']._serialized_start=331
+  _globals['_BATCHPLOTREQUEST_SHAREDBLOBSENTRY']._serialized_end=402
+  _globals['_BATCHPLOTRESPONSE']._serialized_start=848
+  _globals['_BATCHPLOTRESPONSE']._serialized_end=912
+  _globals['_PLOTCHUNK']._serialized_start=914
+  _globals['_PLOTCHUNK']._serialized_end=979
+  _globals['_IMAGECHUNK']._serialized_start=981
+  _globals['_IMAGECHUNK']._serialized_end=1008
+  _globals['_SESSIONRESPONSE']._serialized_start=1010
+  _globals['_SESSIONRESPONSE']._serialized_end=1062
+  _globals['_APPENDDATAREQUEST']._serialized_start=1065
+  _globals['_APPENDDATAREQUEST']._serialized_end=1233
+  _globals['_APPENDDATAREQUEST_DATABLOBSENTRY']._serialized_start=281
+  _globals['_APPENDDATAREQUEST_DATABLOBSENTRY']._serialized_end=329
+  _globals['_CLOSESESSIONREQUEST']._serialized_start=1235
+  _globals['_CLOSESESSIONREQUEST']._serialized_end=1276
+  _globals['_CLOSESESSIONRESPONSE']._serialized_start=1278
+  _globals['_CLOSESESSIONRESPONSE']._serialized_end=1300
+  _globals['_UPLOADDATASETREQUEST']._serialized_start=1302
+  _globals['_UPLOADDATASETREQUEST']._serialized_end=1378
+  _globals['_UPLOADDATASETRESPONSE']._serialized_start=1380
+  _globals['_UPLOADDATASETRESPONSE']._serialized_end=1454
+  _globals['_CACHESTATSREQUEST']._serialized_start=1456
+  _globals['_CACHESTATSREQUEST']._serialized_end=1475
+  _globals['_CACHESTATSRESPONSE']._serialized_start=1478
+  _globals['_CACHESTATSRESPONSE']._serialized_end=1726
+  _globals['_PAYLOAD']._serialized_start=1728
+  _globals['_PAYLOAD']._serialized_end=1797
+  _globals['_DATA']._serialized_start=1800
+  _globals['_DATA']._serialized_end=1943
+  _globals['_FILEDATA']._serialized_start=1946
+  _globals['_FILEDATA']._serialized_end=2192
+  _globals['_FILEDATA_COLUMNNAMESENTRY']._serialized_start=2115
+  _globals['_FILEDATA_COLUMNNAMESENTRY']._serialized_end=2165
+  _globals['_FUNCTIONDATA']._serialized_start=2195
+  _globals['_FUNCTIONDATA']._serialized_end=2381
+  _globals['_IMAGE']._serialized_start=2384
+  _globals['_IMAGE']._serialized_end=2761
+  _globals['_IMAGE_GRAPHSENTRY']._serialized_start=2607
+  _globals['_IMAGE_GRAPHSENTRY']._serialized_end=2668
+  _globals['_IMAGE_PLOTSENTRY']._serialized_start=2670
+  _globals['_IMAGE_PLOTSENTRY']._serialized_end=2729
+  _globals['_LAYOUT']._serialized_start=2763
+  _globals['_LAYOUT']._serialized_end=2867
+  _globals['_FIGURE']._serialized_start=2870
+  _globals['_FIGURE']._serialized_end=3063
+  _globals['_GRAPH']._serialized_start=3065
+  _globals['_GRAPH']._serialized_end=3111
+  _globals['_PLOT']._serialized_start=3114
+  _globals['_PLOT']._serialized_end=3570
+  _globals['_PLOTTERSERVICE']._serialized_start=3573
+  _globals['_PLOTTERSERVICE']._serialized_end=4153
+# @@protoc_insertion_point(module_scope)
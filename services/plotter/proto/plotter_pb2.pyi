@@ -0,0 +1,348 @@
+from google.protobuf.internal import containers as _containers
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import message as _message
+from typing import ClassVar as _ClassVar, Iterable as _Iterable, Mapping as _Mapping, Optional as _Optional, Union as _Union
+
+DESCRIPTOR: _descriptor.FileDescriptor
+
+class PlotRequest(_message.Message):
+    __slots__ = ["rawData", "encodedPayload", "dataBlobs", "payload", "sharedData", "sharedBlobs"]
+    class DataBlobsEntry(_message.Message):
+        __slots__ = ["key", "value"]
+        KEY_FIELD_NUMBER: _ClassVar[int]
+        VALUE_FIELD_NUMBER: _ClassVar[int]
+        key: str
+        value: bytes
+        def __init__(self, key: _Optional[str] = ..., value: _Optional[bytes] = ...) -> None: ...
+    class SharedBlobsEntry(_message.Message):
+        __slots__ = ["key", "value"]
+        KEY_FIELD_NUMBER: _ClassVar[int]
+        VALUE_FIELD_NUMBER: _ClassVar[int]
+        key: str
+        value: SharedData
+        def __init__(self, key: _Optional[str] = ..., value: _Optional[_Union[SharedData, _Mapping]] = ...) -> None: ...
+    RAWDATA_FIELD_NUMBER: _ClassVar[int]
+    ENCODEDPAYLOAD_FIELD_NUMBER: _ClassVar[int]
+    DATABLOBS_FIELD_NUMBER: _ClassVar[int]
+    PAYLOAD_FIELD_NUMBER: _ClassVar[int]
+    SHAREDDATA_FIELD_NUMBER: _ClassVar[int]
+    SHAREDBLOBS_FIELD_NUMBER: _ClassVar[int]
+    rawData: bytes
+    encodedPayload: bytes
+    dataBlobs: _containers.ScalarMap[str, bytes]
+    payload: Payload
+    sharedData: SharedData
+    sharedBlobs: _containers.MessageMap[str, SharedData]
+    def __init__(self, rawData: _Optional[bytes] = ..., encodedPayload: _Optional[bytes] = ..., dataBlobs: _Optional[_Mapping[str, bytes]] = ..., payload: _Optional[_Union[Payload, _Mapping]] = ..., sharedData: _Optional[_Union[SharedData, _Mapping]] = ..., sharedBlobs: _Optional[_Mapping[str, SharedData]] = ...) -> None: ...
+
+class SharedData(_message.Message):
+    __slots__ = ["name", "offset", "length"]
+    NAME_FIELD_NUMBER: _ClassVar[int]
+    OFFSET_FIELD_NUMBER: _ClassVar[int]
+    LENGTH_FIELD_NUMBER: _ClassVar[int]
+    name: str
+    offset: int
+    length: int
+    def __init__(self, name: _Optional[str] = ..., offset: _Optional[int] = ..., length: _Optional[int] = ...) -> None: ...
+
+class PlotResponse(_message.Message):
+    __slots__ = ["image"]
+    IMAGE_FIELD_NUMBER: _ClassVar[int]
+    image: bytes
+    def __init__(self, image: _Optional[bytes] = ...) -> None: ...
+
+class BatchPlotRequest(_message.Message):
+    __slots__ = ["rawData", "dataBlobs", "encodedPayloads", "sharedData", "sharedBlobs"]
+    class DataBlobsEntry(_message.Message):
+        __slots__ = ["key", "value"]
+        KEY_FIELD_NUMBER: _ClassVar[int]
+        VALUE_FIELD_NUMBER: _ClassVar[int]
+        key: str
+        value: bytes
+        def __init__(self, key: _Optional[str] = ..., value: _Optional[bytes] = ...) -> None: ...
+    class SharedBlobsEntry(_message.Message):
+        __slots__ = ["key", "value"]
+        KEY_FIELD_NUMBER: _ClassVar[int]
+        VALUE_FIELD_NUMBER: _ClassVar[int]
+        key: str
+        value: SharedData
+        def __init__(self, key: _Optional[str] = ..., value: _Optional[_Union[SharedData, _Mapping]] = ...) -> None: ...
+    RAWDATA_FIELD_NUMBER: _ClassVar[int]
+    DATABLOBS_FIELD_NUMBER: _ClassVar[int]
+    ENCODEDPAYLOADS_FIELD_NUMBER: _ClassVar[int]
+    SHAREDDATA_FIELD_NUMBER: _ClassVar[int]
+    SHAREDBLOBS_FIELD_NUMBER: _ClassVar[int]
+    rawData: bytes
+    dataBlobs: _containers.ScalarMap[str, bytes]
+    encodedPayloads: _containers.RepeatedScalarFieldContainer[bytes]
+    sharedData: SharedData
+    sharedBlobs: _containers.MessageMap[str, SharedData]
+    def __init__(self, rawData: _Optional[bytes] = ..., dataBlobs: _Optional[_Mapping[str, bytes]] = ..., encodedPayloads: _Optional[_Iterable[bytes]] = ..., sharedData: _Optional[_Union[SharedData, _Mapping]] = ..., sharedBlobs: _Optional[_Mapping[str, SharedData]] = ...) -> None: ...
+
+class BatchPlotResponse(_message.Message):
+    __slots__ = ["index", "image", "error"]
+    INDEX_FIELD_NUMBER: _ClassVar[int]
+    IMAGE_FIELD_NUMBER: _ClassVar[int]
+    ERROR_FIELD_NUMBER: _ClassVar[int]
+    index: int
+    image: bytes
+    error: str
+    def __init__(self, index: _Optional[int] = ..., image: _Optional[bytes] = ..., error: _Optional[str] = ...) -> None: ...
+
+class PlotChunk(_message.Message):
+    __slots__ = ["encodedPayload", "rawData"]
+    ENCODEDPAYLOAD_FIELD_NUMBER: _ClassVar[int]
+    RAWDATA_FIELD_NUMBER: _ClassVar[int]
+    encodedPayload: bytes
+    rawData: bytes
+    def __init__(self, encodedPayload: _Optional[bytes] = ..., rawData: _Optional[bytes] = ...) -> None: ...
+
+class ImageChunk(_message.Message):
+    __slots__ = ["image"]
+    IMAGE_FIELD_NUMBER: _ClassVar[int]
+    image: bytes
+    def __init__(self, image: _Optional[bytes] = ...) -> None: ...
+
+class SessionResponse(_message.Message):
+    __slots__ = ["session_id", "image"]
+    SESSION_ID_FIELD_NUMBER: _ClassVar[int]
+    IMAGE_FIELD_NUMBER: _ClassVar[int]
+    session_id: str
+    image: bytes
+    def __init__(self, session_id: _Optional[str] = ..., image: _Optional[bytes] = ...) -> None: ...
+
+class AppendDataRequest(_message.Message):
+    __slots__ = ["session_id", "rawData", "dataBlobs"]
+    class DataBlobsEntry(_message.Message):
+        __slots__ = ["key", "value"]
+        KEY_FIELD_NUMBER: _ClassVar[int]
+        VALUE_FIELD_NUMBER: _ClassVar[int]
+        key: str
+        value: bytes
+        def __init__(self, key: _Optional[str] = ..., value: _Optional[bytes] = ...) -> None: ...
+    SESSION_ID_FIELD_NUMBER: _ClassVar[int]
+    RAWDATA_FIELD_NUMBER: _ClassVar[int]
+    DATABLOBS_FIELD_NUMBER: _ClassVar[int]
+    session_id: str
+    rawData: bytes
+    dataBlobs: _containers.ScalarMap[str, bytes]
+    def __init__(self, session_id: _Optional[str] = ..., rawData: _Optional[bytes] = ..., dataBlobs: _Optional[_Mapping[str, bytes]] = ...) -> None: ...
+
+class CloseSessionRequest(_message.Message):
+    __slots__ = ["session_id"]
+    SESSION_ID_FIELD_NUMBER: _ClassVar[int]
+    session_id: str
+    def __init__(self, session_id: _Optional[str] = ...) -> None: ...
+
+class CloseSessionResponse(_message.Message):
+    __slots__ = []
+    def __init__(self) -> None: ...
+
+class UploadDatasetRequest(_message.Message):
+    __slots__ = ["rawData", "format", "compression"]
+    RAWDATA_FIELD_NUMBER: _ClassVar[int]
+    FORMAT_FIELD_NUMBER: _ClassVar[int]
+    COMPRESSION_FIELD_NUMBER: _ClassVar[int]
+    rawData: bytes
+    format: str
+    compression: str
+    def __init__(self, rawData: _Optional[bytes] = ..., format: _Optional[str] = ..., compression: _Optional[str] = ...) -> None: ...
+
+class UploadDatasetResponse(_message.Message):
+    __slots__ = ["dataset_id", "rows", "columns"]
+    DATASET_ID_FIELD_NUMBER: _ClassVar[int]
+    ROWS_FIELD_NUMBER: _ClassVar[int]
+    COLUMNS_FIELD_NUMBER: _ClassVar[int]
+    dataset_id: str
+    rows: int
+    columns: _containers.RepeatedScalarFieldContainer[str]
+    def __init__(self, dataset_id: _Optional[str] = ..., rows: _Optional[int] = ..., columns: _Optional[_Iterable[str]] = ...) -> None: ...
+
+class CacheStatsRequest(_message.Message):
+    __slots__ = []
+    def __init__(self) -> None: ...
+
+class CacheStatsResponse(_message.Message):
+    __slots__ = ["hits", "disk_hits", "misses", "coalesced", "evictions", "disk_evictions", "entries", "bytes", "max_bytes", "disk_entries", "disk_bytes", "disk_max_bytes"]
+    HITS_FIELD_NUMBER: _ClassVar[int]
+    DISK_HITS_FIELD_NUMBER: _ClassVar[int]
+    MISSES_FIELD_NUMBER: _ClassVar[int]
+    COALESCED_FIELD_NUMBER: _ClassVar[int]
+    EVICTIONS_FIELD_NUMBER: _ClassVar[int]
+    DISK_EVICTIONS_FIELD_NUMBER: _ClassVar[int]
+    ENTRIES_FIELD_NUMBER: _ClassVar[int]
+    BYTES_FIELD_NUMBER: _ClassVar[int]
+    MAX_BYTES_FIELD_NUMBER: _ClassVar[int]
+    DISK_ENTRIES_FIELD_NUMBER: _ClassVar[int]
+    DISK_BYTES_FIELD_NUMBER: _ClassVar[int]
+    DISK_MAX_BYTES_FIELD_NUMBER: _ClassVar[int]
+    hits: int
+    disk_hits: int
+    misses: int
+    coalesced: int
+    evictions: int
+    disk_evictions: int
+    entries: int
+    bytes: int
+    max_bytes: int
+    disk_entries: int
+    disk_bytes: int
+    disk_max_bytes: int
+    def __init__(self, hits: _Optional[int] = ..., disk_hits: _Optional[int] = ..., misses: _Optional[int] = ..., coalesced: _Optional[int] = ..., evictions: _Optional[int] = ..., disk_evictions: _Optional[int] = ..., entries: _Optional[int] = ..., bytes: _Optional[int] = ..., max_bytes: _Optional[int] = ..., disk_entries: _Optional[int] = ..., disk_bytes: _Optional[int] = ..., disk_max_bytes: _Optional[int] = ...) -> None: ...
+
+class Payload(_message.Message):
+    __slots__ = ["data", "image"]
+    DATA_FIELD_NUMBER: _ClassVar[int]
+    IMAGE_FIELD_NUMBER: _ClassVar[int]
+    data: _containers.RepeatedCompositeFieldContainer[Data]
+    image: Image
+    def __init__(self, data: _Optional[_Iterable[_Union[Data, _Mapping]]] = ..., image: _Optional[_Union[Image, _Mapping]] = ...) -> None: ...
+
+class Data(_message.Message):
+    __slots__ = ["plotID", "graphID", "limits", "file", "function"]
+    PLOTID_FIELD_NUMBER: _ClassVar[int]
+    GRAPHID_FIELD_NUMBER: _ClassVar[int]
+    LIMITS_FIELD_NUMBER: _ClassVar[int]
+    FILE_FIELD_NUMBER: _ClassVar[int]
+    FUNCTION_FIELD_NUMBER: _ClassVar[int]
+    plotID: int
+    graphID: int
+    limits: _containers.RepeatedScalarFieldContainer[float]
+    file: FileData
+    function: FunctionData
+    def __init__(self, plotID: _Optional[int] = ..., graphID: _Optional[int] = ..., limits: _Optional[_Iterable[float]] = ..., file: _Optional[_Union[FileData, _Mapping]] = ..., function: _Optional[_Union[FunctionData, _Mapping]] = ...) -> None: ...
+
+class FileData(_message.Message):
+    __slots__ = ["filename", "format", "axis", "column_names", "dataset_id", "compression"]
+    class ColumnNamesEntry(_message.Message):
+        __slots__ = ["key", "value"]
+        KEY_FIELD_NUMBER: _ClassVar[int]
+        VALUE_FIELD_NUMBER: _ClassVar[int]
+        key: str
+        value: str
+        def __init__(self, key: _Optional[str] = ..., value: _Optional[str] = ...) -> None: ...
+    FILENAME_FIELD_NUMBER: _ClassVar[int]
+    FORMAT_FIELD_NUMBER: _ClassVar[int]
+    AXIS_FIELD_NUMBER: _ClassVar[int]
+    COLUMN_NAMES_FIELD_NUMBER: _ClassVar[int]
+    DATASET_ID_FIELD_NUMBER: _ClassVar[int]
+    COMPRESSION_FIELD_NUMBER: _ClassVar[int]
+    filename: str
+    format: str
+    axis: _containers.RepeatedScalarFieldContainer[str]
+    column_names: _containers.ScalarMap[str, str]
+    dataset_id: str
+    compression: str
+    def __init__(self, filename: _Optional[str] = ..., format: _Optional[str] = ..., axis: _Optional[_Iterable[str]] = ..., column_names: _Optional[_Mapping[str, str]] = ..., dataset_id: _Optional[str] = ..., compression: _Optional[str] = ...) -> None: ...
+
+class FunctionData(_message.Message):
+    __slots__ = ["function", "resolution", "adaptive", "tolerance", "max_points"]
+    FUNCTION_FIELD_NUMBER: _ClassVar[int]
+    RESOLUTION_FIELD_NUMBER: _ClassVar[int]
+    ADAPTIVE_FIELD_NUMBER: _ClassVar[int]
+    TOLERANCE_FIELD_NUMBER: _ClassVar[int]
+    MAX_POINTS_FIELD_NUMBER: _ClassVar[int]
+    function: str
+    resolution: int
+    adaptive: bool
+    tolerance: float
+    max_points: int
+    def __init__(self, function: _Optional[str] = ..., resolution: _Optional[int] = ..., adaptive: bool = ..., tolerance: _Optional[float] = ..., max_points: _Optional[int] = ...) -> None: ...
+
+class Image(_message.Message):
+    __slots__ = ["save", "format", "figure", "graphs", "plots", "profile", "layout"]
+    class GraphsEntry(_message.Message):
+        __slots__ = ["key", "value"]
+        KEY_FIELD_NUMBER: _ClassVar[int]
+        VALUE_FIELD_NUMBER: _ClassVar[int]
+        key: int
+        value: Graph
+        def __init__(self, key: _Optional[int] = ..., value: _Optional[_Union[Graph, _Mapping]] = ...) -> None: ...
+    class PlotsEntry(_message.Message):
+        __slots__ = ["key", "value"]
+        KEY_FIELD_NUMBER: _ClassVar[int]
+        VALUE_FIELD_NUMBER: _ClassVar[int]
+        key: int
+        value: Plot
+        def __init__(self, key: _Optional[int] = ..., value: _Optional[_Union[Plot, _Mapping]] = ...) -> None: ...
+    SAVE_FIELD_NUMBER: _ClassVar[int]
+    FORMAT_FIELD_NUMBER: _ClassVar[int]
+    FIGURE_FIELD_NUMBER: _ClassVar[int]
+    GRAPHS_FIELD_NUMBER: _ClassVar[int]
+    PLOTS_FIELD_NUMBER: _ClassVar[int]
+    PROFILE_FIELD_NUMBER: _ClassVar[int]
+    LAYOUT_FIELD_NUMBER: _ClassVar[int]
+    save: bool
+    format: str
+    figure: Figure
+    graphs: _containers.MessageMap[int, Graph]
+    plots: _containers.MessageMap[int, Plot]
+    profile: str
+    layout: Layout
+    def __init__(self, save: bool = ..., format: _Optional[str] = ..., figure: _Optional[_Union[Figure, _Mapping]] = ..., graphs: _Optional[_Mapping[int, Graph]] = ..., plots: _Optional[_Mapping[int, Plot]] = ..., profile: _Optional[str] = ..., layout: _Optional[_Union[Layout, _Mapping]] = ...) -> None: ...
+
+class Layout(_message.Message):
+    __slots__ = ["nrows", "ncols", "parallel"]
+    NROWS_FIELD_NUMBER: _ClassVar[int]
+    NCOLS_FIELD_NUMBER: _ClassVar[int]
+    PARALLEL_FIELD_NUMBER: _ClassVar[int]
+    nrows: int
+    ncols: int
+    parallel: bool
+    def __init__(self, nrows: _Optional[int] = ..., ncols: _Optional[int] = ..., parallel: bool = ...) -> None: ...
+
+class Figure(_message.Message):
+    __slots__ = ["figsize", "dpi", "facecolor", "edgecolor", "frameon", "layout"]
+    FIGSIZE_FIELD_NUMBER: _ClassVar[int]
+    DPI_FIELD_NUMBER: _ClassVar[int]
+    FACECOLOR_FIELD_NUMBER: _ClassVar[int]
+    EDGECOLOR_FIELD_NUMBER: _ClassVar[int]
+    FRAMEON_FIELD_NUMBER: _ClassVar[int]
+    LAYOUT_FIELD_NUMBER: _ClassVar[int]
+    figsize: _containers.RepeatedScalarFieldContainer[float]
+    dpi: float
+    facecolor: str
+    edgecolor: str
+    frameon: bool
+    layout: str
+    def __init__(self, figsize: _Optional[_Iterable[float]] = ..., dpi: _Optional[float] = ..., facecolor: _Optional[str] = ..., edgecolor: _Optional[str] = ..., frameon: bool = ..., layout: _Optional[str] = ...) -> None: ...
+
+class Graph(_message.Message):
+    __slots__ = ["graphID", "plot_id_list"]
+    GRAPHID_FIELD_NUMBER: _ClassVar[int]
+    PLOT_ID_LIST_FIELD_NUMBER: _ClassVar[int]
+    graphID: int
+    plot_id_list: _containers.RepeatedScalarFieldContainer[int]
+    def __init__(self, graphID: _Optional[int] = ..., plot_id_list: _Optional[_Iterable[int]] = ...) -> None: ...
+
+class Plot(_message.Message):
+    __slots__ = ["plotID", "plotType", "decimation", "points_per_pixel", "marker", "s", "c", "cmap", "norm", "vmin", "vmax", "alpha", "density", "density_threshold"]
+    PLOTID_FIELD_NUMBER: _ClassVar[int]
+    PLOTTYPE_FIELD_NUMBER: _ClassVar[int]
+    DECIMATION_FIELD_NUMBER: _ClassVar[int]
+    POINTS_PER_PIXEL_FIELD_NUMBER: _ClassVar[int]
+    MARKER_FIELD_NUMBER: _ClassVar[int]
+    S_FIELD_NUMBER: _ClassVar[int]
+    C_FIELD_NUMBER: _ClassVar[int]
+    CMAP_FIELD_NUMBER: _ClassVar[int]
+    NORM_FIELD_NUMBER: _ClassVar[int]
+    VMIN_FIELD_NUMBER: _ClassVar[int]
+    VMAX_FIELD_NUMBER: _ClassVar[int]
+    ALPHA_FIELD_NUMBER: _ClassVar[int]
+    DENSITY_FIELD_NUMBER: _ClassVar[int]
+    DENSITY_THRESHOLD_FIELD_NUMBER: _ClassVar[int]
+    plotID: int
+    plotType: str
+    decimation: str
+    points_per_pixel: float
+    marker: str
+    s: float
+    c: str
+    cmap: str
+    norm: str
+    vmin: float
+    vmax: float
+    alpha: float
+    density: bool
+    density_threshold: int
+    def __init__(self, plotID: _Optional[int] = ..., plotType: _Optional[str] = ..., decimation: _Optional[str] = ..., points_per_pixel: _Optional[float] = ..., marker: _Optional[str] = ..., s: _Optional[float] = ..., c: _Optional[str] = ..., cmap: _Optional[str] = ..., norm: _Optional[str] = ..., vmin: _Optional[float] = ..., vmax: _Optional[float] = ..., alpha: _Optional[float] = ..., density: bool = ..., density_threshold: _Optional[int] = ...) -> None: ...
@@ -0,0 +1,301 @@
+# Generated by the gRPC Python protocol compiler plugin. DO NOT EDIT!
+"""Client and server classes corresponding to protobuf-defined services."""
+import grpc
+
+from proto import plotter_pb2 as proto_dot_plotter__pb2
+
+
+class PlotterServiceStub(object):
+    """Missing associated documentation comment in .proto file."""
+
+    def __init__(self, channel):
+        """Constructor.
+
+        Args:
+            channel: A grpc.Channel.
+        """
+        self.GeneratePlot = channel.unary_unary(
+                '/plotter.PlotterService/GeneratePlot',
+                request_serializer=proto_dot_plotter__pb2.PlotRequest.SerializeToString,
+                response_deserializer=proto_dot_plotter__pb2.PlotResponse.FromString,
+                )
+        self.GeneratePlotStream = channel.stream_stream(
+                '/plotter.PlotterService/GeneratePlotStream',
+                request_serializer=proto_dot_plotter__pb2.PlotChunk.SerializeToString,
+                response_deserializer=proto_dot_plotter__pb2.ImageChunk.FromString,
+                )
+        self.GeneratePlots = channel.unary_stream(
+                '/plotter.PlotterService/GeneratePlots',
+                request_serializer=proto_dot_plotter__pb2.BatchPlotRequest.SerializeToString,
+                response_deserializer=proto_dot_plotter__pb2.BatchPlotResponse.FromString,
+                )
+        self.GetCacheStats = channel.unary_unary(
+                '/plotter.PlotterService/GetCacheStats',
+                request_serializer=proto_dot_plotter__pb2.CacheStatsRequest.SerializeToString,
+                response_deserializer=proto_dot_plotter__pb2.CacheStatsResponse.FromString,
+                )
+        self.OpenSession = channel.unary_unary(
+                '/plotter.PlotterService/OpenSession',
+                request_serializer=proto_dot_plotter__pb2.PlotRequest.SerializeToString,
+                response_deserializer=proto_dot_plotter__pb2.SessionResponse.FromString,
+                )
+        self.AppendData = channel.unary_unary(
+                '/plotter.PlotterService/AppendData',
+                request_serializer=proto_dot_plotter__pb2.AppendDataRequest.SerializeToString,
+                response_deserializer=proto_dot_plotter__pb2.SessionResponse.FromString,
+                )
+        self.CloseSession = channel.unary_unary(
+                '/plotter.PlotterService/CloseSession',
+                request_serializer=proto_dot_plotter__pb2.CloseSessionRequest.SerializeToString,
+                response_deserializer=proto_dot_plotter__pb2.CloseSessionResponse.FromString,
+                )
+        self.UploadDataset = channel.unary_unary(
+                '/plotter.PlotterService/UploadDataset',
+                request_serializer=proto_dot_plotter__pb2.UploadDatasetRequest.SerializeToString,
+                response_deserializer=proto_dot_plotter__pb2.UploadDatasetResponse.FromString,
+                )
+
+
+class PlotterServiceServicer(object):
+    """Missing associated documentation comment in .proto file."""
+
+    def GeneratePlot(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GeneratePlotStream(self, request_iterator, context):
+        """the first message carries the encodedPayload, the following ones the rawData chunks
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GeneratePlots(self, request, context):
+        """renders every payload against the same data, images are streamed as they finish
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetCacheStats(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def OpenSession(self, request, context):
+        """live figures, a session keeps its figure on the server and appended rows update it
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def AppendData(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def CloseSession(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def UploadDataset(self, request, context):
+        """parses and keeps a dataset on the server, file data then refer to it by dataset_id
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+
+def add_PlotterServiceServicer_to_server(servicer, server):
+    rpc_method_handlers = {
+            'GeneratePlot': grpc.unary_unary_rpc_method_handler(
+                    servicer.GeneratePlot,
+                    request_deserializer=proto_dot_plotter__pb2.PlotRequest.FromString,
+                    response_serializer=proto_dot_plotter__pb2.PlotResponse.SerializeToString,
+            ),
+            'GeneratePlotStream': grpc.stream_stream_rpc_method_handler(
+                    servicer.GeneratePlotStream,
+                    request_deserializer=proto_dot_plotter__pb2.PlotChunk.FromString,
+                    response_serializer=proto_dot_plotter__pb2.ImageChunk.SerializeToString,
+            ),
+            'GeneratePlots': grpc.unary_stream_rpc_method_handler(
+                    servicer.GeneratePlots,
+                    request_deserializer=proto_dot_plotter__pb2.BatchPlotRequest.FromString,
+                    response_serializer=proto_dot_plotter__pb2.BatchPlotResponse.SerializeToString,
+            ),
+            'GetCacheStats': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetCacheStats,
+                    request_deserializer=proto_dot_plotter__pb2.CacheStatsRequest.FromString,
+                    response_serializer=proto_dot_plotter__pb2.CacheStatsResponse.SerializeToString,
+            ),
+            'OpenSession': grpc.unary_unary_rpc_method_handler(
+                    servicer.OpenSession,
+                    request_deserializer=proto_dot_plotter__pb2.PlotRequest.FromString,
+                    response_serializer=proto_dot_plotter__pb2.SessionResponse.SerializeToString,
+            ),
+            'AppendData': grpc.unary_unary_rpc_method_handler(
+                    servicer.AppendData,
+                    request_deserializer=proto_dot_plotter__pb2.AppendDataRequest.FromString,
+                    response_serializer=proto_dot_plotter__pb2.SessionResponse.SerializeToString,
+            ),
+            'CloseSession': grpc.unary_unary_rpc_method_handler(
+                    servicer.CloseSession,
+                    request_deserializer=proto_dot_plotter__pb2.CloseSessionRequest.FromString,
+                    response_serializer=proto_dot_plotter__pb2.CloseSessionResponse.SerializeToString,
+            ),
+            'UploadDataset': grpc.unary_unary_rpc_method_handler(
+                    servicer.UploadDataset,
+                    request_deserializer=proto_dot_plotter__pb2.UploadDatasetRequest.FromString,
+                    response_serializer=proto_dot_plotter__pb2.UploadDatasetResponse.SerializeToString,
+            ),
+    }
+    generic_handler = grpc.method_handlers_generic_handler(
+            'plotter.PlotterService', rpc_method_handlers)
+    server.add_generic_rpc_handlers((generic_handler,))
+
+
+ # This class is part of an EXPERIMENTAL API.
+class PlotterService(object):
+    """Missing associated documentation comment in .proto file."""
+
+    @staticmethod
+    def GeneratePlot(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/plotter.PlotterService/GeneratePlot',
+            proto_dot_plotter__pb2.PlotRequest.SerializeToString,
+            proto_dot_plotter__pb2.PlotResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def GeneratePlotStream(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(request_iterator, target, '/plotter.PlotterService/GeneratePlotStream',
+            proto_dot_plotter__pb2.PlotChunk.SerializeToString,
+            proto_dot_plotter__pb2.ImageChunk.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def GeneratePlots(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(request, target, '/plotter.PlotterService/GeneratePlots',
+            proto_dot_plotter__pb2.BatchPlotRequest.SerializeToString,
+            proto_dot_plotter__pb2.BatchPlotResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def GetCacheStats(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/plotter.PlotterService/GetCacheStats',
+            proto_dot_plotter__pb2.CacheStatsRequest.SerializeToString,
+            proto_dot_plotter__pb2.CacheStatsResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def OpenSession(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/plotter.PlotterService/OpenSession',
+            proto_dot_plotter__pb2.PlotRequest.SerializeToString,
+            proto_dot_plotter__pb2.SessionResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def AppendData(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/plotter.PlotterService/AppendData',
+            proto_dot_plotter__pb2.AppendDataRequest.SerializeToString,
+            proto_dot_plotter__pb2.SessionResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def CloseSession(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/plotter.PlotterService/CloseSession',
+            proto_dot_plotter__pb2.CloseSessionRequest.SerializeToString,
+            proto_dot_plotter__pb2.CloseSessionResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def UploadDataset(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/plotter.PlotterService/UploadDataset',
+            proto_dot_plotter__pb2.UploadDatasetRequest.SerializeToString,
+            proto_dot_plotter__pb2.UploadDatasetResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
@@ -1,34 +1,439 @@
-import json
+import time
+
+# NOTE: taken before the heavy imports (grpc, pandas, matplotlib), run() reports their duration
+STARTED = time.perf_counter()
+
+import logging
 from decouple import config
 from concurrent import futures
-from models.payload import PayloadModel
 
 import grpc
-from proto.plotter_pb2 import PlotRequest, PlotResponse
+from proto.plotter_pb2 import (
+    Payload,
+    PlotRequest,
+    PlotResponse,
+    BatchPlotRequest,
+    BatchPlotResponse,
+    ImageChunk,
+    CacheStatsRequest,
+    CacheStatsResponse,
+    AppendDataRequest,
+    CloseSessionRequest,
+    CloseSessionResponse,
+    SessionResponse,
+    UploadDatasetRequest,
+    UploadDatasetResponse,
+)
 import proto.plotter_pb2_grpc as plotter_grpc
 
 
-from service import plot
+import service
+from utils import metrics
+from service import build, decode, plot, render, render_tiles, validate_batch
+from utils.cache import RenderCache
+from utils.compression import compress_message, compress_response, grpc_compression
+from utils.datasets import DatasetRegistry
+from utils.metrics import abort, merge, stage, timed
+from utils.exceptions import (
+    DatasetLimitError,
+    DatasetNotFoundError,
+    InvalidRequestError,
+    SessionLimitError,
+    SessionNotFoundError,
+)
+from utils.pool import RenderPool
+from utils.sessions import SessionStore
+from utils.shared import shared_data
+from utils.stream import iter_chunks, open_chunks
+from utils.tiles import tiled
+
+
+logger = logging.getLogger("plotter")
+
+
+def request_payload(request: PlotRequest) -> bytes | Payload:
+    """The structured payload of a request when set, its JSON encodedPayload otherwise"""
+    return request.payload if request.HasField("payload") else request.encodedPayload
+
+
+def request_key(request: PlotRequest) -> str:
+    """Render cache key of a request, covering its payload and all of its data"""
+    blobs = request.dataBlobs
+    payload = request_payload(request)
+
+    return RenderCache.key(
+        payload if isinstance(payload, bytes) else payload.SerializeToString(deterministic=True),
+        request.rawData,
+        *(part for name in sorted(blobs) for part in (name.encode("utf8"), blobs[name])),
+    )
+
+
+def request_data(request: PlotRequest | BatchPlotRequest, context) -> tuple:
+    """rawData and data blobs of a request, its shared data is read in place for local peers"""
+    return shared_data(
+        request.rawData or None,
+        dict(request.dataBlobs),
+        sharedData=request.sharedData if request.HasField("sharedData") else None,
+        sharedBlobs=dict(request.sharedBlobs),
+        peer=context.peer(),
+    )
+
+
+def cacheable(request: PlotRequest) -> bool:
+    """Requests reading shared data skip the render cache, the bytes behind a segment name
+    can change between requests"""
+    return not (request.HasField("sharedData") or request.sharedBlobs)
 
 
 class PlotterServiceServicer(plotter_grpc.PlotterServiceServicer):
-    def GeneratePlot(self, request: PlotRequest, context):
-        decodedPayload = request.encodedPayload.decode("utf8")
-        payload = PayloadModel(**json.loads(decodedPayload))
+    """PlotterServiceServicer hands requests to the render pool and returns the images"""
+
+    _pool: RenderPool
+    _cache: RenderCache
+    _chunk_size: int
+    _sessions: SessionStore
+    _datasets: DatasetRegistry
 
-        image = plot(rawData=request.rawData, payload=payload)
+    def __init__(
+        self,
+        pool: RenderPool,
+        cache: RenderCache,
+        chunk_size: int = 1024 * 1024,
+        sessions: SessionStore = None,
+        datasets: DatasetRegistry = None,
+    ) -> None:
+        self._pool = pool
+        self._cache = cache
+        self._chunk_size = chunk_size
+        self._sessions = sessions or SessionStore()
+        self._datasets = datasets or DatasetRegistry()
+
+    def GeneratePlot(self, request: PlotRequest, context):
+        with metrics.request("GeneratePlot", context, payload_bytes=request.ByteSize()):
+            try:
+                if cacheable(request):
+                    image = self._cache.get_or_render(
+                        request_key(request), lambda: self._render(request, context)
+                    )
+                else:
+                    image = self._render(request, context)
+            except InvalidRequestError as e:
+                abort(context, grpc.StatusCode.INVALID_ARGUMENT, e.details())
+            except DatasetNotFoundError as e:
+                abort(context, grpc.StatusCode.NOT_FOUND, e.message)
+            metrics.IMAGE_BYTES.observe(len(image), method="GeneratePlot")
+            compress_response(context, len(image))
 
         return PlotResponse(image=image)
 
+    def _render(self, request: PlotRequest, context) -> bytes:
+        encodedPayload = request_payload(request)
+        rawData, blobs = request_data(request, context)
+        with stage("decode"):
+            payload = decode(encodedPayload)
+        datasets = self._datasets.resolve(payload)
+        if tiled(payload):
+            return render_tiles(self._pool.submit, payload, rawData, blobs, datasets=datasets)
+
+        # NOTE: a render process receives a pickled copy of the frames, still far
+        # cheaper than parsing the data again
+        image, stages = self._pool.run(
+            timed, time.perf_counter(), render, encodedPayload, rawData, blobs, None, None, datasets
+        )
+        merge(stages)
+
+        return image
+
+    def GeneratePlotStream(self, request_iterator, context):
+        with metrics.request("GeneratePlotStream", context):
+            header = next(request_iterator, None)
+            if header is None or header.WhichOneof("chunk") != "encodedPayload":
+                abort(
+                    context, grpc.StatusCode.INVALID_ARGUMENT, "Expected the encodedPayload first"
+                )
+
+            rawData = open_chunks(chunk.rawData for chunk in request_iterator)
+
+            # NOTE: parsed and drawn in this thread, shipping the frame to a render
+            # process would hold a second copy of the data while it is pickled
+            try:
+                with stage("decode"):
+                    payload = decode(header.encodedPayload)
+                datasets = self._datasets.resolve(payload)
+                image = plot(payload=payload, rawData=rawData, datasets=datasets)
+            except InvalidRequestError as e:
+                abort(context, grpc.StatusCode.INVALID_ARGUMENT, e.details())
+            except DatasetNotFoundError as e:
+                abort(context, grpc.StatusCode.NOT_FOUND, e.message)
+            metrics.IMAGE_BYTES.observe(len(image), method="GeneratePlotStream")
+
+            for chunk in iter_chunks(image, self._chunk_size):
+                compress_message(context, len(chunk))
+                yield ImageChunk(image=chunk)
+
+    def GeneratePlots(self, request: BatchPlotRequest, context):
+        with metrics.request("GeneratePlots", context, payload_bytes=request.ByteSize()):
+            yield from self._generate_plots(request, context)
+
+    def _generate_plots(self, request: BatchPlotRequest, context):
+        try:
+            rawData, blobs = request_data(request, context)
+        except InvalidRequestError as e:
+            abort(context, grpc.StatusCode.INVALID_ARGUMENT, e.details())
+
+        payloads, errors, datasets = {}, {}, {}
+        for index, encodedPayload in enumerate(request.encodedPayloads):
+            try:
+                with stage("decode"):
+                    payloads[index] = decode(encodedPayload)
+                datasets.update(self._datasets.resolve(payloads[index]))
+            except InvalidRequestError as e:
+                errors[index] = e
+            except DatasetNotFoundError as e:
+                del payloads[index]
+                errors[index] = InvalidRequestError(e.message)
+
+        with stage("validate"):
+            validated = validate_batch(
+                list(payloads.values()), rawData=rawData, blobs=blobs, datasets=datasets
+            )
+        for index, error in zip(list(payloads), validated):
+            if error is not None:
+                del payloads[index]
+                errors[index] = error
+
+        for index, error in errors.items():
+            response = BatchPlotResponse(index=index, error=error.details())
+            compress_message(context, response.ByteSize())
+            yield response
+
+        submitted = time.perf_counter()
+        pending = {
+            self._pool.submit(timed, submitted, build, payload): index
+            for index, payload in payloads.items()
+        }
+        try:
+            for future in futures.as_completed(pending):
+                index = pending[future]
+                try:
+                    image, stages = future.result()
+                    merge(stages)
+                    metrics.IMAGE_BYTES.observe(len(image), method="GeneratePlots")
+                    response = BatchPlotResponse(index=index, image=image)
+                except InvalidRequestError as e:
+                    response = BatchPlotResponse(index=index, error=e.details())
+                except Exception as e:
+                    # NOTE: a chart failing to draw only fails its own entry of the batch
+                    logger.exception("Chart %d of a GeneratePlots batch failed", index)
+                    response = BatchPlotResponse(index=index, error=f"Could not render chart: {e}")
+                compress_message(context, response.ByteSize())
+                yield response
+        finally:
+            # NOTE: the client went away, drop the charts that haven't started yet
+            for future in pending:
+                future.cancel()
+
+    def GetCacheStats(self, request: CacheStatsRequest, context):
+        return CacheStatsResponse(**self._cache.stats())
+
+    # NOTE: a session's figure lives in the server process, its updates are drawn
+    # in the calling thread rather than on the render pool
+
+    def OpenSession(self, request: PlotRequest, context):
+        with metrics.request("OpenSession", context, payload_bytes=request.ByteSize()):
+            try:
+                rawData, blobs = request_data(request, context)
+                with stage("decode"):
+                    payload = decode(request_payload(request))
+                session_id, image = self._sessions.open(
+                    payload, rawData=rawData, blobs=blobs, datasets=self._datasets.resolve(payload)
+                )
+            except InvalidRequestError as e:
+                abort(context, grpc.StatusCode.INVALID_ARGUMENT, e.details())
+            except DatasetNotFoundError as e:
+                abort(context, grpc.StatusCode.NOT_FOUND, e.message)
+            except SessionLimitError as e:
+                abort(context, grpc.StatusCode.RESOURCE_EXHAUSTED, e.message)
+            metrics.IMAGE_BYTES.observe(len(image), method="OpenSession")
+            compress_response(context, len(image))
+
+        return SessionResponse(session_id=session_id, image=image)
+
+    def AppendData(self, request: AppendDataRequest, context):
+        with metrics.request("AppendData", context, payload_bytes=request.ByteSize()):
+            try:
+                image = self._sessions.append(
+                    request.session_id,
+                    rawData=request.rawData or None,
+                    blobs=dict(request.dataBlobs),
+                )
+            except InvalidRequestError as e:
+                abort(context, grpc.StatusCode.INVALID_ARGUMENT, e.details())
+            except SessionNotFoundError as e:
+                abort(context, grpc.StatusCode.NOT_FOUND, e.message)
+            except SessionLimitError as e:
+                abort(context, grpc.StatusCode.RESOURCE_EXHAUSTED, e.message)
+            metrics.IMAGE_BYTES.observe(len(image), method="AppendData")
+            compress_response(context, len(image))
+
+        return SessionResponse(session_id=request.session_id, image=image)
+
+    def CloseSession(self, request: CloseSessionRequest, context):
+        try:
+            self._sessions.close(request.session_id)
+        except SessionNotFoundError as e:
+            abort(context, grpc.StatusCode.NOT_FOUND, e.message)
+
+        return CloseSessionResponse()
+
+    def UploadDataset(self, request: UploadDatasetRequest, context):
+        with metrics.request("UploadDataset", context, payload_bytes=request.ByteSize()):
+            try:
+                dataset_id, dataframe = self._datasets.upload(
+                    request.rawData,
+                    format=request.format or "csv",
+                    compression=request.compression or None,
+                )
+            except InvalidRequestError as e:
+                abort(context, grpc.StatusCode.INVALID_ARGUMENT, e.details())
+            except DatasetLimitError as e:
+                abort(context, grpc.StatusCode.RESOURCE_EXHAUSTED, e.message)
+
+        return UploadDatasetResponse(
+            dataset_id=dataset_id,
+            rows=len(dataframe),
+            columns=[str(column) for column in dataframe.columns],
+        )
+
+
+def create_pool() -> RenderPool:
+    """Starts the render pool, warmed up before the server binds its port"""
+    started = time.perf_counter()
+    warm_up = config("RENDER_WARM_UP", default=True, cast=bool)
+    pool = RenderPool(
+        mode=config("RENDER_MODE", default="thread"),
+        workers=config("RENDER_WORKERS", default=0, cast=int),
+        max_tasks_per_worker=config("RENDER_MAX_TASKS_PER_WORKER", default=0, cast=int),
+        memory_limit_mb=config("RENDER_WORKER_MEMORY_MB", default=0, cast=int),
+        warm_up=warm_up,
+    )
+    pool.warm_up()
+    if warm_up and pool.mode == "process":
+        # NOTE: GeneratePlotStream renders in the server process itself
+        service.warm_up()
+
+    logger.info(
+        "Started %d %s render workers in %.2fs%s",
+        pool.workers,
+        pool.mode,
+        time.perf_counter() - started,
+        " (warmed up)" if warm_up else "",
+    )
+
+    return pool
+
+
+def create_cache() -> RenderCache:
+    return RenderCache(
+        max_bytes=config("RENDER_CACHE_BYTES", default=64 * 1024 * 1024, cast=int),
+        directory=config("RENDER_CACHE_DIR", default=""),
+        disk_max_bytes=config("RENDER_CACHE_DISK_BYTES", default=1024 * 1024 * 1024, cast=int),
+    )
+
+
+def create_sessions() -> SessionStore:
+    return SessionStore(
+        idle_timeout=config("SESSION_IDLE_TIMEOUT", default=300, cast=float),
+        max_bytes=config("SESSION_MAX_BYTES", default=256 * 1024 * 1024, cast=int),
+        sweep_interval=config("SESSION_SWEEP_INTERVAL", default=30, cast=float),
+    )
+
+
+def create_datasets() -> DatasetRegistry:
+    return DatasetRegistry(
+        ttl=config("DATASET_TTL", default=3600, cast=float),
+        max_bytes=config("DATASET_MAX_BYTES", default=512 * 1024 * 1024, cast=int),
+        spill_directory=config("DATASET_SPILL_DIR", default=""),
+        spill_max_bytes=config("DATASET_SPILL_BYTES", default=1024 * 1024 * 1024, cast=int),
+    )
+
+
+def start_metrics(pool: RenderPool, sessions: SessionStore, datasets: DatasetRegistry) -> None:
+    """Serves the Prometheus metrics on METRICS_ADDRESS, when set"""
+    address = config("METRICS_ADDRESS", default="")
+    if not address:
+        return
+
+    metrics.REGISTRY.register(
+        metrics.Gauge(
+            "plotter_pool_pending", "Render jobs submitted and not finished", function=lambda: pool.pending
+        )
+    )
+    metrics.REGISTRY.register(
+        metrics.Gauge(
+            "plotter_pool_queue_depth", "Render jobs waiting for a worker", function=lambda: pool.queued
+        )
+    )
+    metrics.REGISTRY.register(
+        metrics.Gauge(
+            "plotter_sessions", "Open live sessions", function=lambda: sessions.stats()["sessions"]
+        )
+    )
+    metrics.REGISTRY.register(
+        metrics.Gauge(
+            "plotter_dataset_bytes",
+            "Memory held by the uploaded datasets",
+            function=lambda: datasets.stats()["bytes"],
+        )
+    )
+    metrics.start_metrics_server(address)
+    logger.info("Serving metrics on http://%s/metrics", address)
+
 
 def run():
+    logging.basicConfig(
+        level=config("LOG_LEVEL", default="INFO"), format="%(asctime)s %(levelname)s %(message)s"
+    )
+    logger.info("Imported the plotting stack in %.2fs", time.perf_counter() - STARTED)
+
+    if config("SERVER_MODE", default="sync") == "aio":
+        import asyncio
+        from aio_server import serve
+
+        return asyncio.run(serve(started=STARTED))
+
     address = config("SERVER_ADDRESS")
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
+    pool = create_pool()
+    cache = create_cache()
+    sessions = create_sessions()
+    datasets = create_datasets()
+    start_metrics(pool, sessions, datasets)
+
+    # NOTE: the default compression of the responses, requests are read in whichever
+    # algorithm the client compressed them with
+    server = grpc.server(
+        futures.ThreadPoolExecutor(max_workers=config("SERVER_THREADS", default=10, cast=int)),
+        compression=grpc_compression(),
+    )
 
-    plotter_grpc.add_PlotterServiceServicer_to_server(PlotterServiceServicer(), server)
+    plotter_grpc.add_PlotterServiceServicer_to_server(
+        PlotterServiceServicer(
+            pool,
+            cache,
+            chunk_size=config("IMAGE_CHUNK_SIZE", default=1024 * 1024, cast=int),
+            sessions=sessions,
+            datasets=datasets,
+        ),
+        server,
+    )
     server.add_insecure_port(address)
     server.start()
-    server.wait_for_termination()
+    logger.info("Listening on %s, ready %.2fs after start", address, time.perf_counter() - STARTED)
+    try:
+        server.wait_for_termination()
+    finally:
+        sessions.shutdown()
+        pool.shutdown()
 
 
 if __name__ == "__main__":
@@ -1,13 +1,205 @@
+import time
+from concurrent.futures import Future
+from threading import Event
+from typing import BinaryIO, Callable, Dict, List
+
+from pandas import DataFrame
+
 from models.payload import PayloadModel
-from utils.validator import validate_data
+from proto.plotter_pb2 import Payload
+from utils.convert import payload_from_proto
+from utils import tiles
+from utils.exceptions import InvalidRequestError, RenderCancelledError
+from utils.metrics import merge, stage, timed
+from utils.validator import parse_blobs, resolve_blob, validate_data
 from utils.wrapper import build_image
 
 
-def plot(payload: PayloadModel, rawData: bytes = None) -> bytes:
-    """Triggers the plotter engine for the given request"""
+def plot(
+    payload: PayloadModel,
+    rawData: bytes | BinaryIO = None,
+    blobs: Dict[str, bytes] = None,
+    checkpoint: Callable[[], None] = None,
+    datasets: Dict[str, DataFrame] = None,
+) -> bytes:
+    """Triggers the plotter engine for the given request,
+    checkpoint is called between the stages to stop abandoned renders"""
 
-    validate_data(dataList=payload.data, rawData=rawData)
+    with stage("validate"):
+        validate_data(
+            dataList=payload.data,
+            rawData=rawData,
+            blobs=blobs,
+            plots=payload.image.plots,
+            datasets=datasets,
+        )
+    if checkpoint is not None:
+        checkpoint()
 
-    image_buffer = build_image(payload=payload)
+    image_buffer = build_image(payload=payload, checkpoint=checkpoint)
 
     return image_buffer
+
+
+def build(payload: PayloadModel) -> bytes:
+    """Draws a payload whose data was already validated"""
+
+    return build_image(payload=payload)
+
+
+def render_tiles(
+    submit: Callable[..., Future],
+    payload: PayloadModel,
+    rawData: bytes = None,
+    blobs: Dict[str, bytes] = None,
+    checkpoint: Callable[[], None] = None,
+    datasets: Dict[str, DataFrame] = None,
+) -> bytes:
+    """Plots a parallel grid layout, the data is parsed once here then every cell is
+    drawn as a tile through submit (the render pool's) and the tiles are composited"""
+
+    with stage("validate"):
+        validate_data(
+            dataList=payload.data,
+            rawData=rawData or None,
+            blobs=blobs,
+            plots=payload.image.plots,
+            datasets=datasets,
+        )
+
+    # NOTE: the stages of the tiles add up, they overlap when the tiles are drawn in parallel
+    pending = [
+        (box, submit(timed, time.perf_counter(), build, tile)) for box, tile in tiles.split(payload)
+    ]
+    try:
+        images = []
+        for box, future in pending:
+            if checkpoint is not None:
+                checkpoint()
+            image, stages = future.result()
+            merge(stages)
+            images.append((box, image))
+    finally:
+        for _, future in pending:
+            future.cancel()
+
+    return tiles.compose(payload, images)
+
+
+def decode(encodedPayload: bytes | Payload) -> PayloadModel:
+    """Decodes the JSON or protobuf payload of a request"""
+
+    if isinstance(encodedPayload, Payload):
+        return payload_from_proto(encodedPayload)
+
+    try:
+        # NOTE: parses and validates in one pass with the model's compiled validator
+        return PayloadModel.model_validate_json(encodedPayload)
+    except ValueError as e:
+        raise InvalidRequestError(f"Invalid payload: {e}")
+
+
+def render(
+    encodedPayload: bytes | Payload,
+    rawData: bytes = None,
+    blobs: Dict[str, bytes] = None,
+    deadline: float = None,
+    cancelled: Event = None,
+    datasets: Dict[str, DataFrame] = None,
+) -> bytes:
+    """Decodes a raw request and plots it, entry point of the render workers.
+    datasets holds the frames of the uploaded datasets the payload refers to"""
+
+    check = checkpoint(deadline=deadline, cancelled=cancelled)
+    check()
+    with stage("decode"):
+        payload = decode(encodedPayload)
+    check()
+
+    # NOTE: proto3 sends unset bytes as empty
+    return plot(
+        payload=payload, rawData=rawData or None, blobs=blobs, checkpoint=check, datasets=datasets
+    )
+
+
+def checkpoint(deadline: float = None, cancelled: Event = None) -> Callable[[], None]:
+    """Builds a check raising RenderCancelledError once the request is cancelled
+    or past its deadline (a time.time() timestamp)"""
+
+    def check() -> None:
+        if cancelled is not None and cancelled.is_set():
+            raise RenderCancelledError("Request cancelled by the client")
+        if deadline is not None and time.time() > deadline:
+            raise RenderCancelledError("Request deadline exceeded")
+
+    return check
+
+
+def validate_batch(
+    payloads: List[PayloadModel],
+    rawData: bytes = None,
+    blobs: Dict[str, bytes] = None,
+    datasets: Dict[str, DataFrame] = None,
+) -> List[InvalidRequestError]:
+    """Validates the data of several payloads, parsing each shared blob once.
+    Returns the error of every payload, None for the valid ones"""
+
+    frames: Dict[str, DataFrame] = {}
+    failures: Dict[str, InvalidRequestError] = {}
+    # NOTE: parses every distinct blob up front and in parallel, checking unique indexes
+    # for any plot, failures are memoized and attributed to their payloads below
+    fileList = []
+    for payload in payloads:
+        files = [data for data in payload.data or [] if data.datatype == "file"]
+        try:
+            for data in files:
+                if data.dataset_id is None:
+                    resolve_blob(data, rawData=rawData, blobs=blobs)
+        except InvalidRequestError:
+            # NOTE: the missing blob is reported by the payload's own validation
+            continue
+        fileList.extend(files)
+    parse_blobs(fileList, frames, failures, rawData=rawData, blobs=blobs)
+
+    errors = []
+    for payload in payloads:
+        try:
+            validate_data(
+                dataList=payload.data,
+                rawData=rawData,
+                blobs=blobs,
+                frames=frames,
+                plots=payload.image.plots,
+                datasets=datasets,
+                failures=failures,
+            )
+            errors.append(None)
+        except InvalidRequestError as e:
+            errors.append(e)
+
+    return errors
+
+
+WARM_UP_PAYLOAD = b"""{
+    "data": [
+        {"datatype": "file", "filename": "warm_up.csv"},
+        {"datatype": "Function", "function": "\\\\sin(x)", "limits": [0, 10]},
+        {"datatype": "file", "filename": "warm_up.csv", "plotID": 1}
+    ],
+    "image": {
+        "graphs": {"0": {"plot_id_list": [0, 1]}},
+        "plots": {"0": {"decimation": "lttb"}, "1": {"plotID": 1, "plotType": "ScatterPlotModel"}}
+    }
+}"""
+
+
+def warm_up() -> float:
+    """Renders a synthetic chart so that the lazy initializations of the stack (CSV parser,
+    function compiler, fonts, Agg, PNG encoder) happen before the first real request,
+    returns its duration in seconds"""
+
+    started = time.perf_counter()
+    rawData = "x,y\n" + "".join(f"{x / 100},{(x % 7) / 7}\n" for x in range(5000))
+    render(WARM_UP_PAYLOAD, rawData.encode("utf8"))
+
+    return time.perf_counter() - started
@@ -0,0 +1,255 @@
+import asyncio
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from concurrent.futures import Future
+from tempfile import NamedTemporaryFile
+from threading import Lock
+from typing import Awaitable, Callable, Dict, Optional
+
+
+class RenderCache(object):
+    """RenderCache is a content-addressed image cache with an in-memory LRU tier,
+    an optional on-disk tier and coalescing of identical in-flight renders"""
+
+    _max_bytes: int
+    _directory: str
+    _disk_max_bytes: int
+    _memory: "OrderedDict[str, bytes]"
+    _disk: "OrderedDict[str, int]"
+    _inflight: Dict[str, Future]
+    _pending: Dict[str, asyncio.Future]
+    _counters: Dict[str, int]
+    _lock: Lock
+
+    def __init__(
+        self, max_bytes: int = 0, directory: str = None, disk_max_bytes: int = 0
+    ) -> None:
+        self._max_bytes = max_bytes
+        self._directory = directory or None
+        self._disk_max_bytes = disk_max_bytes
+        self._memory = OrderedDict()
+        self._disk = OrderedDict()
+        self._inflight = {}
+        self._pending = {}
+        self._counters = dict.fromkeys(
+            (
+                "hits",
+                "disk_hits",
+                "misses",
+                "coalesced",
+                "evictions",
+                "disk_evictions",
+                "bytes",
+                "disk_bytes",
+            ),
+            0,
+        )
+        self._lock = Lock()
+
+        if self._directory is not None:
+            os.makedirs(self._directory, exist_ok=True)
+            self._load_disk_index()
+
+    @staticmethod
+    def key(encodedPayload: bytes, *blobs: bytes) -> str:
+        """Hashes the normalized payload together with its data blobs"""
+        try:
+            normalized = json.dumps(
+                json.loads(encodedPayload), sort_keys=True, separators=(",", ":")
+            ).encode("utf8")
+        except ValueError:
+            # NOTE: let the render report the malformed payload, never the cache
+            normalized = encodedPayload
+
+        digest = hashlib.sha256()
+        for part in (normalized, *blobs):
+            part = part or b""
+            digest.update(len(part).to_bytes(8, "little"))
+            digest.update(part)
+
+        return digest.hexdigest()
+
+    def get_or_render(self, key: str, render: Callable[[], bytes]) -> bytes:
+        """Returns the cached image for key, or renders it once for every concurrent caller"""
+        image = self.lookup(key)
+        if image is not None:
+            return image
+
+        owner = False
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                self._counters["coalesced"] += 1
+            else:
+                future = self._inflight[key] = Future()
+                future.set_running_or_notify_cancel()
+                owner = True
+
+        if not owner:
+            return future.result()
+
+        try:
+            image = render()
+            self.store(key, image)
+            future.set_result(image)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+        return image
+
+    async def get_or_render_async(self, key: str, render: Callable[[], Awaitable[bytes]]) -> bytes:
+        """Asyncio counterpart of get_or_render, callers of one event loop share a render"""
+        while True:
+            image = self.lookup(key)
+            if image is not None:
+                return image
+
+            shared = self._pending.get(key)
+            if shared is None:
+                break
+
+            with self._lock:
+                self._counters["coalesced"] += 1
+            try:
+                return await asyncio.shield(shared)
+            except asyncio.CancelledError:
+                # NOTE: only retry when the first caller went away, not when this one did
+                if not shared.cancelled():
+                    raise
+
+        shared = self._pending[key] = asyncio.get_running_loop().create_future()
+        try:
+            image = await render()
+        except asyncio.CancelledError:
+            shared.cancel()
+            raise
+        except BaseException as e:
+            shared.set_exception(e)
+            # NOTE: nobody may be waiting, don't log the exception as never retrieved
+            shared.exception()
+            raise
+        finally:
+            self._pending.pop(key, None)
+
+        self.store(key, image)
+        shared.set_result(image)
+
+        return image
+
+    def lookup(self, key: str) -> Optional[bytes]:
+        """Returns the image cached in memory or on disk, or None"""
+        with self._lock:
+            image = self._memory.get(key)
+            if image is not None:
+                self._memory.move_to_end(key)
+                self._counters["hits"] += 1
+                return image
+
+        image = self._read_disk(key)
+        if image is not None:
+            self._store_memory(key, image)
+
+        return image
+
+    def store(self, key: str, image: bytes) -> None:
+        """Caches a freshly rendered image in both tiers"""
+        with self._lock:
+            self._counters["misses"] += 1
+
+        self._write_disk(key, image)
+        self._store_memory(key, image)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                **self._counters,
+                "entries": len(self._memory),
+                "disk_entries": len(self._disk),
+                "max_bytes": self._max_bytes,
+                "disk_max_bytes": self._disk_max_bytes,
+            }
+
+    def _store_memory(self, key: str, image: bytes) -> None:
+        if len(image) > self._max_bytes:
+            return
+
+        with self._lock:
+            if key in self._memory:
+                return
+            self._memory[key] = image
+            self._counters["bytes"] += len(image)
+            while self._counters["bytes"] > self._max_bytes:
+                _, evicted = self._memory.popitem(last=False)
+                self._counters["bytes"] -= len(evicted)
+                self._counters["evictions"] += 1
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self._directory, key[:2], key)
+
+    def _load_disk_index(self) -> None:
+        entries = []
+        for root, _, files in os.walk(self._directory):
+            if root == self._directory:
+                continue
+            for name in files:
+                stat = os.stat(os.path.join(root, name))
+                entries.append((stat.st_mtime, name, stat.st_size))
+
+        for _, key, size in sorted(entries):
+            self._disk[key] = size
+            self._counters["disk_bytes"] += size
+
+    def _read_disk(self, key: str) -> bytes:
+        if self._directory is None:
+            return None
+
+        with self._lock:
+            if key not in self._disk:
+                return None
+            self._disk.move_to_end(key)
+
+        try:
+            with open(self._path(key), "rb") as f:
+                image = f.read()
+        except OSError:
+            with self._lock:
+                self._counters["disk_bytes"] -= self._disk.pop(key, 0)
+            return None
+
+        with self._lock:
+            self._counters["disk_hits"] += 1
+
+        return image
+
+    def _write_disk(self, key: str, image: bytes) -> None:
+        if self._directory is None or len(image) > self._disk_max_bytes:
+            return
+
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # NOTE: write then rename so readers never see a partial image
+        with NamedTemporaryFile(dir=self._directory, suffix=".tmp", delete=False) as f:
+            f.write(image)
+        os.replace(f.name, path)
+
+        evicted = []
+        with self._lock:
+            self._counters["disk_bytes"] += len(image) - self._disk.pop(key, 0)
+            self._disk[key] = len(image)
+            while self._counters["disk_bytes"] > self._disk_max_bytes:
+                old_key, size = self._disk.popitem(last=False)
+                self._counters["disk_bytes"] -= size
+                self._counters["disk_evictions"] += 1
+                evicted.append(old_key)
+
+        for old_key in evicted:
+            try:
+                os.remove(self._path(old_key))
+            except OSError:
+                pass
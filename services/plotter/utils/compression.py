@@ -0,0 +1,77 @@
+import gzip
+import zlib
+from io import BufferedReader
+from typing import BinaryIO
+
+import grpc
+from decouple import config
+from pyarrow import CompressedInputStream, PythonFile
+
+from utils.exceptions import InvalidRequestError
+
+
+"""
+Compression of the plotter's traffic.
+gRPC messages are compressed with the GRPC_COMPRESSION algorithm (gzip or deflate), except those
+under GRPC_COMPRESSION_MIN_BYTES which take longer to compress than their bytes take to send,
+the server decompresses whatever algorithm a client chose for its requests.
+Data blobs may also arrive compressed ahead by the client (a gzip or zstd frame, named by the
+compression of their file data), they are decompressed as a stream while being parsed.
+
+References:
+gRPC compression    https://github.com/grpc/grpc/blob/master/doc/compression.md
+Zstandard frames    https://datatracker.ietf.org/doc/html/rfc8878#section-3.1.1
+"""
+
+
+GRPC_COMPRESSION = config("GRPC_COMPRESSION", default="none")
+GRPC_COMPRESSION_MIN_BYTES = config("GRPC_COMPRESSION_MIN_BYTES", default=4096, cast=int)
+
+ALGORITHMS = {
+    "none": grpc.Compression.NoCompression,
+    "gzip": grpc.Compression.Gzip,
+    "deflate": grpc.Compression.Deflate,
+}
+# NOTE: corrupt or truncated streams fail as these while the parser reads them
+DECOMPRESS_ERRORS = (OSError, EOFError, zlib.error)
+
+
+def grpc_compression(algorithm: str = None) -> grpc.Compression:
+    """gRPC compression of an algorithm name, GRPC_COMPRESSION by default"""
+    algorithm = GRPC_COMPRESSION if algorithm is None else algorithm
+    if algorithm.lower() not in ALGORITHMS:
+        raise ValueError(f"Unsupported gRPC compression {algorithm}, expected {list(ALGORITHMS)}")
+
+    return ALGORITHMS[algorithm.lower()]
+
+
+def call_compression(size: int, algorithm: str = None, min_bytes: int = None) -> grpc.Compression:
+    """Compression of a message of size bytes, none below the min_bytes threshold"""
+    min_bytes = GRPC_COMPRESSION_MIN_BYTES if min_bytes is None else min_bytes
+    if size < min_bytes:
+        return grpc.Compression.NoCompression
+
+    return grpc_compression(algorithm)
+
+
+def compress_response(context, size: int) -> None:
+    """Sends the response of a unary call uncompressed when it is below the threshold"""
+    if size < GRPC_COMPRESSION_MIN_BYTES:
+        context.set_compression(grpc.Compression.NoCompression)
+
+
+def compress_message(context, size: int) -> None:
+    """Sends the next message of a streaming call uncompressed when it is below the threshold"""
+    if size < GRPC_COMPRESSION_MIN_BYTES:
+        context.disable_next_message_compression()
+
+
+def decompress(stream: BinaryIO, compression: str) -> BinaryIO:
+    """Decompressing stream over a gzip or zstd compressed stream"""
+    if compression == "gzip":
+        return gzip.GzipFile(fileobj=stream, mode="rb")
+    if compression == "zstd":
+        # NOTE: buffered so the parser can peek the header without consuming it
+        return BufferedReader(CompressedInputStream(PythonFile(stream, mode="r"), "zstd"))
+
+    raise InvalidRequestError(f"Unsupported data compression {compression}")
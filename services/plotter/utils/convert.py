@@ -0,0 +1,116 @@
+from typing import Any, Dict, Iterable
+
+from pydantic import ValidationError
+
+from models.payload import PayloadModel
+from proto.plotter_pb2 import Data, Figure, Graph, Image, Payload, Plot
+from utils.exceptions import InvalidRequestError
+
+
+"""
+Converts the structured protobuf payload into the pydantic models.
+Only the fields set on the messages are copied into plain dicts, which the payload's
+compiled validator turns into models in one pass, unset fields keep the model defaults.
+"""
+
+
+PLOT_FIELDS = (
+    "plotType",
+    "decimation",
+    "points_per_pixel",
+    "marker",
+    "s",
+    "c",
+    "cmap",
+    "norm",
+    "vmin",
+    "vmax",
+    "alpha",
+    "density",
+    "density_threshold",
+)
+
+
+def payload_from_proto(message: Payload) -> PayloadModel:
+    fields: Dict[str, Any] = {"image": image_fields(message.image)}
+    if message.data:
+        fields["data"] = [data_fields(data) for data in message.data]
+
+    try:
+        return PayloadModel.model_validate(fields)
+    except ValidationError as e:
+        raise InvalidRequestError(f"Invalid payload: {e}")
+
+
+def data_fields(message: Data) -> Dict[str, Any]:
+    fields: Dict[str, Any] = {"plotID": message.plotID, "graphID": message.graphID}
+    if message.limits:
+        fields["limits"] = tuple(message.limits)
+
+    source = message.WhichOneof("source")
+    if source == "file":
+        file = message.file
+        fields.update(
+            datatype="file",
+            filename=file.filename,
+            **set_fields(file, ("format", "compression")),
+        )
+        if file.dataset_id:
+            fields["dataset_id"] = file.dataset_id
+        if file.axis:
+            fields["axis"] = list(file.axis)
+        if file.column_names:
+            fields["column_names"] = dict(file.column_names)
+    elif source == "function":
+        function = message.function
+        fields.update(
+            datatype="Function",
+            function=function.function,
+            **set_fields(function, ("resolution", "adaptive", "tolerance", "max_points")),
+        )
+    else:
+        raise InvalidRequestError("Expected a file or a function data source")
+
+    return fields
+
+
+def image_fields(message: Image) -> Dict[str, Any]:
+    fields = set_fields(message, ("save", "format", "profile"))
+    if message.HasField("figure"):
+        fields["figure"] = figure_fields(message.figure)
+    if message.HasField("layout"):
+        fields["layout"] = set_fields(message.layout, ("nrows", "ncols", "parallel"))
+    if message.graphs:
+        fields["graphs"] = {key: graph_fields(graph) for key, graph in message.graphs.items()}
+    if message.plots:
+        fields["plots"] = {key: plot_fields(plot) for key, plot in message.plots.items()}
+
+    return fields
+
+
+def figure_fields(message: Figure) -> Dict[str, Any]:
+    fields = set_fields(message, ("dpi", "facecolor", "edgecolor", "frameon", "layout"))
+    if message.figsize:
+        fields["figsize"] = tuple(message.figsize)
+
+    return fields
+
+
+def graph_fields(message: Graph) -> Dict[str, Any]:
+    fields: Dict[str, Any] = {"graphID": message.graphID}
+    if message.plot_id_list:
+        fields["plot_id_list"] = list(message.plot_id_list)
+
+    return fields
+
+
+def plot_fields(message: Plot) -> Dict[str, Any]:
+    return {
+        "plotID": message.plotID,
+        **set_fields(message, PLOT_FIELDS),
+    }
+
+
+def set_fields(message, names: Iterable[str]) -> Dict[str, Any]:
+    """Values of the optional fields set on message, the others keep the model defaults"""
+    return {name: getattr(message, name) for name in names if message.HasField(name)}
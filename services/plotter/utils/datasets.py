@@ -0,0 +1,247 @@
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from tempfile import NamedTemporaryFile
+from threading import Lock
+from typing import Dict, List, Tuple
+
+from pandas import DataFrame, read_parquet
+
+from models.payload import PayloadModel
+from utils.exceptions import DatasetLimitError, DatasetNotFoundError
+from utils.metrics import stage
+from utils.validator import read_data, validate_dataframe
+
+
+"""
+Datasets uploaded once and referenced by id from the file data of later payloads.
+An upload is parsed and validated once, its frame is kept in memory under the hash of its
+content, so styling the same data differently costs neither the upload nor the parse again.
+Frames are dropped once unused for the ttl, the least recently used ones beyond the memory
+budget are spilled to a parquet file when a spill directory is set, and read back on use.
+"""
+
+
+class DatasetRegistry(object):
+    """DatasetRegistry holds the uploaded frames, in memory up to max_bytes
+    and in spill_directory up to spill_max_bytes"""
+
+    _ttl: float
+    _max_bytes: int
+    _directory: str
+    _spill_max_bytes: int
+    _memory: "OrderedDict[str, DataFrame]"
+    _spilled: "OrderedDict[str, int]"
+    _sizes: Dict[str, int]
+    _used: Dict[str, float]
+    _counters: Dict[str, int]
+    _lock: Lock
+
+    def __init__(
+        self,
+        ttl: float = 3600,
+        max_bytes: int = 512 * 1024 * 1024,
+        spill_directory: str = None,
+        spill_max_bytes: int = 1024 * 1024 * 1024,
+    ) -> None:
+        self._ttl = ttl
+        self._max_bytes = max_bytes
+        self._directory = spill_directory or None
+        self._spill_max_bytes = spill_max_bytes
+        self._memory = OrderedDict()
+        self._spilled = OrderedDict()
+        self._sizes = {}
+        self._used = {}
+        self._counters = dict.fromkeys(
+            ("uploads", "deduplicated", "hits", "spill_hits", "evictions", "spills", "expired"), 0
+        )
+        self._lock = Lock()
+
+        if self._directory is not None:
+            os.makedirs(self._directory, exist_ok=True)
+            self._load_spill_index()
+
+    @staticmethod
+    def key(rawData: bytes, format: str = "csv", compression: str = None) -> str:
+        """Content hash of a dataset, the id it is referenced by"""
+        digest = hashlib.sha256(format.encode("utf8") + b"\0")
+        if compression is not None:
+            digest.update(compression.encode("utf8") + b"\0")
+        digest.update(rawData)
+
+        return digest.hexdigest()
+
+    def upload(
+        self, rawData: bytes, format: str = "csv", compression: str = None
+    ) -> Tuple[str, DataFrame]:
+        """Parses and validates a dataset unless the same content is held already,
+        returns its id and frame"""
+        self.expire()
+        dataset_id = self.key(rawData, format=format, compression=compression)
+        try:
+            dataframe = self.get(dataset_id)
+            with self._lock:
+                self._counters["deduplicated"] += 1
+            return dataset_id, dataframe
+        except DatasetNotFoundError:
+            pass
+
+        # NOTE: the index is only checked for uniqueness by the plots that need it
+        with stage("validate"):
+            dataframe = read_data(rawData, format=format, compression=compression)
+            dataframe = validate_dataframe(dataframe, unique_index=False)
+        if frame_bytes(dataframe) > self._max_bytes:
+            raise DatasetLimitError(f"Dataset exceeds {self._max_bytes} bytes")
+
+        with self._lock:
+            self._counters["uploads"] += 1
+        self._store(dataset_id, dataframe)
+
+        return dataset_id, dataframe
+
+    def get(self, dataset_id: str) -> DataFrame:
+        """Frame of a dataset, read back from its spill file when it was spilled"""
+        with self._lock:
+            dataframe = self._memory.get(dataset_id)
+            if dataframe is not None:
+                self._memory.move_to_end(dataset_id)
+                self._used[dataset_id] = time.time()
+                self._counters["hits"] += 1
+                return dataframe
+            spilled = dataset_id in self._spilled
+
+        if not spilled:
+            raise DatasetNotFoundError(f"Unknown or expired dataset {dataset_id}")
+
+        try:
+            dataframe = read_parquet(self._path(dataset_id))
+        except OSError:
+            with self._lock:
+                self._spilled.pop(dataset_id, None)
+            raise DatasetNotFoundError(f"Unknown or expired dataset {dataset_id}")
+
+        with self._lock:
+            self._counters["spill_hits"] += 1
+        self._store(dataset_id, dataframe)
+
+        return dataframe
+
+    def resolve(self, payload: PayloadModel) -> Dict[str, DataFrame]:
+        """Frames of the datasets referenced by the file data of payload"""
+        ids = [
+            data.dataset_id
+            for data in payload.data or []
+            if data.datatype == "file" and data.dataset_id is not None
+        ]
+        if not ids:
+            return {}
+
+        self.expire()
+
+        return {dataset_id: self.get(dataset_id) for dataset_id in dict.fromkeys(ids)}
+
+    def expire(self) -> None:
+        """Drops the datasets unused for longer than the ttl, in memory and spilled"""
+        limit = time.time() - self._ttl
+        with self._lock:
+            expired = [key for key, used in self._used.items() if used < limit]
+            for key in expired:
+                del self._used[key]
+                self._memory.pop(key, None)
+                self._sizes.pop(key, None)
+                self._spilled.pop(key, None)
+            self._counters["expired"] += len(expired)
+
+        self._remove_spilled(expired)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                **self._counters,
+                "datasets": len(self._memory),
+                "bytes": sum(self._sizes.values()),
+                "spilled": len(self._spilled),
+                "spilled_bytes": sum(self._spilled.values()),
+            }
+
+    def _store(self, dataset_id: str, dataframe: DataFrame) -> None:
+        """Keeps a frame in memory, evicting (and spilling) the least recently used ones"""
+        with self._lock:
+            self._memory[dataset_id] = dataframe
+            self._memory.move_to_end(dataset_id)
+            self._sizes[dataset_id] = frame_bytes(dataframe)
+            self._used[dataset_id] = time.time()
+
+            evicted = []
+            total = sum(self._sizes.values())
+            while total > self._max_bytes and len(self._memory) > 1:
+                key, frame = self._memory.popitem(last=False)
+                total -= self._sizes.pop(key)
+                self._counters["evictions"] += 1
+                if key not in self._spilled:
+                    evicted.append((key, frame))
+                else:
+                    self._spilled.move_to_end(key)
+
+        for key, frame in evicted:
+            self._spill(key, frame)
+
+    def _path(self, dataset_id: str) -> str:
+        return os.path.join(self._directory, f"{dataset_id}.parquet")
+
+    def _load_spill_index(self) -> None:
+        """Indexes the datasets spilled by a previous run, their ttl runs from their mtime"""
+        entries = []
+        for name in os.listdir(self._directory):
+            key, extension = os.path.splitext(name)
+            if extension == ".parquet":
+                stat = os.stat(os.path.join(self._directory, name))
+                entries.append((stat.st_mtime, key, stat.st_size))
+
+        for used, key, size in sorted(entries):
+            self._spilled[key] = size
+            self._used[key] = used
+
+    def _spill(self, dataset_id: str, dataframe: DataFrame) -> None:
+        if self._directory is None:
+            with self._lock:
+                self._used.pop(dataset_id, None)
+            return
+
+        # NOTE: write then rename so readers never see a partial file
+        with NamedTemporaryFile(dir=self._directory, suffix=".tmp", delete=False) as f:
+            dataframe.to_parquet(f)
+        size = os.path.getsize(f.name)
+        if size > self._spill_max_bytes:
+            os.remove(f.name)
+            with self._lock:
+                self._used.pop(dataset_id, None)
+            return
+        os.replace(f.name, self._path(dataset_id))
+
+        removed = []
+        with self._lock:
+            self._spilled[dataset_id] = size
+            self._counters["spills"] += 1
+            while sum(self._spilled.values()) > self._spill_max_bytes:
+                key, _ = self._spilled.popitem(last=False)
+                if key not in self._memory:
+                    self._used.pop(key, None)
+                removed.append(key)
+
+        self._remove_spilled(removed)
+
+    def _remove_spilled(self, keys: List[str]) -> None:
+        if self._directory is None:
+            return
+
+        for key in keys:
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+
+def frame_bytes(dataframe: DataFrame) -> int:
+    return int(dataframe.memory_usage(index=True, deep=False).sum())
@@ -0,0 +1,80 @@
+import numpy as np
+
+
+"""
+Vectorized series decimation, both algorithms return the positions of the kept points.
+
+References:
+LTTB    https://skemman.is/bitstream/1946/15343/3/SS_MSthesis.pdf
+"""
+
+
+def decimate(x: np.ndarray, y: np.ndarray, method: str, n_out: int) -> np.ndarray:
+    """Positions of the points to draw, x must be sorted in increasing order"""
+    n_out = max(n_out, 4)
+    if len(y) <= n_out:
+        return np.arange(len(y))
+
+    if method == "lttb":
+        return lttb(x, y, n_out)
+    if method == "minmax":
+        return minmax(x, y, n_out)
+
+    raise ValueError(f"Invalid decimation method {method}")
+
+
+def minmax(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Keeps the first and last points and the min and max of every x bucket,
+    buckets have the same width in x so that each covers about the same pixels"""
+    n_buckets = max((n_out - 2) // 2, 1)
+    edges = np.linspace(x[0], x[-1], n_buckets + 1)
+    starts = np.unique(np.searchsorted(x, edges[:-1], side="left"))
+    starts = starts[starts < len(y)]
+    counts = np.diff(np.append(starts, len(y)))
+    ids = np.repeat(np.arange(len(starts)), counts)
+
+    mins = first_match(y == np.minimum.reduceat(y, starts)[ids], ids)
+    maxs = first_match(y == np.maximum.reduceat(y, starts)[ids], ids)
+
+    return np.unique(np.concatenate(([0], mins, maxs, [len(y) - 1])))
+
+
+def first_match(matches: np.ndarray, ids: np.ndarray) -> np.ndarray:
+    """Position of the first match of every bucket"""
+    positions = np.flatnonzero(matches)
+    _, first = np.unique(ids[positions], return_index=True)
+
+    return positions[first]
+
+
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets over equal-count buckets.
+    The triangles are anchored on the averages of the neighbouring buckets
+    instead of the previously selected point, which keeps every bucket independent"""
+    n = len(y)
+    n_buckets = n_out - 2
+    starts = np.linspace(1, n - 1, n_buckets + 1).astype(np.int64)
+    starts, ends = starts[:-1], starts[1:]
+    counts = ends - starts
+
+    mean_x = np.add.reduceat(x[1:-1], starts - 1) / counts
+    mean_y = np.add.reduceat(y[1:-1], starts - 1) / counts
+    prev_x = np.concatenate(([x[0]], mean_x[:-1]))
+    prev_y = np.concatenate(([y[0]], mean_y[:-1]))
+    next_x = np.concatenate((mean_x[1:], [x[-1]]))
+    next_y = np.concatenate((mean_y[1:], [y[-1]]))
+
+    # NOTE: buckets differ by at most one point, pad them into a (buckets, size) grid
+    positions = starts[:, None] + np.arange(counts.max())[None, :]
+    padded = positions >= ends[:, None]
+    positions = np.minimum(positions, n - 2)
+
+    areas = np.abs(
+        (prev_x - next_x)[:, None] * (y[positions] - prev_y[:, None])
+        - (prev_x[:, None] - x[positions]) * (next_y - prev_y)[:, None]
+    )
+    areas[padded] = -1.0
+
+    selected = positions[np.arange(n_buckets), areas.argmax(axis=1)]
+
+    return np.concatenate(([0], selected, [n - 1]))
@@ -0,0 +1,70 @@
+from io import BytesIO
+from typing import Any, Dict
+
+from matplotlib.figure import Figure
+from PIL import Image
+
+
+"""
+Encodes a drawn figure according to a render profile.
+default keeps matplotlib's savefig, fast and small draw the Agg canvas once and hand its
+RGBA buffer to Pillow without copying it, trading encoding speed against image size.
+
+References:
+Pillow formats  https://pillow.readthedocs.io/en/stable/handbook/image-file-formats.html
+"""
+
+
+# NOTE: Pillow save options per profile and format, formats missing here fall back to savefig
+PROFILES: Dict[str, Dict[str, Dict[str, Any]]] = {
+    "fast": {
+        "png": {"compress_level": 1},
+        "jpeg": {"quality": 80},
+        "webp": {"quality": 80, "method": 0},
+    },
+    "small": {
+        "png": {"compress_level": 9},
+        "jpeg": {"quality": 60, "optimize": True},
+        "webp": {"quality": 60, "method": 6},
+    },
+}
+FORMATS = {"jpg": "jpeg"}
+RAW_FORMATS = {"raw", "rgba"}
+RASTER_FORMATS = {"png", "jpeg", "webp", *RAW_FORMATS}
+# NOTE: plots use few colors, a palette keeps them sharp for a fraction of the bytes
+PALETTE_COLORS = 256
+
+
+def encode(fig: Figure, format: str = "png", profile: str = "default") -> bytes:
+    format = FORMATS.get(format.lower(), format.lower())
+    options = PROFILES.get(profile, {}).get(format)
+    if options is None and not (profile != "default" and format in RAW_FORMATS):
+        buffer = BytesIO()
+        # NOTE: savefig's default dpi is the one the figure was created with, not its current one
+        fig.savefig(buffer, format=format, dpi=fig.dpi)
+        return buffer.getvalue()
+
+    fig.canvas.draw()
+
+    return encode_rgba(fig.canvas.buffer_rgba(), format=format, profile=profile)
+
+
+def encode_rgba(rgba, format: str = "png", profile: str = "default") -> bytes:
+    """Encodes a (height, width, 4) RGBA pixel buffer with Pillow, without copying it,
+    the default profile uses Pillow's default settings"""
+    format = FORMATS.get(format.lower(), format.lower())
+    if format in RAW_FORMATS:
+        return memoryview(rgba).tobytes()
+
+    options = PROFILES.get(profile, {}).get(format, {})
+    height, width = rgba.shape[:2]
+    image = Image.frombuffer("RGBA", (width, height), rgba, "raw", "RGBA", 0, 1)
+    if format == "jpeg":
+        image = image.convert("RGB")
+    elif format == "png" and profile == "small":
+        image = image.quantize(PALETTE_COLORS, method=Image.Quantize.FASTOCTREE)
+
+    buffer = BytesIO()
+    image.save(buffer, format=format, **options)
+
+    return buffer.getvalue()
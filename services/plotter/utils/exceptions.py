@@ -1,5 +1,61 @@
+from models.report import ValidationReportModel
+
+
 class InvalidRequestError(Exception):
     """Specifies an invalid request format or content"""
 
-    def __init__(self):
-        super().__init__(self)
+    def __init__(self, message: str = "Invalid request", report: ValidationReportModel = None):
+        super().__init__(message)
+        self.message = message
+        self.report = report
+
+    def __reduce__(self):
+        # NOTE: keeps the report when the error crosses a render process boundary
+        return (self.__class__, (self.message, self.report))
+
+    def details(self) -> str:
+        """Describes the error for the client, as the JSON report when there is one"""
+        if self.report is None:
+            return self.message
+
+        return self.report.model_dump_json()
+
+
+class RenderCancelledError(Exception):
+    """Specifies a render abandoned by its client or past its deadline"""
+
+    def __init__(self, message: str = "Render cancelled"):
+        super().__init__(message)
+        self.message = message
+
+
+class SessionNotFoundError(Exception):
+    """Specifies a live session that was never opened, was closed or has expired"""
+
+    def __init__(self, message: str = "Session not found"):
+        super().__init__(message)
+        self.message = message
+
+
+class SessionLimitError(Exception):
+    """Specifies a live session grown beyond the memory allowed to sessions"""
+
+    def __init__(self, message: str = "Session too large"):
+        super().__init__(message)
+        self.message = message
+
+
+class DatasetNotFoundError(Exception):
+    """Specifies a dataset that was never uploaded or has expired"""
+
+    def __init__(self, message: str = "Dataset not found"):
+        super().__init__(message)
+        self.message = message
+
+
+class DatasetLimitError(Exception):
+    """Specifies a dataset larger than the memory allowed to datasets"""
+
+    def __init__(self, message: str = "Dataset too large"):
+        super().__init__(message)
+        self.message = message
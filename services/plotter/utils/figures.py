@@ -0,0 +1,200 @@
+from collections import OrderedDict
+from contextlib import contextmanager
+from threading import Lock
+from typing import Dict, Hashable, Iterator, List, Tuple
+from weakref import WeakKeyDictionary
+
+from matplotlib.axes import Axes
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure, SubplotParams
+from matplotlib.transforms import Bbox
+
+from models.figure import FigureModel
+from models.layout import LayoutModel
+from utils.metrics import count
+
+
+"""
+Figure skeletons reused between the requests of a worker.
+Building a figure, its axes grid and their ticks is a fixed cost of every chart, so a
+released figure is stripped of the artists the request drew and kept as the template of its
+figure and layout settings, the next request with the same settings only adds its data.
+A figure whose axes changed beyond their data (units, legends, added axes) is cleared and
+only recycled for its canvas, like a template of other settings when none of its own is free.
+"""
+
+
+FIGURE_FIELDS = {"figsize", "dpi", "facecolor", "edgecolor", "frameon", "layout"}
+# NOTE: the template key stands for an unset layout, a figure without axes
+NO_LAYOUT = (0, 0)
+
+Limits = Tuple[Tuple[float, float], Tuple[float, float]]
+
+
+def new_figure(figureModel: FigureModel) -> Figure:
+    """Builds an Agg-backed figure outside of pyplot's global figure registry"""
+    fig = Figure(**figureModel.model_dump(include=FIGURE_FIELDS))
+    FigureCanvasAgg(fig)
+
+    return fig
+
+
+def reset_figure(fig: Figure, figureModel: FigureModel) -> Figure:
+    """Clears a recycled figure and applies the requested figure settings"""
+    fig.clear()
+    fig.subplotpars = SubplotParams()
+    fig.set_layout_engine(layout=figureModel.layout)
+    fig.set_dpi(figureModel.dpi)
+    fig.set_size_inches(figureModel.figsize, forward=False)
+    fig.set_facecolor(figureModel.facecolor)
+    fig.set_edgecolor(figureModel.edgecolor)
+    fig.set_frameon(figureModel.frameon)
+
+    return fig
+
+
+def add_grid(fig: Figure, layoutModel: LayoutModel) -> List[Axes]:
+    """Axes of the layout grid, row by row"""
+    return list(fig.subplots(layoutModel.nrows, layoutModel.ncols, squeeze=False).flat)
+
+
+def template_key(figureModel: FigureModel, layoutModel: LayoutModel = None) -> Hashable:
+    """Settings a template is built from, None when they can't be compared (a layout engine
+    instance rather than its name)"""
+    if not isinstance(figureModel.layout, (str, type(None))):
+        return None
+
+    grid = (layoutModel.nrows, layoutModel.ncols) if layoutModel is not None else NO_LAYOUT
+
+    return (
+        tuple(figureModel.figsize),
+        figureModel.dpi,
+        figureModel.facecolor,
+        figureModel.edgecolor,
+        figureModel.frameon,
+        figureModel.layout,
+        grid,
+    )
+
+
+def axes_limits(axes: List[Axes]) -> List[Limits]:
+    """View limits of each axes, (x limits, y limits)"""
+    return [(ax.get_xlim(), ax.get_ylim()) for ax in axes]
+
+
+def strip_figure(fig: Figure, axes: List[Axes], limits: List[Limits]) -> bool:
+    """Removes the data artists from the axes of a template and restores their linear scales,
+    autoscaling and the pristine view limits of the template (which an empty axes shows),
+    returns False when the figure can't be brought back to its template"""
+    if fig.axes != axes or fig.texts or fig.legends or fig.images:
+        return False
+
+    for ax in axes:
+        if ax.xaxis.converter is not None or ax.yaxis.converter is not None:
+            return False
+        if ax.get_legend() is not None or ax.child_axes:
+            return False
+
+    for ax, (xlim, ylim) in zip(axes, limits):
+        for artist in [*ax.lines, *ax.collections, *ax.images, *ax.patches, *ax.texts]:
+            artist.remove()
+        ax.set_axis_on()
+        if ax.get_xscale() != "linear":
+            ax.set_xscale("linear")
+        if ax.get_yscale() != "linear":
+            ax.set_yscale("linear")
+        ax.dataLim.set_points(Bbox.null().get_points())
+        ax.ignore_existing_data_limits = True
+        ax.set_xlim(xlim, auto=True)
+        ax.set_ylim(ylim, auto=True)
+        # NOTE: restart the color cycle, the next request's first line is blue again
+        ax.set_prop_cycle(None)
+
+    return True
+
+
+class FigurePool(object):
+    """FigurePool keeps up to size idle figures between requests of a worker, as templates
+    of their figure and layout settings (hits) or, cleared, to recycle their canvas"""
+
+    _size: int
+    _idle: "OrderedDict[Hashable, List[Figure]]"
+    _templates: "WeakKeyDictionary[Figure, Tuple[Hashable, List[Axes], List[Limits]]]"
+    _counters: Dict[str, int]
+    _lock: Lock
+
+    def __init__(self, size: int = 4) -> None:
+        self._size = size
+        self._idle = OrderedDict()
+        self._templates = WeakKeyDictionary()
+        self._counters = dict.fromkeys(("hits", "misses", "evictions", "discarded"), 0)
+        self._lock = Lock()
+
+    def acquire(self, figureModel: FigureModel, layoutModel: LayoutModel = None) -> Figure:
+        """Figure of figureModel with the axes grid of layoutModel (none when it is unset)"""
+        key = template_key(figureModel, layoutModel)
+        with self._lock:
+            fig = self._pop(key) if key is not None else None
+            hit = fig is not None
+            self._counters["hits" if hit else "misses"] += 1
+            if not hit:
+                fig = self._pop()
+
+        count("figure_template_hit" if hit else "figure_template_miss")
+        if hit:
+            return fig
+
+        if fig is None:
+            fig = new_figure(figureModel=figureModel)
+        else:
+            reset_figure(fig=fig, figureModel=figureModel)
+        axes = add_grid(fig, layoutModel) if layoutModel is not None else []
+        self._templates[fig] = (key, axes, axes_limits(axes))
+
+        return fig
+
+    def release(self, fig: Figure) -> None:
+        key, axes, limits = self._templates.get(fig, (None, [], []))
+        if key is None or not strip_figure(fig, axes, limits):
+            # NOTE: drop the artists right away so pooled figures don't pin request data
+            fig.clear()
+            self._templates[fig] = (None, [], [])
+            key = None
+            with self._lock:
+                self._counters["discarded"] += 1
+
+        with self._lock:
+            self._idle.setdefault(key, []).append(fig)
+            self._idle.move_to_end(key)
+            while sum(len(figures) for figures in self._idle.values()) > self._size:
+                oldest = next(iter(self._idle))
+                self._idle[oldest].pop(0)
+                if not self._idle[oldest]:
+                    del self._idle[oldest]
+                self._counters["evictions"] += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._counters, "idle": sum(len(figures) for figures in self._idle.values())}
+
+    def _pop(self, key: Hashable = ...) -> Figure:
+        """Takes the idle figure of key, or the least recently released one without a key"""
+        if key is ...:
+            key = next(iter(self._idle), None)
+        figures = self._idle.get(key)
+        if not figures:
+            return None
+
+        fig = figures.pop()
+        if not figures:
+            del self._idle[key]
+
+        return fig
+
+    @contextmanager
+    def figure(self, figureModel: FigureModel, layoutModel: LayoutModel = None) -> Iterator[Figure]:
+        fig = self.acquire(figureModel=figureModel, layoutModel=layoutModel)
+        try:
+            yield fig
+        finally:
+            self.release(fig=fig)
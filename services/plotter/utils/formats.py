@@ -0,0 +1,152 @@
+import struct
+import zipfile
+from io import BytesIO
+from typing import Callable, Dict, List
+
+import numpy as np
+from pandas import DataFrame, Index, RangeIndex
+
+from utils.exceptions import InvalidRequestError
+from utils.stream import open_buffer
+
+
+"""
+Readers for the binary data formats, they wrap the received buffer without copying
+whenever its layout allows it (numeric columns without nulls, uncompressed arrays).
+
+References:
+Arrow IPC   https://arrow.apache.org/docs/format/Columnar.html#serialization-and-interprocess-communication-ipc
+NPY         https://numpy.org/doc/stable/reference/generated/numpy.lib.format.html
+"""
+
+
+INDEX_NAMES = ("x", "index")
+
+
+def read_binary(rawData: bytes | memoryview, format: str) -> DataFrame:
+    reader = READERS.get(format)
+    if reader is None:
+        raise InvalidRequestError(f"Unsupported data format {format}")
+
+    try:
+        return reader(rawData)
+    except InvalidRequestError:
+        raise
+    except Exception as e:
+        raise InvalidRequestError(f"Could not read {format} data: {e}")
+
+
+def read_arrow(rawData: bytes) -> DataFrame:
+    """Reads an Arrow IPC stream (or file), the columns are views into rawData"""
+    import pyarrow as pa
+
+    buffer = pa.py_buffer(rawData)
+    if rawData[:6] == b"ARROW1":
+        table = pa.ipc.open_file(buffer).read_all()
+    else:
+        table = pa.ipc.open_stream(buffer).read_all()
+
+    return frame_from_table(table)
+
+
+def read_parquet(rawData: bytes) -> DataFrame:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    return frame_from_table(pq.read_table(pa.BufferReader(rawData)))
+
+
+def frame_from_table(table) -> DataFrame:
+    """Builds a frame on top of the table buffers, the first column being the index"""
+    names: List[str] = table.column_names
+    if not names:
+        raise InvalidRequestError("Found no column in provided data")
+
+    arrays = {name: table.column(name).to_numpy() for name in names}
+
+    return frame_from_arrays(arrays, index_name=names[0] if len(names) > 1 else None)
+
+
+def read_npy(rawData: bytes) -> DataFrame:
+    """Reads a .npy array, column 0 of a 2D array is the index and
+    the value columns are named y (or y1, y2, ... when there are several)"""
+    array = array_from_buffer(rawData)
+
+    if array.ndim == 1:
+        return frame_from_arrays({"y": array}, index_name=None)
+    if array.ndim != 2:
+        raise InvalidRequestError("Expected a 1D or 2D array")
+    if array.shape[1] == 1:
+        return frame_from_arrays({"y": array[:, 0]}, index_name=None)
+
+    names = ["y"] if array.shape[1] == 2 else [f"y{i}" for i in range(1, array.shape[1])]
+    arrays = {"x": array[:, 0], **{name: array[:, i + 1] for i, name in enumerate(names)}}
+
+    return frame_from_arrays(arrays, index_name="x")
+
+
+def read_npz(rawData: bytes) -> DataFrame:
+    """Reads a .npz archive of 1D arrays, one column per array and x (or index) as the index,
+    stored (uncompressed) members are viewed in place"""
+    arrays: Dict[str, np.ndarray] = {}
+    source = BytesIO(rawData) if isinstance(rawData, bytes) else open_buffer(rawData)
+    with zipfile.ZipFile(source) as archive:
+        for info in archive.infolist():
+            name = info.filename.removesuffix(".npy")
+            if info.compress_type == zipfile.ZIP_STORED:
+                arrays[name] = array_from_buffer(rawData, offset=member_offset(rawData, info))
+            else:
+                arrays[name] = array_from_buffer(archive.read(info))
+
+    index_name = next((name for name in INDEX_NAMES if name in arrays), None)
+    if index_name is not None:
+        arrays = {index_name: arrays.pop(index_name), **arrays}
+
+    return frame_from_arrays(arrays, index_name=index_name)
+
+
+def member_offset(rawData: bytes, info: zipfile.ZipInfo) -> int:
+    """Offset of a zip member's data, right after its local file header"""
+    name_length, extra_length = struct.unpack_from("<HH", rawData, info.header_offset + 26)
+
+    return info.header_offset + 30 + name_length + extra_length
+
+
+def array_from_buffer(rawData: bytes, offset: int = 0) -> np.ndarray:
+    """Views the array of a .npy buffer without copying it"""
+    header = BytesIO(memoryview(rawData)[offset : offset + 64 * 1024])
+    version = np.lib.format.read_magic(header)
+    if version == (1, 0):
+        shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(header)
+    else:
+        shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(header)
+
+    if dtype.hasobject:
+        raise InvalidRequestError("Object arrays are not supported")
+
+    count = int(np.prod(shape))
+    array = np.frombuffer(rawData, dtype=dtype, count=count, offset=offset + header.tell())
+
+    return array.reshape(shape, order="F" if fortran_order else "C")
+
+
+def frame_from_arrays(arrays: Dict[str, np.ndarray], index_name: str = None) -> DataFrame:
+    arrays = dict(arrays)
+    if index_name is not None:
+        index = Index(arrays.pop(index_name), name=index_name, copy=False)
+    else:
+        index = RangeIndex(len(next(iter(arrays.values()))) if arrays else 0)
+
+    for name, array in arrays.items():
+        if array.ndim != 1 or len(array) != len(index):
+            raise InvalidRequestError(f"Column {name} does not match the index length")
+
+    return DataFrame(arrays, index=index, copy=False)
+
+
+READERS: Dict[str, Callable[[bytes], DataFrame]] = {
+    "arrow": read_arrow,
+    "parquet": read_parquet,
+    "npy": read_npy,
+    "npz": read_npz,
+}
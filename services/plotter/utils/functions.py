@@ -0,0 +1,290 @@
+import ast
+import re
+from functools import lru_cache
+from typing import List, Tuple
+
+import numpy as np
+from decouple import config
+from pandas import DataFrame, Index
+
+from utils.exceptions import InvalidRequestError
+
+
+"""
+Compiles LaTeX or plain math expressions of x into vectorized NumPy callables.
+Expressions are translated to Python, checked against a whitelist of AST nodes and names,
+then compiled once and cached by their text.
+"""
+
+
+FUNCTIONS = {
+    "sin": np.sin,
+    "cos": np.cos,
+    "tan": np.tan,
+    "arcsin": np.arcsin,
+    "arccos": np.arccos,
+    "arctan": np.arctan,
+    "sinh": np.sinh,
+    "cosh": np.cosh,
+    "tanh": np.tanh,
+    "exp": np.exp,
+    "log": np.log,
+    "ln": np.log,
+    "log10": np.log10,
+    "log2": np.log2,
+    "sqrt": np.sqrt,
+    "abs": np.abs,
+    "floor": np.floor,
+    "ceil": np.ceil,
+    "sign": np.sign,
+}
+CONSTANTS = {"pi": np.pi, "e": np.e}
+VARIABLE = "x"
+
+OPERATORS = (
+    ast.Expression,
+    ast.BinOp,
+    ast.UnaryOp,
+    ast.Call,
+    ast.Name,
+    ast.Load,
+    ast.Constant,
+    ast.Add,
+    ast.Sub,
+    ast.Mult,
+    ast.Div,
+    ast.Pow,
+    ast.Mod,
+    ast.USub,
+    ast.UAdd,
+)
+
+LATEX_REPLACEMENTS = (
+    (r"\\left|\\right|\\,|\\;|\\!|\\ ", ""),
+    (r"\\cdot|\\times", "*"),
+    (r"\\div", "/"),
+    (r"\\operatorname\{(\w+)\}", r"\1"),
+    (r"\\(\w+)", r"\1"),
+)
+TOKENS = re.compile(r"\s*(?:(\d+\.?\d*(?:[eE][-+]?\d+)?|\.\d+)|([A-Za-z_]\w*)|(\*\*|[-+*/%^()]))")
+
+FUNCTION_CACHE_SIZE = config("FUNCTION_CACHE_SIZE", default=256, cast=int)
+# NOTE: any larger power of a literal overflows (or underflows) float64 anyway
+MAX_EXPONENT = 1100
+
+
+class CompiledFunction(object):
+    """CompiledFunction evaluates a compiled expression over an array of x values"""
+
+    def __init__(self, expression: str, code) -> None:
+        self.expression = expression
+        self._code = code
+
+    def __call__(self, x: np.ndarray) -> np.ndarray:
+        try:
+            with np.errstate(all="ignore"):
+                y = eval(self._code, {"__builtins__": {}}, {**FUNCTIONS, **CONSTANTS, VARIABLE: x})
+        except (OverflowError, ZeroDivisionError) as e:
+            # NOTE: raised by the constant parts, which are Python floats rather than arrays
+            raise InvalidRequestError(f"Could not evaluate function {self.expression}: {e}")
+
+        return np.broadcast_to(np.asarray(y, dtype="float64"), np.shape(x))
+
+    def __reduce__(self):
+        # NOTE: code objects don't pickle, render processes compile from the text
+        return (compile_function, (self.expression,))
+
+
+@lru_cache(maxsize=FUNCTION_CACHE_SIZE)
+def compile_function(expression: str) -> CompiledFunction:
+    """Compiles an expression of x once, later calls with the same text hit the cache"""
+    source = to_python(expression)
+    try:
+        tree = ast.parse(source, mode="eval")
+    except SyntaxError:
+        raise InvalidRequestError(f"Invalid function {expression}")
+
+    for node in ast.walk(tree):
+        if not isinstance(node, OPERATORS):
+            raise InvalidRequestError(f"Unsupported operation in function {expression}")
+        if isinstance(node, ast.Call) and not (
+            isinstance(node.func, ast.Name) and node.func.id in FUNCTIONS and len(node.args) == 1
+        ):
+            raise InvalidRequestError(f"Unsupported call in function {expression}")
+        if isinstance(node, ast.Name) and node.id not in {**FUNCTIONS, **CONSTANTS, VARIABLE: None}:
+            raise InvalidRequestError(f"Unknown name {node.id} in function {expression}")
+        if isinstance(node, ast.Constant) and (
+            isinstance(node.value, bool) or not isinstance(node.value, (int, float))
+        ):
+            raise InvalidRequestError(f"Invalid constant in function {expression}")
+        if (
+            isinstance(node, ast.BinOp)
+            and isinstance(node.op, ast.Pow)
+            and isinstance(node.right, ast.Constant)
+            and abs(node.right.value) > MAX_EXPONENT
+        ):
+            raise InvalidRequestError(f"Exponent too large in function {expression}")
+
+    tree = ast.fix_missing_locations(FloatConstants().visit(tree))
+
+    return CompiledFunction(expression, compile(tree, "<function>", "eval"))
+
+
+class FloatConstants(ast.NodeTransformer):
+    """Makes every literal a float, integer arithmetic is exact and a power such as 9**9**9
+    would grow without bound instead of overflowing"""
+
+    def visit_Constant(self, node: ast.Constant) -> ast.Constant:
+        return ast.copy_location(ast.Constant(float(node.value)), node)
+
+
+def to_python(expression: str) -> str:
+    """Translates a LaTeX or plain math expression into a Python expression"""
+    expression = expression.strip().strip("$")
+    expression = re.sub(r"^\s*(?:y|f\s*\(\s*x\s*\))\s*=", "", expression)
+    expression = replace_commands(expression)
+    for pattern, replacement in LATEX_REPLACEMENTS:
+        expression = re.sub(pattern, replacement, expression)
+    expression = expression.replace("{", "(").replace("}", ")").replace("[", "(").replace("]", ")")
+
+    return " ".join(implicit_products(tokenize(expression)))
+
+
+def replace_commands(expression: str) -> str:
+    """Rewrites the LaTeX commands taking braced arguments, \\frac and \\sqrt"""
+    while True:
+        match = re.search(r"\\(d?frac|sqrt)\s*(\[)?", expression)
+        if match is None:
+            return expression
+
+        position = match.end()
+        root = None
+        if match.group(2):
+            root, position = read_group(expression, position - 1, "[", "]")
+        first, position = read_group(expression, position, "{", "}")
+
+        if match.group(1) == "sqrt":
+            replacement = f"(({first})**(1/({root})))" if root else f"sqrt({first})"
+        else:
+            second, position = read_group(expression, position, "{", "}")
+            replacement = f"(({first})/({second}))"
+
+        expression = expression[: match.start()] + replacement + expression[position:]
+
+
+def read_group(expression: str, position: int, opening: str, closing: str) -> Tuple[str, int]:
+    """Reads a bracketed group (or a single character) starting at position"""
+    while position < len(expression) and expression[position].isspace():
+        position += 1
+    if position >= len(expression):
+        raise InvalidRequestError("Missing argument in function")
+    if expression[position] != opening:
+        return expression[position], position + 1
+
+    depth = 0
+    for end in range(position, len(expression)):
+        depth += {opening: 1, closing: -1}.get(expression[end], 0)
+        if depth == 0:
+            return expression[position + 1 : end], end + 1
+
+    raise InvalidRequestError("Unbalanced brackets in function")
+
+
+def tokenize(expression: str) -> List[str]:
+    tokens, position = [], 0
+    expression = expression.rstrip()
+    while position < len(expression):
+        match = TOKENS.match(expression, position)
+        if match is None:
+            raise InvalidRequestError(f"Invalid character in function {expression[position:]}")
+        tokens.append(match.group(match.lastindex))
+        position = match.end()
+
+    return ["**" if token == "^" else token for token in wrap_arguments(split_names(tokens))]
+
+
+def split_names(tokens: List[str]) -> List[str]:
+    """Splits juxtaposed names such as xe or pix into known names"""
+    names = {**FUNCTIONS, **CONSTANTS, VARIABLE: None}
+    result = []
+    for token in tokens:
+        if not (token[0].isalpha() or token[0] == "_") or token in names:
+            result.append(token)
+            continue
+        parts = re.findall("|".join(sorted(map(re.escape, names), key=len, reverse=True)) + "|.", token)
+        result.extend(parts)
+
+    return result
+
+
+def wrap_arguments(tokens: List[str]) -> List[str]:
+    """Adds the parentheses of functions applied to a bare operand, such as sin x"""
+    result = []
+    pending = 0
+    for position, token in enumerate(tokens):
+        result.append(token)
+        following = tokens[position + 1] if position + 1 < len(tokens) else "("
+        if token in FUNCTIONS and following != "(":
+            result.append("(")
+            pending += 1
+        elif pending and token not in FUNCTIONS:
+            result.extend(")" * pending)
+            pending = 0
+
+    return result
+
+
+def implicit_products(tokens: List[str]) -> List[str]:
+    """Inserts the multiplications implied by juxtaposition, such as 2x or x sin(x)"""
+    result = []
+    for token in tokens:
+        if result:
+            previous = result[-1]
+            ends_operand = previous == ")" or (previous not in FUNCTIONS and previous[0].isalnum())
+            starts_operand = token == "(" or token[0].isalnum() or token[0] == "."
+            if ends_operand and starts_operand:
+                result.append("*")
+        result.append(token)
+
+    return result
+
+
+def sample_function(
+    function: CompiledFunction,
+    limits: tuple,
+    resolution: int = 100,
+    tolerance: float = 1e-3,
+    max_points: int = 10_000,
+    max_depth: int = 12,
+) -> DataFrame:
+    """Samples function over limits, starting from resolution uniform points and bisecting
+    the intervals whose midpoint deviates from the chord by more than tolerance times the
+    y range, so that curved regions get dense samples and straight ones stay sparse"""
+    x = np.linspace(float(limits[0]), float(limits[1]), max(resolution, 2))
+    y = function(x)
+
+    for _ in range(max_depth):
+        midpoints = (x[:-1] + x[1:]) / 2
+        values = function(midpoints)
+        finite = np.isfinite(y)
+        scale = np.ptp(y[finite]) if finite.any() else 0.0
+        with np.errstate(invalid="ignore"):
+            error = np.abs(values - (y[:-1] + y[1:]) / 2)
+        # NOTE: intervals at the edge of the domain are refined too, to locate the break
+        boundary = finite[:-1] != finite[1:]
+        error[boundary] = np.inf
+        refine = (error > tolerance * (scale or 1.0)) & ~np.isnan(error)
+
+        budget = max_points - len(x)
+        if budget <= 0 or not refine.any():
+            break
+        if refine.sum() > budget:
+            worst = np.argsort(np.where(refine, error, -1.0))[-budget:]
+            refine = np.zeros_like(refine)
+            refine[worst] = True
+
+        positions = np.flatnonzero(refine) + 1
+        x = np.insert(x, positions, midpoints[refine])
+        y = np.insert(y, positions, values[refine])
+
+    return DataFrame({"y": y}, index=Index(x, name=VARIABLE), copy=False)
@@ -0,0 +1,370 @@
+import bisect
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import grpc
+
+"""
+Request and stage metrics of the plotter, exposed in the Prometheus text format.
+Stages are timed with perf_counter in whichever process renders, into the timings of the
+current request held by a context variable, render workers send theirs back with the image
+(see timed) and the server records them, so the histograms only live in the server process.
+
+References:
+Exposition format   https://prometheus.io/docs/instrumenting/exposition_formats/
+Server-Timing       https://www.w3.org/TR/server-timing/
+"""
+
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+# NOTE: 1 KiB to 1 GiB by factors of 4
+SIZE_BUCKETS = tuple(1024 * 4**i for i in range(11))
+
+Labels = Tuple[str, ...]
+# NOTE: the asyncio server reports status codes as their integer values
+STATUS_NAMES = {code.value[0]: code.name for code in grpc.StatusCode}
+# NOTE: events counted into the timings of a request (see count) are kept apart by this prefix
+COUNT_PREFIX = "count:"
+
+_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar("timings", default=None)
+# NOTE: the status a handler aborted the current request with (see abort)
+_aborted: ContextVar[Optional[str]] = ContextVar("aborted", default=None)
+
+
+class Metric(object):
+    """Metric is a named family of samples keyed by their label values"""
+
+    kind: str = "untyped"
+    name: str
+    help: str
+    labelnames: Labels
+    _lock: Lock
+
+    def __init__(self, name: str, help: str, labelnames: Labels = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._lock = Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Labels:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: Labels, **extra: str) -> str:
+        pairs = [*zip(self.labelnames, key), *extra.items()]
+        if not pairs:
+            return ""
+        escaped = (
+            (name, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+            for name, value in pairs
+        )
+
+        return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def expose(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+        return "\n".join(lines + self.samples())
+
+
+class Counter(Metric):
+    kind = "counter"
+    _values: Dict[Labels, float]
+
+    def __init__(self, name: str, help: str, labelnames: Labels = ()) -> None:
+        super().__init__(name, help, labelnames)
+        self._values = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = dict(self._values)
+
+        return [f"{self.name}{self._labels(key)} {value}" for key, value in values.items()]
+
+
+class Gauge(Metric):
+    """Gauge is set directly, or read from function when it is exposed"""
+
+    kind = "gauge"
+    _values: Dict[Labels, float]
+    _function: Callable[[], float]
+
+    def __init__(
+        self, name: str, help: str, labelnames: Labels = (), function: Callable[[], float] = None
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self._values = {}
+        self._function = function
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def samples(self) -> List[str]:
+        if self._function is not None:
+            return [f"{self.name} {self._function()}"]
+
+        with self._lock:
+            values = dict(self._values)
+
+        return [f"{self.name}{self._labels(key)} {value}" for key, value in values.items()]
+
+
+class Histogram(Metric):
+    kind = "histogram"
+    buckets: Tuple[float, ...]
+    _values: Dict[Labels, List]
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Labels = (),
+        buckets: Tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(buckets)
+        self._values = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        position = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._values.get(key)
+            if counts is None:
+                # NOTE: per bucket counts, then the +Inf bucket and the sum
+                counts = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            counts[position] += 1
+            counts[-1] += value
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = {key: list(counts) for key, counts in self._values.items()}
+
+        lines = []
+        for key, counts in values.items():
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{self._labels(key, le=str(bound))} {cumulative}")
+            lines.append(f"{self.name}_sum{self._labels(key)} {counts[-1]}")
+            lines.append(f"{self.name}_count{self._labels(key)} {cumulative}")
+
+        return lines
+
+
+class Registry(object):
+    """Registry collects the metrics exposed by the endpoint"""
+
+    _metrics: Dict[str, Metric]
+    _lock: Lock
+
+    def __init__(self) -> None:
+        self._metrics = {}
+        self._lock = Lock()
+
+    def register(self, metric: Metric) -> Metric:
+        """Adds metric, replacing a metric of the same name (such as a callback gauge
+        of a restarted pool)"""
+        with self._lock:
+            self._metrics[metric.name] = metric
+
+        return metric
+
+    def expose(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+
+        return "\n".join(metric.expose() for metric in metrics) + "\n"
+
+
+REGISTRY = Registry()
+
+REQUESTS = REGISTRY.register(
+    Counter("plotter_requests_total", "Requests handled by method and status", ("method", "status"))
+)
+IN_FLIGHT = REGISTRY.register(
+    Gauge("plotter_requests_in_flight", "Requests being handled by method", ("method",))
+)
+LATENCY = REGISTRY.register(
+    Histogram("plotter_request_seconds", "Request latency by method", ("method",))
+)
+STAGES = REGISTRY.register(
+    Histogram("plotter_stage_seconds", "Time spent per pipeline stage", ("stage",))
+)
+PAYLOAD_BYTES = REGISTRY.register(
+    Histogram(
+        "plotter_payload_bytes", "Payload and data size of requests", ("method",), SIZE_BUCKETS
+    )
+)
+IMAGE_BYTES = REGISTRY.register(
+    Histogram("plotter_image_bytes", "Size of the returned images", ("method",), SIZE_BUCKETS)
+)
+EVENTS = REGISTRY.register(
+    Counter("plotter_render_events_total", "Events of the render pipeline", ("event",))
+)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Times a stage of the current request, a no-op outside of a timed request"""
+    timings = _timings.get()
+    if timings is None:
+        yield
+        return
+
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = timings.get(name, 0.0) + time.perf_counter() - started
+
+
+def count(event: str, amount: int = 1) -> None:
+    """Counts an event of the current request (such as a figure template hit), it travels
+    with the stage timings from the render workers, a no-op outside of a timed request"""
+    timings = _timings.get()
+    if timings is None:
+        return
+
+    name = COUNT_PREFIX + event
+    timings[name] = timings.get(name, 0) + amount
+
+
+def stage_timings(timings: Dict[str, float]) -> Dict[str, float]:
+    """The stage timings of timings, without the counted events"""
+    return {name: value for name, value in timings.items() if not name.startswith(COUNT_PREFIX)}
+
+
+def merge(stages: Dict[str, float]) -> None:
+    """Adds stage timings measured elsewhere (a render worker) to the current request"""
+    timings = _timings.get()
+    if timings is None:
+        return
+
+    for name, seconds in stages.items():
+        timings[name] = timings.get(name, 0.0) + seconds
+
+
+def timed(submitted: Optional[float], fn: Callable, *args: Any) -> Tuple[Any, Dict[str, float]]:
+    """Calls fn(*args) with its stages timed, returns its result and the stage timings.
+    Meant to be submitted to the render pool, submitted is the perf_counter() of the
+    submission and the time until a worker picked the call up is the queue stage"""
+    timings: Dict[str, float] = {}
+    if submitted is not None:
+        # NOTE: perf_counter is a system-wide monotonic clock, comparable across processes
+        timings["queue"] = max(time.perf_counter() - submitted, 0.0)
+
+    token = _timings.set(timings)
+    try:
+        return fn(*args), timings
+    finally:
+        _timings.reset(token)
+
+
+@contextmanager
+def request(method: str, context=None, payload_bytes: int = None) -> Iterator[Dict[str, float]]:
+    """Times a request and records its metrics, the stages of the request are returned
+    to the client in the server-timing trailing metadata"""
+    timings: Dict[str, float] = {}
+    token = _timings.set(timings)
+    aborted = _aborted.set(None)
+    IN_FLIGHT.inc(method=method)
+    if payload_bytes is not None:
+        PAYLOAD_BYTES.observe(payload_bytes, method=method)
+
+    started = time.perf_counter()
+    status = "OK"
+    try:
+        yield timings
+    except BaseException:
+        status = _aborted.get() or status_name(context)
+        raise
+    finally:
+        total = time.perf_counter() - started
+        try:
+            _timings.reset(token)
+            _aborted.reset(aborted)
+        except ValueError:
+            # NOTE: an abandoned streaming handler can be closed from another thread
+            pass
+        IN_FLIGHT.dec(method=method)
+        REQUESTS.inc(method=method, status=status)
+        LATENCY.observe(total, method=method)
+        for name, value in timings.items():
+            if name.startswith(COUNT_PREFIX):
+                EVENTS.inc(value, event=name[len(COUNT_PREFIX) :])
+            else:
+                STAGES.observe(value, stage=name)
+        if context is not None:
+            context.set_trailing_metadata((("server-timing", server_timing(timings, total)),))
+
+
+def abort(context, code: grpc.StatusCode, details: str) -> None:
+    """Ends the current request with code and details, recorded as its status.
+    The asyncio server gives synchronous handlers a context whose abort returns rather than
+    raises and which has no code(), the handler is stopped here all the same"""
+    _aborted.set(code.name)
+    context.abort(code, details)
+    raise grpc.aio.AbortError(details)
+
+
+def status_name(context) -> str:
+    """Status a failed request was given, UNKNOWN when its context doesn't tell"""
+    code = getattr(context, "code", None)
+    code = code() if code is not None else None
+
+    return getattr(code, "name", None) or STATUS_NAMES.get(code, "UNKNOWN")
+
+
+def server_timing(timings: Dict[str, float], total: float) -> str:
+    """Formats stage timings as a Server-Timing header value, durations in milliseconds"""
+    entries = [*stage_timings(timings).items(), ("total", total)]
+
+    return ", ".join(f"{name};dur={seconds * 1000:.3f}" for name, seconds in entries)
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        if self.path.partition("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+
+        body = REGISTRY.expose().encode("utf8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        # NOTE: scrapes would flood the server log
+        pass
+
+
+def start_metrics_server(address: str) -> ThreadingHTTPServer:
+    """Serves /metrics on host:port from a daemon thread"""
+    host, _, port = address.rpartition(":")
+    server = ThreadingHTTPServer((host.strip("[]") or "0.0.0.0", int(port)), MetricsHandler)
+    Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+
+    return server
@@ -0,0 +1,131 @@
+import os
+import multiprocessing
+from concurrent import futures
+from concurrent.futures.process import BrokenProcessPool
+from threading import Lock
+from typing import Any, Callable, Literal
+
+try:
+    import resource
+except ImportError:
+    # NOTE: resource limits are POSIX only, the memory ceiling is a no-op elsewhere
+    resource = None
+
+
+def _init_worker(memory_limit_mb: int, warm_up: bool) -> None:
+    """Applies the memory ceiling and pays the heavy imports (and the warm-up render)
+    once per worker, recycled workers included"""
+    if memory_limit_mb and resource is not None:
+        limit = memory_limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+    import service
+
+    if warm_up:
+        service.warm_up()
+
+
+class RenderPool(object):
+    """RenderPool dispatches render jobs to a pool of threads or warm worker processes"""
+
+    _mode: Literal["thread", "process"]
+    _workers: int
+    _max_tasks_per_worker: int
+    _memory_limit_mb: int
+    _warm_up: bool
+    _executor: futures.Executor
+    _pending: int
+    _lock: Lock
+
+    def __init__(
+        self,
+        mode: Literal["thread", "process"] = "thread",
+        workers: int = None,
+        max_tasks_per_worker: int = 0,
+        memory_limit_mb: int = 0,
+        warm_up: bool = False,
+    ) -> None:
+        if mode not in ("thread", "process"):
+            raise ValueError(f"Invalid render mode {mode}")
+
+        self._mode = mode
+        self._workers = workers or os.cpu_count() or 1
+        self._max_tasks_per_worker = max_tasks_per_worker
+        self._memory_limit_mb = memory_limit_mb
+        self._warm_up = warm_up
+        self._pending = 0
+        self._lock = Lock()
+        self._executor = self._create_executor()
+
+    @property
+    def mode(self) -> str:
+        return self._mode
+
+    @property
+    def workers(self) -> int:
+        return self._workers
+
+    @property
+    def pending(self) -> int:
+        """Jobs submitted and not finished yet, running ones included"""
+        return self._pending
+
+    @property
+    def queued(self) -> int:
+        """Jobs waiting for a free worker"""
+        return max(self._pending - self._workers, 0)
+
+    def _create_executor(self) -> futures.Executor:
+        if self._mode == "thread":
+            return futures.ThreadPoolExecutor(
+                max_workers=self._workers, thread_name_prefix="render"
+            )
+
+        # NOTE: never fork, the gRPC runtime threads do not survive it
+        return futures.ProcessPoolExecutor(
+            max_workers=self._workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self._memory_limit_mb, self._warm_up),
+            max_tasks_per_child=self._max_tasks_per_worker or None,
+        )
+
+    def submit(self, fn: Callable, *args: Any) -> futures.Future:
+        """Schedules fn(*args) on the pool, replacing it if a worker died"""
+        with self._lock:
+            try:
+                future = self._executor.submit(fn, *args)
+            except BrokenProcessPool:
+                # NOTE: a worker was killed (e.g. above its memory ceiling),
+                # start a fresh pool rather than failing every later request
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = self._create_executor()
+                future = self._executor.submit(fn, *args)
+            self._pending += 1
+
+        future.add_done_callback(self._done)
+
+        return future
+
+    def _done(self, future: futures.Future) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    def run(self, fn: Callable, *args: Any) -> Any:
+        """Runs fn(*args) on the pool and waits for its result"""
+        return self.submit(fn, *args).result()
+
+    def warm_up(self) -> None:
+        """Starts every worker process ahead of the first request,
+        with warm_up they render a synthetic chart first"""
+        if self._mode == "process":
+            for future in [self.submit(os.getpid) for _ in range(self._workers)]:
+                future.result()
+        elif self._warm_up:
+            # NOTE: render threads share the process, one warm-up render covers them all
+            from service import warm_up
+
+            self.run(warm_up)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=True)
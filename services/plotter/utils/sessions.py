@@ -0,0 +1,361 @@
+import time
+import uuid
+from collections import OrderedDict
+from threading import Event, Lock, Thread
+from typing import Dict, List, Tuple
+
+import numpy as np
+from matplotlib.axes import Axes
+from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
+from pandas import DataFrame, Index
+
+from models.data import DataModel
+from models.payload import PayloadModel
+from models.plot import PlotModel
+from utils.decimate import decimate
+from utils.encoder import encode
+from utils.exceptions import InvalidRequestError, SessionLimitError, SessionNotFoundError
+from utils.figures import new_figure
+from utils.metrics import stage
+from utils.validator import validate_data
+from utils.wrapper import build_graphs, build_layout, build_plots, index_values
+
+
+"""
+Live figure sessions.
+A session keeps its figure and lines alive between requests, appended rows are parsed on
+their own and copied at the end of the line buffers, the axes limits grow from the new
+points only, so an update costs the size of the appended rows rather than of the history.
+Decimated lines keep only their drawn points, which stay bounded by the axes width.
+"""
+
+
+class LiveLine(object):
+    """LiveLine is a drawn line whose points grow in place, in buffers doubled as needed"""
+
+    line: Line2D
+    _x: np.ndarray
+    _y: np.ndarray
+    _size: int
+    _decimation: str
+    _n_out: int
+
+    def __init__(self, axes: Axes, plotModel: PlotModel, x: np.ndarray, y: np.ndarray) -> None:
+        self._decimation = plotModel.decimation
+        self._n_out = int(axes.get_window_extent().width * plotModel.points_per_pixel)
+        self._x = np.empty(0, dtype=x.dtype)
+        self._y = np.empty(0, dtype="float64")
+        self._size = 0
+        self._extend(x, y)
+        # NOTE: drawn from actual values so that matplotlib picks the x units (dates)
+        self.line = axes.plot(self._x[: self._size], self._y[: self._size])[0]
+
+    @property
+    def nbytes(self) -> int:
+        return self._x.nbytes + self._y.nbytes
+
+    def append(self, x: np.ndarray, y: np.ndarray) -> None:
+        self._extend(x, y)
+        self.line.set_data(self._x[: self._size], self._y[: self._size])
+
+    def _extend(self, x: np.ndarray, y: np.ndarray) -> None:
+        if self._decimation is not None:
+            if self._size and len(x) and x[0] <= self._x[self._size - 1]:
+                raise InvalidRequestError("Appended rows of a decimated line must follow its last x")
+            x, y = self._decimate(x, y)
+
+        self._reserve(self._size + len(x))
+        self._x[self._size : self._size + len(x)] = x
+        self._y[self._size : self._size + len(y)] = y
+        self._size += len(x)
+
+        # NOTE: re-decimating the drawn points keeps them bounded as the x range grows
+        if self._decimation is not None and self._size > 2 * self._n_out:
+            x, y = self._decimate(self._x[: self._size], self._y[: self._size])
+            self._x[: len(x)], self._y[: len(y)] = x, y
+            self._size = len(x)
+
+    def _decimate(self, x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        if len(x) <= self._n_out:
+            return x, y
+
+        positions = decimate(index_values(Index(x, copy=False)), y, self._decimation, self._n_out)
+
+        return x[positions], y[positions]
+
+    def _reserve(self, size: int) -> None:
+        if size <= len(self._x):
+            return
+
+        capacity = max(size, 2 * len(self._x), 1024)
+        for name in ("_x", "_y"):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[: self._size] = old[: self._size]
+            setattr(self, name, new)
+
+
+class Session(object):
+    """Session is an open figure whose file data lines accept appended rows,
+    the other plots are drawn once when the session opens"""
+
+    payload: PayloadModel
+    image: bytes
+    last_used: float
+    lock: Lock
+    closed: bool
+    _fig: Figure
+    _lines: Dict[int, Tuple[Axes, Dict[str, LiveLine]]]
+
+    def __init__(self, payload: PayloadModel) -> None:
+        self.payload = payload
+        self.image = b""
+        self.last_used = time.monotonic()
+        self.lock = Lock()
+        self.closed = False
+        self._lines = {}
+        self._fig = new_figure(figureModel=payload.image.figure)
+        try:
+            self._build()
+        except BaseException:
+            self.close()
+            raise
+
+    def _build(self) -> None:
+        payload = self.payload
+        axes = build_layout(layoutModel=payload.image.layout, fig=self._fig)
+        for graph_id, ax in axes.items():
+            graphModel = payload.image.graphs.get(graph_id)
+            if graphModel is None:
+                ax.set_axis_off()
+                continue
+            build_graphs(ax, graphModel)
+            for position, data in enumerate(payload.data or []):
+                if data.plotID in graphModel.plot_id_list and data.dataframe is not None:
+                    self._draw(position, ax, data)
+
+        # NOTE: the lines copied their data and the other plots are drawn, drop the frames
+        # so that the session only holds what nbytes counts
+        for data in payload.data or []:
+            data.dataframe = None
+
+        self.image = self.encode()
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.image) + sum(
+            line.nbytes for _, lines in self._lines.values() for line in lines.values()
+        )
+
+    def append(self, rawData: bytes = None, blobs: Dict[str, bytes] = None) -> bytes:
+        """Appends the rows of every file data whose blob is given and re-encodes the figure,
+        the rows of a line opened from an uploaded dataset come in rawData"""
+        appended = [
+            (position, data.model_copy(update={"dataset_id": None}))
+            for position, data in enumerate(self.payload.data or [])
+            if position in self._lines and ((blobs and data.filename in blobs) or rawData)
+        ]
+        with stage("validate"):
+            validate_data(
+                dataList=[data for _, data in appended],
+                rawData=rawData,
+                blobs=blobs,
+                plots=self.payload.image.plots,
+            )
+
+        with stage("plots"):
+            for position, data in appended:
+                ax, lines = self._lines[position]
+                frame: DataFrame = data.dataframe
+                missing = set(lines) - set(frame.columns)
+                if missing:
+                    raise InvalidRequestError(f"Appended data misses the columns {sorted(missing)}")
+                for col, line in lines.items():
+                    line.append(frame.index.to_numpy(), frame[col].to_numpy(dtype="float64"))
+                grow_limits(ax, frame)
+
+        self.image = self.encode()
+
+        return self.image
+
+    def encode(self) -> bytes:
+        if not self.payload.image.save:
+            return b""
+
+        with stage("encode"):
+            image = self.payload.image
+            return encode(self._fig, format=image.format, profile=image.profile)
+
+    def close(self) -> None:
+        """Clears the figure once no update is drawing into it"""
+        with self.lock:
+            self.closed = True
+            # NOTE: drop the artists right away so a closed session doesn't pin its data
+            self._fig.clear()
+
+    def _draw(self, position: int, ax: Axes, data: DataModel) -> None:
+        plotModel = self.payload.image.plots.get(data.plotID)
+        if data.datatype != "file" or plotModel.plotType != "LinePlotModel":
+            build_plots(ax, plotModel, data.dataframe)
+            return
+
+        frame = data.dataframe
+        x = frame.index.to_numpy()
+        lines = {
+            col: LiveLine(ax, plotModel, x, frame[col].to_numpy(dtype="float64"))
+            for col in frame.columns
+        }
+        self._lines[position] = (ax, lines)
+        grow_limits(ax, frame)
+
+
+def grow_limits(ax: Axes, frame: DataFrame) -> None:
+    """Extends the axes data limits by the finite points of frame and autoscales"""
+    if not len(frame):
+        return
+
+    x = np.asarray(ax.convert_xunits(frame.index.to_numpy()), dtype="float64")
+    points: List[np.ndarray] = [
+        np.column_stack((x, frame[col].to_numpy(dtype="float64"))) for col in frame.columns
+    ]
+    ax.dataLim.update_from_data_xy(np.concatenate(points), ignore=False)
+    ax.autoscale_view()
+
+
+class SessionStore(object):
+    """SessionStore holds the open sessions, closing the ones idle for longer than
+    idle_timeout seconds and the least recently used ones beyond max_bytes.
+    Idle sessions are swept by every call, and every sweep_interval seconds when it is set
+    so that abandoned sessions free their data without further traffic"""
+
+    _idle_timeout: float
+    _max_bytes: int
+    _sessions: "OrderedDict[str, Session]"
+    _lock: Lock
+    _stopped: Event
+
+    def __init__(
+        self,
+        idle_timeout: float = 300,
+        max_bytes: int = 256 * 1024 * 1024,
+        sweep_interval: float = None,
+    ) -> None:
+        self._idle_timeout = idle_timeout
+        self._max_bytes = max_bytes
+        self._sessions = OrderedDict()
+        self._lock = Lock()
+        self._stopped = Event()
+
+        if sweep_interval:
+            Thread(
+                target=self._sweep, args=(sweep_interval,), name="session-sweeper", daemon=True
+            ).start()
+
+    def open(
+        self,
+        payload: PayloadModel,
+        rawData: bytes = None,
+        blobs: Dict[str, bytes] = None,
+        datasets: Dict[str, DataFrame] = None,
+    ) -> Tuple[str, bytes]:
+        """Draws the payload into a new session, returns its id and first image"""
+        self.expire()
+        with stage("validate"):
+            validate_data(
+                dataList=payload.data or [],
+                rawData=rawData,
+                blobs=blobs,
+                plots=payload.image.plots,
+                datasets=datasets,
+            )
+        session = Session(payload)
+        session_id = uuid.uuid4().hex
+        with self._lock:
+            self._sessions[session_id] = session
+        self._fit(session_id, session)
+
+        return session_id, session.image
+
+    def append(self, session_id: str, rawData: bytes = None, blobs: Dict[str, bytes] = None) -> bytes:
+        self.expire()
+        session = self._get(session_id)
+        with session.lock:
+            # NOTE: the sweeper or an eviction may have closed it since it was looked up
+            if session.closed:
+                raise SessionNotFoundError(f"Unknown or expired session {session_id}")
+            image = session.append(rawData=rawData, blobs=blobs)
+            session.last_used = time.monotonic()
+        self._fit(session_id, session)
+
+        return image
+
+    def close(self, session_id: str) -> None:
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+        self.expire()
+        if session is None:
+            raise SessionNotFoundError(f"Unknown or expired session {session_id}")
+
+        session.close()
+
+    def shutdown(self) -> None:
+        """Stops the sweeper and closes every session"""
+        self._stopped.set()
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+
+        for session in sessions:
+            session.close()
+
+    def expire(self) -> None:
+        """Closes the sessions idle for longer than the idle timeout"""
+        limit = time.monotonic() - self._idle_timeout
+        with self._lock:
+            expired = [key for key, session in self._sessions.items() if session.last_used < limit]
+            sessions = [self._sessions.pop(key) for key in expired]
+
+        for session in sessions:
+            session.close()
+
+    def _sweep(self, interval: float) -> None:
+        while not self._stopped.wait(interval):
+            self.expire()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            sessions = list(self._sessions.values())
+
+        return {"sessions": len(sessions), "bytes": sum(session.nbytes for session in sessions)}
+
+    def _get(self, session_id: str) -> Session:
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                raise SessionNotFoundError(f"Unknown or expired session {session_id}")
+            self._sessions.move_to_end(session_id)
+
+        return session
+
+    def _fit(self, session_id: str, session: Session) -> None:
+        """Closes the least recently used sessions until the store fits in max_bytes"""
+        if session.nbytes > self._max_bytes:
+            with self._lock:
+                self._sessions.pop(session_id, None)
+            session.close()
+            raise SessionLimitError(f"Session {session_id} exceeds {self._max_bytes} bytes")
+
+        with self._lock:
+            sizes = {key: other.nbytes for key, other in self._sessions.items()}
+            evicted = []
+            total = sum(sizes.values())
+            for key in list(self._sessions):
+                if total <= self._max_bytes:
+                    break
+                if key != session_id:
+                    total -= sizes[key]
+                    evicted.append(self._sessions.pop(key))
+
+        for other in evicted:
+            other.close()
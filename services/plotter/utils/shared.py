@@ -0,0 +1,116 @@
+import ipaddress
+import mmap
+import os
+from typing import Dict, List, Tuple
+
+from decouple import Csv, config
+
+from utils.exceptions import InvalidRequestError
+
+
+"""
+Shared memory handoff for clients running on the plotter's host.
+Instead of sending their data inline, local clients point to a POSIX shared memory segment
+or a file (name, offset, length), which the parsing process maps read-only, the frames are
+built on top of the mapping. The client must leave the bytes unchanged until the response.
+"""
+
+
+# NOTE: only segments and files under these directories can be mapped, empty disables sharing
+SHARED_DATA_DIRS: List[str] = config("SHARED_DATA_DIRS", default="/dev/shm", cast=Csv())
+SHM_DIRECTORY = "/dev/shm"
+
+
+class SharedBlob(object):
+    """SharedBlob is a reference to length bytes at offset of a file of the server's host,
+    it pickles as the reference so render processes map the file themselves"""
+
+    path: str
+    offset: int
+    length: int
+
+    def __init__(self, path: str, offset: int = 0, length: int = 0) -> None:
+        self.path = path
+        self.offset = offset
+        self.length = length
+
+    def map(self) -> memoryview:
+        """Maps the referenced bytes read-only, a length of 0 runs to the end of the file"""
+        try:
+            with open(self.path, "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                length = self.length or size - self.offset
+                if self.offset + length > size:
+                    raise InvalidRequestError(f"Shared data {self.path} is shorter than requested")
+                if length <= 0:
+                    return memoryview(b"")
+
+                # NOTE: mappings start on a page boundary, the view skips to the offset
+                start = self.offset - self.offset % mmap.ALLOCATIONGRANULARITY
+                mapped = mmap.mmap(
+                    f.fileno(), self.offset + length - start, access=mmap.ACCESS_READ, offset=start
+                )
+        except OSError as e:
+            raise InvalidRequestError(f"Could not map shared data {self.path}: {e.strerror}")
+
+        return memoryview(mapped)[self.offset - start :]
+
+
+def shared_path(name: str) -> str:
+    """Path of a POSIX shared memory segment name (/name) or of a file,
+    which must lie in one of the shared data directories"""
+    if "/" not in name.lstrip("/"):
+        name = os.path.join(SHM_DIRECTORY, name.lstrip("/"))
+
+    path = os.path.realpath(name)
+    for directory in SHARED_DATA_DIRS:
+        if os.path.commonpath((path, os.path.realpath(directory))) == os.path.realpath(directory):
+            return path
+
+    raise InvalidRequestError(f"Shared data {name} is outside of the shared data directories")
+
+
+def local_peer(peer: str) -> bool:
+    """Whether a gRPC peer (ipv4:host:port, ipv6:[host]:port, unix:path) runs on this host"""
+    transport, _, address = peer.partition(":")
+    if transport in ("unix", "unix-abstract"):
+        return True
+    if transport not in ("ipv4", "ipv6"):
+        return False
+
+    host = address.rpartition(":")[0].strip("[]")
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def shared_data(
+    rawData: bytes,
+    blobs: Dict[str, bytes],
+    sharedData=None,
+    sharedBlobs: Dict[str, object] = None,
+    peer: str = "",
+) -> Tuple[bytes | SharedBlob, Dict[str, bytes | SharedBlob]]:
+    """Replaces the inline data of a request by its shared references when the peer is local,
+    a remote peer (or disabled sharing) falls back to the inline bytes"""
+    sharedBlobs = sharedBlobs or {}
+    if sharedData is None and not sharedBlobs:
+        return rawData, blobs
+
+    if SHARED_DATA_DIRS and local_peer(peer):
+        blobs = {**blobs, **{name: shared_blob(shared) for name, shared in sharedBlobs.items()}}
+        if sharedData is not None:
+            rawData = shared_blob(sharedData)
+        return rawData, blobs
+
+    missing = [name for name in sharedBlobs if name not in blobs]
+    if missing or (sharedData is not None and not rawData):
+        raise InvalidRequestError("Shared data is only accepted from local clients, send it inline")
+
+    return rawData, blobs
+
+
+def shared_blob(shared) -> SharedBlob:
+    """SharedBlob of a SharedData message"""
+    return SharedBlob(shared_path(shared.name), offset=shared.offset, length=shared.length)
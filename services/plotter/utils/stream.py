@@ -0,0 +1,74 @@
+from io import BufferedReader, RawIOBase
+from typing import Iterable, Iterator
+
+
+class ChunkReader(RawIOBase):
+    """ChunkReader exposes an iterator of byte chunks as a readable binary stream,
+    so parsers can consume the data while the chunks are still arriving"""
+
+    def __init__(self, chunks: Iterable[bytes]) -> None:
+        self._chunks = iter(chunks)
+        self._buffer = memoryview(b"")
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        while not self._buffer:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return 0
+            self._buffer = memoryview(chunk)
+
+        size = min(len(b), len(self._buffer))
+        b[:size] = self._buffer[:size]
+        # NOTE: only a view into the current chunk is kept, consumed chunks are freed
+        self._buffer = self._buffer[size:]
+
+        return size
+
+
+class BufferReader(RawIOBase):
+    """BufferReader is a seekable binary stream over a buffer, unlike BytesIO it never
+    copies a buffer that isn't bytes (such as a memory mapping)"""
+
+    def __init__(self, buffer) -> None:
+        self._buffer = memoryview(buffer)
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        size = min(len(b), len(self._buffer) - self._position)
+        b[:size] = self._buffer[self._position : self._position + size]
+        self._position += size
+
+        return size
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        base = (0, self._position, len(self._buffer))[whence]
+        self._position = max(base + offset, 0)
+
+        return self._position
+
+    def tell(self) -> int:
+        return self._position
+
+
+def open_buffer(buffer, buffer_size: int = 1024 * 1024) -> BufferedReader:
+    return BufferedReader(BufferReader(buffer), buffer_size=buffer_size)
+
+
+def open_chunks(chunks: Iterable[bytes], buffer_size: int = 1024 * 1024) -> BufferedReader:
+    return BufferedReader(ChunkReader(chunks), buffer_size=buffer_size)
+
+
+def iter_chunks(data: bytes, chunk_size: int) -> Iterator[bytes]:
+    """Splits data into chunks of at most chunk_size bytes"""
+    view = memoryview(data)
+    for offset in range(0, len(view), chunk_size):
+        yield view[offset : offset + chunk_size].tobytes()
@@ -0,0 +1,85 @@
+from typing import List, Tuple
+
+import numpy as np
+from matplotlib.colors import to_rgba
+
+from models.image import GraphModel
+from models.layout import LayoutModel
+from models.payload import PayloadModel
+from utils.encoder import RASTER_FORMATS, FORMATS, encode_rgba
+
+
+"""
+Splits a parallel grid layout into one payload per cell and composites the drawn cells.
+Each tile is a figure the size of its cell, drawn on its own Agg canvas, so the cells of
+a grid can be rendered by different workers and pasted into the final pixel buffer.
+"""
+
+
+Box = Tuple[int, int, int, int]
+
+
+def tiled(payload: PayloadModel) -> bool:
+    """Whether the payload is drawn as tiles, vector formats always need the whole figure"""
+    layout = payload.image.layout
+    format = payload.image.format.lower()
+
+    return (
+        layout.parallel
+        and layout.nrows * layout.ncols > 1
+        and payload.image.save
+        and FORMATS.get(format, format) in RASTER_FORMATS
+    )
+
+
+def image_size(payload: PayloadModel) -> Tuple[int, int]:
+    """Pixel width and height of the figure, as Agg sizes its canvas"""
+    figure = payload.image.figure
+
+    return int(figure.figsize[0] * figure.dpi), int(figure.figsize[1] * figure.dpi)
+
+
+def split(payload: PayloadModel) -> List[Tuple[Box, PayloadModel]]:
+    """Pixel box (x0, y0, x1, y1) and payload of every grid cell showing a graph,
+    the tiles only carry the data of their own plots"""
+    layout = payload.image.layout
+    width, height = image_size(payload)
+    columns = np.linspace(0, width, layout.ncols + 1).round().astype(int)
+    rows = np.linspace(0, height, layout.nrows + 1).round().astype(int)
+    figure = payload.image.figure
+
+    tiles = []
+    for graph_id in range(layout.nrows * layout.ncols):
+        graphModel = payload.image.graphs.get(graph_id)
+        if graphModel is None:
+            continue
+
+        row, column = divmod(graph_id, layout.ncols)
+        box = (columns[column], rows[row], columns[column + 1], rows[row + 1])
+        # NOTE: half a pixel of slack, Agg truncates the canvas size to whole pixels
+        figsize = ((box[2] - box[0] + 0.5) / figure.dpi, (box[3] - box[1] + 0.5) / figure.dpi)
+        image = payload.image.model_copy(
+            update={
+                "format": "rgba",
+                "figure": figure.model_copy(update={"figsize": figsize}),
+                "layout": LayoutModel(),
+                "graphs": {0: GraphModel(plot_id_list=graphModel.plot_id_list)},
+            }
+        )
+        data = [data for data in payload.data or [] if data.plotID in graphModel.plot_id_list]
+        tiles.append((box, payload.model_copy(update={"data": data, "image": image})))
+
+    return tiles
+
+
+def compose(payload: PayloadModel, tiles: List[Tuple[Box, bytes]]) -> bytes:
+    """Pastes the raw RGBA tiles on a canvas of the figure's facecolor and encodes it"""
+    width, height = image_size(payload)
+    canvas = np.empty((height, width, 4), dtype=np.uint8)
+    canvas[:] = np.round(np.array(to_rgba(payload.image.figure.facecolor)) * 255)
+
+    for (x0, y0, x1, y1), tile in tiles:
+        pixels = np.frombuffer(tile, dtype=np.uint8).reshape(y1 - y0, x1 - x0, 4)
+        canvas[y0:y1, x0:x1] = pixels
+
+    return encode_rgba(canvas, format=payload.image.format, profile=payload.image.profile)
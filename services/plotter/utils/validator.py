@@ -1,46 +1,370 @@
-from typing import List
-from pandas import DataFrame, read_csv
+import csv
+from concurrent import futures
+from threading import Lock
+from typing import BinaryIO, Dict, List
+import numpy as np
+from decouple import config
+from pandas import DataFrame, read_csv, to_numeric
 
-from models.data import DataModel
+from models.data import DataModel, FileModel, FunctionModel
+from models.plot import PlotModel
+from models.report import IssueModel, ValidationReportModel
+from utils.compression import DECOMPRESS_ERRORS, decompress
 from utils.exceptions import InvalidRequestError
+from utils.formats import read_binary
+from utils.functions import CompiledFunction, compile_function, sample_function
+from utils.shared import SharedBlob
+from utils.stream import open_buffer
 
 from io import BytesIO
 
 
-def validate_data(dataList: List[DataModel], rawData: bytes = None) -> None:
+CSV_ENGINE = config("CSV_ENGINE", default="c")
+PARSE_THREADS = config("PARSE_THREADS", default=4, cast=int)
+# NOTE: bounds the resolution and max_points of a function, its samples are held in memory
+FUNCTION_MAX_POINTS = config("FUNCTION_MAX_POINTS", default=1_000_000, cast=int)
+# NOTE: the report lists at most this many offending rows per issue
+REPORT_MAX_ROWS = 100
+
+
+_parse_executor: futures.ThreadPoolExecutor = None
+_parse_lock = Lock()
+
+
+def validate_data(
+    dataList: List[DataModel],
+    rawData: bytes | SharedBlob | BinaryIO = None,
+    blobs: Dict[str, bytes | SharedBlob] = None,
+    frames: Dict[str, DataFrame] = None,
+    plots: Dict[int, PlotModel] = None,
+    datasets: Dict[str, DataFrame] = None,
+    failures: Dict[str, InvalidRequestError] = None,
+) -> None:
+    """Parses and validates the data of every data model.
+    A file model reads the uploaded dataset of its dataset_id, the blob named after its
+    filename, or rawData which is either the whole file, a shared blob mapped in place
+    or a stream that is parsed while it arrives, decompressed on the way when compressed.
+    Each blob is parsed once, in parallel, frames and failures memoize them between calls.
+    Duplicated index values are only rejected for the data of plots that need a unique
+    index, which is every plot when plots isn't given"""
+    frames = {} if frames is None else frames
+    failures = {} if failures is None else failures
     for data in dataList:
-        if data.datatype == "file":
-            if rawData is None:
-                raise Exception("Expected file for file datatype.")
+        if data.datatype == "Function":
+            validate_function(data)
+        elif data.datatype != "file":
+            raise InvalidRequestError("Invalid File Type")
 
-            dataframe = read_csv(BytesIO(rawData), sep=",", index_col=0)
-            dataframe = dataframe.rename(data.column_names, axis="columns")
+    parse_blobs(dataList, frames, failures, rawData=rawData, blobs=blobs, plots=plots)
 
-            dataframe = validate_dataframe(dataframe=dataframe)
+    for data in dataList:
+        if data.datatype == "file" and data.dataset_id is not None:
+            dataframe = dataset_frame(data, datasets, unique_index(data, plots))
+            data.dataframe = dataframe.rename(data.column_names, axis="columns", copy=False)
+        elif data.datatype == "file":
+            key, _ = resolve_blob(data, rawData=rawData, blobs=blobs)
+            unique = unique_index(data, plots)
+            dataframe = frame(frames, key, unique)
+            if dataframe is None:
+                raise failure(failures, key, unique)
+            data.dataframe = dataframe.rename(data.column_names, axis="columns", copy=False)
 
-            data.dataframe = dataframe
-            print(dataframe)
-        elif data.datatype == "Function":
-            validate_latex(data.function)
-        else:
-            raise Exception("Invalid File Type")
+
+def parse_blobs(
+    dataList: List[DataModel],
+    frames: Dict[str, DataFrame],
+    failures: Dict[str, InvalidRequestError],
+    rawData: bytes | SharedBlob | BinaryIO = None,
+    blobs: Dict[str, bytes | SharedBlob] = None,
+    plots: Dict[int, PlotModel] = None,
+) -> None:
+    """Parses the blobs of the file models of dataList that neither frames nor failures
+    memoize yet, each distinct blob once"""
+    sources: Dict[str, tuple] = {}
+    for data in dataList:
+        if data.datatype != "file" or data.dataset_id is not None:
+            continue
+        key, blob = resolve_blob(data, rawData=rawData, blobs=blobs)
+        unique = unique_index(data, plots)
+        if frame(frames, key, unique) is None and failure(failures, key, unique) is None:
+            # NOTE: a blob shared with a line is checked once, for a unique index
+            unique = unique or (key in sources and sources[key][3])
+            sources[key] = (blob, data.format, data.compression, unique)
+
+    load_frames(sources, frames=frames, failures=failures)
 
 
-def validate_dataframe(dataframe: DataFrame) -> DataFrame:
-    """Validates input data"""
-    data_nulls = dataframe.isnull()
-    if data_nulls.any().any():
-        raise InvalidRequestError("Found NaN value in provided data")
+def unique_index(data: DataModel, plots: Dict[int, PlotModel] = None) -> bool:
+    plot = plots.get(data.plotID) if plots is not None else None
 
-    for col in dataframe.columns:
-        dataframe[col] = dataframe[col].astype(float)
+    return plot is None or plot.unique_index
 
-    index = dataframe.index.values
-    if not len(index) == len(set(index)):
-        raise InvalidRequestError("Found duplicated entry in provided data")
+
+def frame_key(key: str, unique: bool) -> str:
+    return f"{key}:unique" if unique else f"{key}:any"
+
+
+def frame(frames: Dict[str, DataFrame], key: str, unique: bool) -> DataFrame:
+    """Memoized frame of a blob, one checked for a unique index also serves other plots"""
+    dataframe = frames.get(frame_key(key, unique=True))
+    if dataframe is None and not unique:
+        dataframe = frames.get(frame_key(key, unique=False))
 
     return dataframe
 
 
-def validate_latex(function: str) -> str:
-    return function
+def failure(failures: Dict[str, InvalidRequestError], key: str, unique: bool):
+    """Memoized failure of a blob, one that failed to parse fails for every plot"""
+    error = failures.get(frame_key(key, unique=False))
+    if error is None and unique:
+        error = failures.get(frame_key(key, unique=True))
+
+    return error
+
+
+def dataset_frame(data: FileModel, datasets: Dict[str, DataFrame], unique: bool) -> DataFrame:
+    """Frame of an uploaded dataset, validated by the upload except for the uniqueness
+    of its index, which only some plots need"""
+    dataframe = (datasets or {}).get(data.dataset_id)
+    if dataframe is None:
+        raise InvalidRequestError(f"Unknown dataset {data.dataset_id}")
+    if unique and not dataframe.index.is_unique:
+        report = validate_report(dataframe=dataframe, unique_index=True)
+        raise InvalidRequestError("Found invalid values in provided data", report=report)
+
+    return dataframe
+
+
+def resolve_blob(data: FileModel, rawData: bytes | BinaryIO = None, blobs: Dict[str, bytes] = None):
+    """Finds the blob of a file model and the key its frame is memoized under"""
+    if blobs and data.filename in blobs:
+        return f"{data.filename}:{data.format}:{data.compression}", blobs[data.filename]
+    if rawData is None:
+        raise InvalidRequestError(f"Expected file {data.filename} for file datatype.")
+
+    return f":{data.format}:{data.compression}", rawData
+
+
+def load_frames(
+    sources: Dict[str, tuple],
+    frames: Dict[str, DataFrame],
+    failures: Dict[str, InvalidRequestError],
+) -> None:
+    """Parses and validates (blob, format, compression, unique) sources, concurrently when
+    there are several, into frames as each one succeeds and into failures otherwise"""
+
+    def load(key: str, source: tuple) -> None:
+        blob, format, compression, unique = source
+        try:
+            if isinstance(blob, SharedBlob):
+                blob = blob.map()
+            dataframe = read_data(blob, format=format, compression=compression)
+        except InvalidRequestError as e:
+            failures[frame_key(key, unique=False)] = e
+            return
+
+        report = validate_report(dataframe=dataframe, unique_index=unique)
+        if report.valid:
+            frames[frame_key(key, unique)] = dataframe.astype("float64", copy=False)
+            return
+
+        error = InvalidRequestError("Found invalid values in provided data", report=report)
+        if report.non_numeric or report.non_finite.count:
+            failures[frame_key(key, unique=False)] = error
+        else:
+            # NOTE: only the index repeats, the frame still serves plots without a unique index
+            failures[frame_key(key, unique=True)] = error
+            frames[frame_key(key, unique=False)] = dataframe.astype("float64", copy=False)
+
+    if len(sources) <= 1:
+        for key, source in sources.items():
+            load(key, source)
+        return
+
+    list(parse_executor().map(load, sources, sources.values()))
+
+
+def parse_executor() -> futures.ThreadPoolExecutor:
+    global _parse_executor
+    with _parse_lock:
+        if _parse_executor is None:
+            _parse_executor = futures.ThreadPoolExecutor(
+                max_workers=PARSE_THREADS, thread_name_prefix="parse"
+            )
+
+    return _parse_executor
+
+
+def read_data(
+    rawData: bytes | memoryview | BinaryIO,
+    format: str = "csv",
+    engine: str = None,
+    compression: str = None,
+) -> DataFrame:
+    """Parses a CSV blob, with float dtypes for the value columns from the start,
+    or wraps a binary columnar blob, a compressed blob is decompressed as it is read"""
+    try:
+        return parse_data(rawData, format=format, engine=engine, compression=compression)
+    except DECOMPRESS_ERRORS as e:
+        if compression is None:
+            raise
+        raise InvalidRequestError(f"Could not decompress {compression} data: {e}")
+
+
+def parse_data(
+    rawData: bytes | memoryview | BinaryIO, format: str, engine: str, compression: str
+) -> DataFrame:
+    if format != "csv":
+        if compression is not None:
+            rawData = decompress(open_source(rawData), compression).read()
+        elif not isinstance(rawData, (bytes, memoryview)):
+            rawData = rawData.read()
+        return read_binary(rawData, format=format)
+
+    source = open_data(rawData, compression)
+    rows = read_rows(rawData if compression is None else source)
+    dtype = {name: "float64" for name in rows[0][1:]} if rows else None
+    engine = csv_engine(engine or CSV_ENGINE, rows)
+
+    try:
+        return read_csv(source, sep=",", index_col=0, dtype=dtype, engine=engine)
+    except ValueError:
+        if dtype is None or not isinstance(rawData, (bytes, memoryview)):
+            raise InvalidRequestError("Found non numeric value in provided data")
+
+    # NOTE: parse again without dtypes so the validation can report the offending rows
+    return read_csv(open_data(rawData, compression), sep=",", index_col=0, engine=engine)
+
+
+def csv_engine(engine: str, rows: List[List[str]]) -> str:
+    """Engine parsing a CSV blob, the pyarrow engine turns dates and times of the index into
+    date objects where the c engine keeps their strings, so it only parses numeric indexes"""
+    if engine != "pyarrow":
+        return engine
+    if rows is None or len(rows) < 2 or not rows[1]:
+        return "c"
+    try:
+        float(rows[1][0])
+    except ValueError:
+        return "c"
+
+    return engine
+
+
+def open_data(rawData: bytes | memoryview | BinaryIO, compression: str = None) -> BinaryIO:
+    """Binary stream of the data of a blob, decompressed when it is compressed"""
+    source = open_source(rawData)
+
+    return source if compression is None else decompress(source, compression)
+
+
+def open_source(rawData: bytes | memoryview | BinaryIO) -> BinaryIO:
+    """Binary stream of a blob, a mapped buffer is read in place rather than copied"""
+    if isinstance(rawData, bytes):
+        return BytesIO(rawData)
+    if isinstance(rawData, memoryview):
+        return open_buffer(rawData)
+
+    return rawData
+
+
+def read_rows(rawData: bytes | memoryview | BinaryIO, count: int = 2) -> List[List[str]]:
+    """Peeks the column names and the first rows of a CSV blob without consuming it"""
+    if isinstance(rawData, memoryview):
+        head, whole = rawData[: 64 * 1024].tobytes(), len(rawData) <= 64 * 1024
+    elif isinstance(rawData, bytes):
+        head, whole = rawData, True
+    elif hasattr(rawData, "peek"):
+        head, whole = rawData.peek(64 * 1024), False
+    else:
+        return None
+
+    lines, start = [], 0
+    while len(lines) < count:
+        end = head.find(b"\n", start)
+        if end < 0:
+            # NOTE: a line is only known to be complete up to a newline or the end of the blob
+            if whole and start < len(head):
+                lines.append(head[start:])
+            break
+        lines.append(head[start:end])
+        start = end + 1
+    if not lines:
+        return None
+
+    return list(csv.reader(line.decode("utf8").rstrip("\r") for line in lines))
+
+
+def validate_dataframe(dataframe: DataFrame, unique_index: bool = True) -> DataFrame:
+    """Validates input data in a constant number of vectorized passes,
+    raises an InvalidRequestError carrying the report of every issue found"""
+    report = validate_report(dataframe=dataframe, unique_index=unique_index)
+    if not report.valid:
+        raise InvalidRequestError("Found invalid values in provided data", report=report)
+
+    return dataframe.astype("float64", copy=False)
+
+
+def validate_report(dataframe: DataFrame, unique_index: bool = True) -> ValidationReportModel:
+    """Checks numeric coercion, NaN/inf values and duplicated (when the index must be unique)
+    or unsorted index values"""
+    report = ValidationReportModel(
+        rows=len(dataframe), columns=[str(col) for col in dataframe.columns]
+    )
+
+    try:
+        finite = np.isfinite(dataframe.to_numpy(dtype="float64"))
+    except (TypeError, ValueError):
+        # NOTE: error path only, locate the cells that failed the coercion
+        finite = np.empty(dataframe.shape, dtype=bool)
+        for position, col in enumerate(dataframe.columns):
+            coerced = to_numeric(dataframe[col], errors="coerce").to_numpy(dtype="float64")
+            failed = np.isnan(coerced) & dataframe[col].notna().to_numpy()
+            if failed.any():
+                report.non_numeric[str(col)] = issue(np.flatnonzero(failed))
+            finite[:, position] = np.isfinite(coerced) | failed
+
+    report.non_finite = issue(np.flatnonzero(~finite.all(axis=1)))
+
+    index = dataframe.index
+    report.monotonic_index = index.is_monotonic_increasing
+    if unique_index:
+        if report.monotonic_index and index.dtype.kind in "iufM":
+            duplicated = np.flatnonzero(np.diff(index.to_numpy()) == 0) + 1
+        else:
+            duplicated = np.flatnonzero(index.duplicated())
+        report.duplicated_index = issue(duplicated)
+
+    report.valid = not (
+        report.non_numeric or report.non_finite.count or report.duplicated_index.count
+    )
+
+    return report
+
+
+def issue(rows: np.ndarray) -> IssueModel:
+    return IssueModel(count=len(rows), rows=rows[:REPORT_MAX_ROWS].tolist())
+
+
+def validate_function(data: FunctionModel) -> None:
+    """Compiles the function and samples it over its limits"""
+    if data.limits is None or len(data.limits) != 2:
+        raise InvalidRequestError(f"Expected (min, max) limits for function {data.function}")
+    points = max(data.resolution, data.max_points if data.adaptive else 0)
+    if points > FUNCTION_MAX_POINTS:
+        raise InvalidRequestError(
+            f"Function {data.function} asks for {points} points, at most {FUNCTION_MAX_POINTS}"
+        )
+
+    data.lambda_f = validate_latex(data.function)
+    data.dataframe = sample_function(
+        data.lambda_f,
+        limits=data.limits,
+        resolution=data.resolution,
+        tolerance=data.tolerance,
+        max_points=data.max_points if data.adaptive else 0,
+    )
+
+
+def validate_latex(function: str) -> CompiledFunction:
+    return compile_function(function)
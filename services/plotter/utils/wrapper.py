@@ -1,54 +1,219 @@
-from io import BytesIO
+from typing import Callable, List, Tuple
 
-import matplotlib
-import matplotlib.pyplot as plt
+from decouple import config
 from matplotlib.figure import Figure
 from matplotlib.axes import Axes
 
 from models.payload import PayloadModel
 from models.image import FigureModel, LayoutModel, GraphModel, PlotModel
+from models.plot import ScatterPlotModel
+from utils.decimate import decimate
+from utils.encoder import encode
+from utils.figures import FigurePool, add_grid
+from utils.metrics import stage
+
+import numpy as np
+from pandas import DataFrame, Index, Series
+
+
+figure_pool = FigurePool(size=config("FIGURE_POOL_SIZE", default=4, cast=int))
+# NOTE: points binned per pass when drawing a density image
+DENSITY_CHUNK = 1 << 18
+
+
+def build_image(payload: PayloadModel, checkpoint: Callable[[], None] = None):
+    with stage("figure"):
+        fig: Figure = build_figure(
+            figureModel=payload.image.figure, layoutModel=payload.image.layout
+        )
+    try:
+        # NOTE: the pooled figure comes with the axes of the layout grid already
+        axes = dict(enumerate(fig.axes))
+
+        with stage("plots"):
+            for graph_id, ax in axes.items():
+                if checkpoint is not None:
+                    checkpoint()
+                graphModel = payload.image.graphs.get(graph_id)
+                if graphModel is None:
+                    # NOTE: grid cells without a graph stay blank
+                    ax.set_axis_off()
+                    continue
+                build_graphs(ax, graphModel)
+                for plot_id in graphModel.plot_id_list:
+                    for dataframe in plot_data(payload, plot_id):
+                        build_plots(ax, payload.image.plots.get(plot_id), dataframe)
+
+        if checkpoint is not None:
+            checkpoint()
+        image = b""
+        if payload.image.save:
+            with stage("encode"):
+                image = encode(fig, format=payload.image.format, profile=payload.image.profile)
+    finally:
+        figure_pool.release(fig)
+
+    return image
+
+
+def plot_data(payload: PayloadModel, plot_id: int) -> List[DataFrame]:
+    """Frames drawn by a plot, every data source assigned to it overlays on the same axes"""
+    frames = [
+        data.dataframe
+        for data in payload.data or []
+        if data.plotID == plot_id and data.dataframe is not None
+    ]
+
+    return frames
+
+
+def build_figure(figureModel: FigureModel, layoutModel: LayoutModel = None) -> Figure:
+    """Takes an Agg figure with the layout grid from the worker's pool, bypassing pyplot"""
+    fig: Figure = figure_pool.acquire(figureModel=figureModel, layoutModel=layoutModel)
 
-from pandas import DataFrame
-
+    return fig
 
-matplotlib.use("agg")
 
+def build_layout(layoutModel: LayoutModel, fig: Figure) -> dict:
+    """Axes of the layout grid by graph id, numbered row by row"""
+    return dict(enumerate(add_grid(fig, layoutModel)))
 
-def build_image(payload: PayloadModel):
-    fig: Figure = build_figure(figureModel=payload.image.figure)
-    axes: dict = build_layout(layoutModel=payload.image.layout, fig=fig)
 
-    for graph_id, ax in axes.items():
-        graphModel = payload.image.graphs.get(graph_id)
-        build_graphs(ax, graphModel)
-        for plot_id in graphModel.plot_id_list:
-            build_plots(ax, payload.image.plots.get(plot_id), payload.data[0].dataframe)
+def build_graphs(axes: Axes, graphModel: GraphModel):
+    pass
 
-    buffer = BytesIO()
-    if payload.image.save:
-        fig.savefig(buffer, format=payload.image.format)
 
-    return buffer.getvalue()
+def build_plots(axes: Axes, plotModel: PlotModel, data: DataFrame):
+    if plotModel.plotType == "LinePlotModel":
+        for col in data.columns:
+            x, y = decimate_series(axes, plotModel, data.index, data[col])
+            axes.plot(x, y)
+    elif plotModel.plotType == "ScatterPlotModel":
+        build_scatter(axes, plotModel, data)
 
 
-def build_figure(figureModel: FigureModel) -> Figure:
-    fig: Figure = plt.figure(**figureModel.model_dump())
+def decimate_series(axes: Axes, plotModel: PlotModel, index: Index, series: Series) -> tuple:
+    """Reduces a series to a few points per horizontal pixel of the axes"""
+    n_out = int(axes.get_window_extent().width * plotModel.points_per_pixel)
+    # NOTE: an unsorted line is drawn in data order, decimating it would change its shape
+    if plotModel.decimation is None or len(index) <= n_out or not index.is_monotonic_increasing:
+        return index, series
 
-    return fig
+    x = index_values(index)
+    positions = decimate(x, series.to_numpy(dtype="float64"), plotModel.decimation, n_out)
 
+    return index[positions], series.iloc[positions]
 
-def build_layout(layoutModel: LayoutModel, fig: Figure) -> dict:
-    id0: int = 0
-    axes0: Axes = fig.subplots(1, 1)
 
-    return {id0: axes0}
+def index_values(index: Index) -> np.ndarray:
+    """Index as float64 positions on the x axis, datetimes as nanoseconds"""
+    if index.dtype.kind in "iuf":
+        return index.to_numpy(dtype="float64")
+    if index.dtype.kind == "M":
+        return index.to_numpy().view("int64").astype("float64")
 
+    return np.arange(len(index), dtype="float64")
 
-def build_graphs(axes: Axes, graphModel: GraphModel):
-    pass
 
+def build_scatter(axes: Axes, plotModel: ScatterPlotModel, data: DataFrame):
+    """Draws markers, or a density image once the points outnumber the pixels they cover"""
+    density = plotModel.density
+    if density is None:
+        density = data.size > plotModel.density_threshold
 
-def build_plots(axes: Axes, plotModel: PlotModel, data: DataFrame):
-    if plotModel.plotType == "LinePlotModel":
+    if not density:
+        # NOTE: the colormap only applies to a list of c values, matplotlib warns otherwise
+        colormap = {}
+        if isinstance(plotModel.c, list):
+            colormap = plotModel.model_dump(include={"cmap", "norm", "vmin", "vmax"})
         for col in data.columns:
-            axes.plot(data.index, data[col])
+            axes.scatter(
+                data.index,
+                data[col],
+                s=plotModel.s,
+                c=plotModel.c,
+                marker=plotModel.marker,
+                alpha=plotModel.alpha,
+                linewidths=plotModel.linewidths,
+                edgecolors=plotModel.edgecolors,
+                plotnonfinite=plotModel.plotnonfinite,
+                **colormap,
+            )
+        return
+
+    window = axes.get_window_extent()
+    x = index_values(data.index)
+    counts, extent = density_grid(
+        x,
+        [data[col].to_numpy(dtype="float64") for col in data.columns],
+        shape=(max(int(window.height), 1), max(int(window.width), 1)),
+    )
+    # NOTE: empty pixels stay transparent, which also keeps log norms away from zero
+    axes.imshow(
+        np.ma.masked_equal(counts, 0),
+        origin="lower",
+        extent=extent,
+        aspect="auto",
+        interpolation="nearest",
+        cmap=plotModel.cmap,
+        norm=plotModel.norm,
+        vmin=plotModel.vmin,
+        vmax=plotModel.vmax,
+        alpha=plotModel.alpha,
+    )
+
+
+def density_grid(x: np.ndarray, ys: List[np.ndarray], shape: Tuple[int, int]) -> tuple:
+    """Counts the (x, y) points of every series per pixel of a (height, width) grid
+    spanning their finite range, returns the counts and the (left, right, bottom, top) extent"""
+    height, width = shape
+    counts = np.zeros(height * width, dtype=np.int64)
+    x_finite = np.isfinite(x).all()
+    ys_finite = [np.isfinite(y).all() for y in ys]
+    ranges = [finite_range(y, finite) for y, finite in zip(ys, ys_finite)]
+    ranges = [r for r in ranges if r is not None]
+    x_range = finite_range(x, x_finite)
+    if x_range is None or not ranges:
+        return counts.reshape(shape), (0.0, 1.0, 0.0, 1.0)
+
+    left, right = padded_range(*x_range)
+    bottom, top = padded_range(min(low for low, _ in ranges), max(high for _, high in ranges))
+    x_scale, y_scale = width / (right - left), height / (top - bottom)
+
+    # NOTE: bin by chunks into reused buffers, memory stays flat whatever the number of points
+    columns = np.empty(min(DENSITY_CHUNK, len(x)))
+    rows = np.empty_like(columns)
+    for y, y_finite in zip(ys, ys_finite):
+        for start in range(0, len(x), DENSITY_CHUNK):
+            size = min(DENSITY_CHUNK, len(x) - start)
+            column = np.subtract(x[start : start + size], left, out=columns[:size])
+            column *= x_scale
+            row = np.subtract(y[start : start + size], bottom, out=rows[:size])
+            row *= y_scale
+            if not (x_finite and y_finite):
+                inside = (column >= 0) & (column < width) & (row >= 0) & (row < height)
+                column, row = column[inside], row[inside]
+
+            cells = row.astype(np.intp)
+            cells *= width
+            cells += column.astype(np.intp)
+            counts += np.bincount(cells, minlength=height * width)
+
+    return counts.reshape(shape), (left, right, bottom, top)
+
+
+def finite_range(values: np.ndarray, finite: bool) -> Tuple[float, float]:
+    if not finite:
+        values = values[np.isfinite(values)]
+    if not len(values):
+        return None
+
+    return values.min(), values.max()
+
+
+def padded_range(low: float, high: float) -> Tuple[float, float]:
+    """Widens the range a little so the maximum falls inside the last bin"""
+    if high <= low:
+        return low - 0.5, high + 0.5
+
+    return low, high + (high - low) * 1e-9
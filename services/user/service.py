@@ -161,6 +161,7 @@ class UserService(object):
                 "exp": access_expiration,
                 "aud": self._audience,
                 "sid": claims["sid"],
+                "role": "user",
             }
             access_token = jwt.encode(
                 access_token_payload, self._jwk, algorithm=self._algorithm
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# source: user.proto
+"""Generated protocol buffer code."""
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\nuser.proto\x12\x04user\"?\n\x08UserInfo\x12\x11\n\tuser_name\x18\x01 \x01(\t\x12\x11\n\tfull_name\x18\x02 \x01(\t\x12\r\n\x05\x65mail\x18\x03 \x01(\t\"\x0f\n\rGetJwkRequest\"\x1d\n\x0eGetJwkResponse\x12\x0b\n\x03jwk\x18\x01 \x01(\t\"6\n\x0cLoginRequest\x12\r\n\x05\x65mail\x18\x01 \x01(\t\x12\x17\n\x0fhashed_password\x18\x02 \x01(\t\"T\n\rLoginResponse\x12\x16\n\x0eidentity_token\x18\x01 \x01(\t\x12\x14\n\x0c\x61\x63\x63\x65ss_token\x18\x02 \x01(\t\x12\x15\n\rrefresh_token\x18\x03 \x01(\t\"\'\n\x0eRefreshRequest\x12\x15\n\rrefresh_token\x18\x01 \x01(\t\"B\n\x0fRefreshResponse\x12\x14\n\x0c\x61\x63\x63\x65ss_token\x18\x01 \x01(\t\x12\x19\n\x11new_refresh_token\x18\x02 \x01(\t\"K\n\rSignUpRequest\x12!\n\tuser_info\x18\x01 \x01(\x0b\x32\x0e.user.UserInfo\x12\x17\n\x0fhashed_password\x18\x02 \x01(\t\"\x10\n\x0eSignUpResponse\"\x0f\n\rLogoutRequest\"\x10\n\x0eLogoutResponse\"\x13\n\x11UnregisterRequest\"\x14\n\x12UnregisterResponse\"\x14\n\x12GetUserInfoRequest\"8\n\x13GetUserInfoResponse\x12!\n\tuser_info\x18\x01 \x01(\x0b\x32\x0e.user.UserInfo\"\x15\n\x13ListUserInfoRequest\":\n\x14ListUserInfoResponse\x12\"\n\nuser_infos\x18\x01 \x03(\x0b\x32\x0e.user.UserInfo\":\n\x15UpdateUserInfoRequest\x12!\n\tuser_info\x18\x01 \x01(\x0b\x32\x0e.user.UserInfo\"\x18\n\x16UpdateUserInfoResponse2\xb4\x04\n\x0bUserService\x12\x33\n\x06GetJwk\x12\x13.user.GetJwkRequest\x1a\x14.user.GetJwkResponse\x12\x30\n\x05Login\x12\x12.user.LoginRequest\x1a\x13.user.LoginResponse\x12;\n\x0cRefreshToken\x12\x14.user.RefreshRequest\x1a\x15.user.RefreshResponse\x12\x33\n\x06Logout\x12\x13.user.LogoutRequest\x1a\x14.user.LogoutResponse\x12\x33\n\x06SignUp\x12\x13.user.SignUpRequest\x1a\x14.user.SignUpResponse\x12?\n\nUnregister\x12\x17.user.UnregisterRequest\x1a\x18.user.UnregisterResponse\x12\x42\n\x0bGetUserInfo\x12\x18.user.GetUserInfoRequest\x1a\x19.user.GetUserInfoResponse\x12\x45\n\x0cListUserInfo\x12\x19.user.ListUserInfoRequest\x1a\x1a.user.ListUserInfoResponse\x12K\n\x0eUpdateUserInfo\x12\x1b.user.UpdateUserInfoRequest\x1a\x1c.user.UpdateUserInfoResponseb\x06proto3')
+
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'user_pb2', _globals)
+if _descriptor._USE_C_DESCRIPTORS == False:
+  DESCRIPTOR._options = None
+  _globals['_USERINFO']._serialized_start=20
+  _globals['_USERINFO']._serialized_end=83
+  _globals['_GETJWKREQUEST']._serialized_start=85
+  _globals['_GETJWKREQUEST']._serialized_end=100
+  _globals['_GETJWKRESPONSE']._serialized_start=102
+  _globals['_GETJWKRESPONSE']._serialized_end=131
+  _globals['_LOGINREQUEST']._serialized_start=133
+  _globals['_LOGINREQUEST']._serialized_end=187
+  _globals['_LOGINRESPONSE']._serialized_start=189
+  _globals['_LOGINRESPONSE']._serialized_end=273
+  _globals['_REFRESHREQUEST']._serialized_start=275
+  _globals['_REFRESHREQUEST']._serialized_end=314
+  _globals['_REFRESHRESPONSE']._serialized_start=316
+  _globals['_REFRESHRESPONSE']._serialized_end=382
+  _globals['_SIGNUPREQUEST']._serialized_start=384
+  _globals['_SIGNUPREQUEST']._serialized_end=459
+  _globals['_SIGNUPRESPONSE']._serialized_start=461
+  _globals['_SIGNUPRESPONSE']._serialized_end=477
+  _globals['_LOGOUTREQUEST']._serialized_start=479
+  _globals['_LOGOUTREQUEST']._serialized_end=494
+  _globals['_LOGOUTRESPONSE']._serialized_start=496
+  _globals['_LOGOUTRESPONSE']._serialized_end=512
+  _globals['_UNREGISTERREQUEST']._serialized_start=514
+  _globals['_UNREGISTERREQUEST']._serialized_end=533
+  _globals['_UNREGISTERRESPONSE']._serialized_start=535
+  _globals['_UNREGISTERRESPONSE']._serialized_end=555
+  _globals['_GETUSERINFOREQUEST']._serialized_start=557
+  _globals['_GETUSERINFOREQUEST']._serialized_end=577
+  _globals['_GETUSERINFORESPONSE']._serialized_start=579
+  _globals['_GETUSERINFORESPONSE']._serialized_end=635
+  _globals['_LISTUSERINFOREQUEST']._serialized_start=637
+  _globals['_LISTUSERINFOREQUEST']._serialized_end=658
+  _globals['_LISTUSERINFORESPONSE']._serialized_start=660
+  _globals['_LISTUSERINFORESPONSE']._serialized_end=718
+  _globals['_UPDATEUSERINFOREQUEST']._serialized_start=720
+  _globals['_UPDATEUSERINFOREQUEST']._serialized_end=778
+  _globals['_UPDATEUSERINFORESPONSE']._serialized_start=780
+  _globals['_UPDATEUSERINFORESPONSE']._serialized_end=804
+  _globals['_USERSERVICE']._serialized_start=807
+  _globals['_USERSERVICE']._serialized_end=1371
+# @@protoc_insertion_point(module_scope)
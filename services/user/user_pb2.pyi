@@ -0,0 +1,116 @@
+from google.protobuf.internal import containers as _containers
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import message as _message
+from typing import ClassVar as _ClassVar, Iterable as _Iterable, Mapping as _Mapping, Optional as _Optional, Union as _Union
+
+DESCRIPTOR: _descriptor.FileDescriptor
+
+class UserInfo(_message.Message):
+    __slots__ = ["user_name", "full_name", "email"]
+    USER_NAME_FIELD_NUMBER: _ClassVar[int]
+    FULL_NAME_FIELD_NUMBER: _ClassVar[int]
+    EMAIL_FIELD_NUMBER: _ClassVar[int]
+    user_name: str
+    full_name: str
+    email: str
+    def __init__(self, user_name: _Optional[str] = ..., full_name: _Optional[str] = ..., email: _Optional[str] = ...) -> None: ...
+
+class GetJwkRequest(_message.Message):
+    __slots__ = []
+    def __init__(self) -> None: ...
+
+class GetJwkResponse(_message.Message):
+    __slots__ = ["jwk"]
+    JWK_FIELD_NUMBER: _ClassVar[int]
+    jwk: str
+    def __init__(self, jwk: _Optional[str] = ...) -> None: ...
+
+class LoginRequest(_message.Message):
+    __slots__ = ["email", "hashed_password"]
+    EMAIL_FIELD_NUMBER: _ClassVar[int]
+    HASHED_PASSWORD_FIELD_NUMBER: _ClassVar[int]
+    email: str
+    hashed_password: str
+    def __init__(self, email: _Optional[str] = ..., hashed_password: _Optional[str] = ...) -> None: ...
+
+class LoginResponse(_message.Message):
+    __slots__ = ["identity_token", "access_token", "refresh_token"]
+    IDENTITY_TOKEN_FIELD_NUMBER: _ClassVar[int]
+    ACCESS_TOKEN_FIELD_NUMBER: _ClassVar[int]
+    REFRESH_TOKEN_FIELD_NUMBER: _ClassVar[int]
+    identity_token: str
+    access_token: str
+    refresh_token: str
+    def __init__(self, identity_token: _Optional[str] = ..., access_token: _Optional[str] = ..., refresh_token: _Optional[str] = ...) -> None: ...
+
+class RefreshRequest(_message.Message):
+    __slots__ = ["refresh_token"]
+    REFRESH_TOKEN_FIELD_NUMBER: _ClassVar[int]
+    refresh_token: str
+    def __init__(self, refresh_token: _Optional[str] = ...) -> None: ...
+
+class RefreshResponse(_message.Message):
+    __slots__ = ["access_token", "new_refresh_token"]
+    ACCESS_TOKEN_FIELD_NUMBER: _ClassVar[int]
+    NEW_REFRESH_TOKEN_FIELD_NUMBER: _ClassVar[int]
+    access_token: str
+    new_refresh_token: str
+    def __init__(self, access_token: _Optional[str] = ..., new_refresh_token: _Optional[str] = ...) -> None: ...
+
+class SignUpRequest(_message.Message):
+    __slots__ = ["user_info", "hashed_password"]
+    USER_INFO_FIELD_NUMBER: _ClassVar[int]
+    HASHED_PASSWORD_FIELD_NUMBER: _ClassVar[int]
+    user_info: UserInfo
+    hashed_password: str
+    def __init__(self, user_info: _Optional[_Union[UserInfo, _Mapping]] = ..., hashed_password: _Optional[str] = ...) -> None: ...
+
+class SignUpResponse(_message.Message):
+    __slots__ = []
+    def __init__(self) -> None: ...
+
+class LogoutRequest(_message.Message):
+    __slots__ = []
+    def __init__(self) -> None: ...
+
+class LogoutResponse(_message.Message):
+    __slots__ = []
+    def __init__(self) -> None: ...
+
+class UnregisterRequest(_message.Message):
+    __slots__ = []
+    def __init__(self) -> None: ...
+
+class UnregisterResponse(_message.Message):
+    __slots__ = []
+    def __init__(self) -> None: ...
+
+class GetUserInfoRequest(_message.Message):
+    __slots__ = []
+    def __init__(self) -> None: ...
+
+class GetUserInfoResponse(_message.Message):
+    __slots__ = ["user_info"]
+    USER_INFO_FIELD_NUMBER: _ClassVar[int]
+    user_info: UserInfo
+    def __init__(self, user_info: _Optional[_Union[UserInfo, _Mapping]] = ...) -> None: ...
+
+class ListUserInfoRequest(_message.Message):
+    __slots__ = []
+    def __init__(self) -> None: ...
+
+class ListUserInfoResponse(_message.Message):
+    __slots__ = ["user_infos"]
+    USER_INFOS_FIELD_NUMBER: _ClassVar[int]
+    user_infos: _containers.RepeatedCompositeFieldContainer[UserInfo]
+    def __init__(self, user_infos: _Optional[_Iterable[_Union[UserInfo, _Mapping]]] = ...) -> None: ...
+
+class UpdateUserInfoRequest(_message.Message):
+    __slots__ = ["user_info"]
+    USER_INFO_FIELD_NUMBER: _ClassVar[int]
+    user_info: UserInfo
+    def __init__(self, user_info: _Optional[_Union[UserInfo, _Mapping]] = ...) -> None: ...
+
+class UpdateUserInfoResponse(_message.Message):
+    __slots__ = []
+    def __init__(self) -> None: ...
@@ -0,0 +1,349 @@
+# Generated by the gRPC Python protocol compiler plugin. DO NOT EDIT!
+"""Client and server classes corresponding to protobuf-defined services."""
+import grpc
+
+import user_pb2 as user__pb2
+
+
+class UserServiceStub(object):
+    """TODO: documentation
+    *************************** User session *************************
+    """
+
+    def __init__(self, channel):
+        """Constructor.
+
+        Args:
+            channel: A grpc.Channel.
+        """
+        self.GetJwk = channel.unary_unary(
+                '/user.UserService/GetJwk',
+                request_serializer=user__pb2.GetJwkRequest.SerializeToString,
+                response_deserializer=user__pb2.GetJwkResponse.FromString,
+                )
+        self.Login = channel.unary_unary(
+                '/user.UserService/Login',
+                request_serializer=user__pb2.LoginRequest.SerializeToString,
+                response_deserializer=user__pb2.LoginResponse.FromString,
+                )
+        self.RefreshToken = channel.unary_unary(
+                '/user.UserService/RefreshToken',
+                request_serializer=user__pb2.RefreshRequest.SerializeToString,
+                response_deserializer=user__pb2.RefreshResponse.FromString,
+                )
+        self.Logout = channel.unary_unary(
+                '/user.UserService/Logout',
+                request_serializer=user__pb2.LogoutRequest.SerializeToString,
+                response_deserializer=user__pb2.LogoutResponse.FromString,
+                )
+        self.SignUp = channel.unary_unary(
+                '/user.UserService/SignUp',
+                request_serializer=user__pb2.SignUpRequest.SerializeToString,
+                response_deserializer=user__pb2.SignUpResponse.FromString,
+                )
+        self.Unregister = channel.unary_unary(
+                '/user.UserService/Unregister',
+                request_serializer=user__pb2.UnregisterRequest.SerializeToString,
+                response_deserializer=user__pb2.UnregisterResponse.FromString,
+                )
+        self.GetUserInfo = channel.unary_unary(
+                '/user.UserService/GetUserInfo',
+                request_serializer=user__pb2.GetUserInfoRequest.SerializeToString,
+                response_deserializer=user__pb2.GetUserInfoResponse.FromString,
+                )
+        self.ListUserInfo = channel.unary_unary(
+                '/user.UserService/ListUserInfo',
+                request_serializer=user__pb2.ListUserInfoRequest.SerializeToString,
+                response_deserializer=user__pb2.ListUserInfoResponse.FromString,
+                )
+        self.UpdateUserInfo = channel.unary_unary(
+                '/user.UserService/UpdateUserInfo',
+                request_serializer=user__pb2.UpdateUserInfoRequest.SerializeToString,
+                response_deserializer=user__pb2.UpdateUserInfoResponse.FromString,
+                )
+
+
+class UserServiceServicer(object):
+    """TODO: documentation
+    *************************** User session *************************
+    """
+
+    def GetJwk(self, request, context):
+        """TODO: documentation
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def Login(self, request, context):
+        """TODO: documentation
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def RefreshToken(self, request, context):
+        """TODO: documentation
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def Logout(self, request, context):
+        """TODO: documentation
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def SignUp(self, request, context):
+        """*************************** User creation *************************
+
+        TODO: documentation
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def Unregister(self, request, context):
+        """TODO: documentation
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetUserInfo(self, request, context):
+        """*************************** User management ***********************
+
+        TODO: documentation
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ListUserInfo(self, request, context):
+        """TODO: documentation
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def UpdateUserInfo(self, request, context):
+        """TODO: documentation
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+
+def add_UserServiceServicer_to_server(servicer, server):
+    rpc_method_handlers = {
+            'GetJwk': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetJwk,
+                    request_deserializer=user__pb2.GetJwkRequest.FromString,
+                    response_serializer=user__pb2.GetJwkResponse.SerializeToString,
+            ),
+            'Login': grpc.unary_unary_rpc_method_handler(
+                    servicer.Login,
+                    request_deserializer=user__pb2.LoginRequest.FromString,
+                    response_serializer=user__pb2.LoginResponse.SerializeToString,
+            ),
+            'RefreshToken': grpc.unary_unary_rpc_method_handler(
+                    servicer.RefreshToken,
+                    request_deserializer=user__pb2.RefreshRequest.FromString,
+                    response_serializer=user__pb2.RefreshResponse.SerializeToString,
+            ),
+            'Logout': grpc.unary_unary_rpc_method_handler(
+                    servicer.Logout,
+                    request_deserializer=user__pb2.LogoutRequest.FromString,
+                    response_serializer=user__pb2.LogoutResponse.SerializeToString,
+            ),
+            'SignUp': grpc.unary_unary_rpc_method_handler(
+                    servicer.SignUp,
+                    request_deserializer=user__pb2.SignUpRequest.FromString,
+                    response_serializer=user__pb2.SignUpResponse.SerializeToString,
+            ),
+            'Unregister': grpc.unary_unary_rpc_method_handler(
+                    servicer.Unregister,
+                    request_deserializer=user__pb2.UnregisterRequest.FromString,
+                    response_serializer=user__pb2.UnregisterResponse.SerializeToString,
+            ),
+            'GetUserInfo': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetUserInfo,
+                    request_deserializer=user__pb2.GetUserInfoRequest.FromString,
+                    response_serializer=user__pb2.GetUserInfoResponse.SerializeToString,
+            ),
+            'ListUserInfo': grpc.unary_unary_rpc_method_handler(
+                    servicer.ListUserInfo,
+                    request_deserializer=user__pb2.ListUserInfoRequest.FromString,
+                    response_serializer=user__pb2.ListUserInfoResponse.SerializeToString,
+            ),
+            'UpdateUserInfo': grpc.unary_unary_rpc_method_handler(
+                    servicer.UpdateUserInfo,
+                    request_deserializer=user__pb2.UpdateUserInfoRequest.FromString,
+                    response_serializer=user__pb2.UpdateUserInfoResponse.SerializeToString,
+            ),
+    }
+    generic_handler = grpc.method_handlers_generic_handler(
+            'user.UserService', rpc_method_handlers)
+    server.add_generic_rpc_handlers((generic_handler,))
+
+
+ # This class is part of an EXPERIMENTAL API.
+class UserService(object):
+    """TODO: documentation
+    *************************** User session *************************
+    """
+
+    @staticmethod
+    def GetJwk(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/user.UserService/GetJwk',
+            user__pb2.GetJwkRequest.SerializeToString,
+            user__pb2.GetJwkResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def Login(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/user.UserService/Login',
+            user__pb2.LoginRequest.SerializeToString,
+            user__pb2.LoginResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def RefreshToken(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/user.UserService/RefreshToken',
+            user__pb2.RefreshRequest.SerializeToString,
+            user__pb2.RefreshResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def Logout(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/user.UserService/Logout',
+            user__pb2.LogoutRequest.SerializeToString,
+            user__pb2.LogoutResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def SignUp(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/user.UserService/SignUp',
+            user__pb2.SignUpRequest.SerializeToString,
+            user__pb2.SignUpResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def Unregister(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/user.UserService/Unregister',
+            user__pb2.UnregisterRequest.SerializeToString,
+            user__pb2.UnregisterResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def GetUserInfo(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/user.UserService/GetUserInfo',
+            user__pb2.GetUserInfoRequest.SerializeToString,
+            user__pb2.GetUserInfoResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def ListUserInfo(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/user.UserService/ListUserInfo',
+            user__pb2.ListUserInfoRequest.SerializeToString,
+            user__pb2.ListUserInfoResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def UpdateUserInfo(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/user.UserService/UpdateUserInfo',
+            user__pb2.UpdateUserInfoRequest.SerializeToString,
+            user__pb2.UpdateUserInfoResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
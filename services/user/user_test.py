@@ -182,6 +182,33 @@ class TestUserService(unittest.TestCase):
             ),
         )
 
+    def test_refreshed_access_token(self):
+        signup_response: user_pb2.SignUpResponse = self.client.SignUp(
+            user_pb2.SignUpRequest(
+                user_info=user_pb2.UserInfo(
+                    user_name="foo",
+                    full_name="foo bar",
+                    email="foo@bar.com",
+                ),
+                hashed_password="hashpwd",
+            )
+        )
+        self.assertEqual(signup_response, user_pb2.SignUpResponse())
+
+        login_res: user_pb2.LoginResponse = self.client.Login(
+            user_pb2.LoginRequest(email="foo@bar.com", hashed_password="hashpwd")
+        )
+        refresh_response: user_pb2.RefreshResponse = self.client.RefreshToken(
+            user_pb2.RefreshRequest(refresh_token=login_res.refresh_token)
+        )
+
+        # NOTE: a refreshed access token is authorized like the one issued at login
+        user_info_res: user_pb2.GetUserInfoResponse = self.client.GetUserInfo(
+            user_pb2.GetUserInfoRequest(),
+            metadata=(("access_token", refresh_response.access_token),),
+        )
+        self.assertEqual(user_info_res.user_info.email, "foo@bar.com")
+
     def test_user_info_flows(self):
         signup_response: user_pb2.SignUpResponse = self.client.SignUp(
             user_pb2.SignUpRequest(
@@ -5,8 +5,9 @@ import io
 import grpc
 import PIL.Image as Image
 from decouple import config
-from proto.plotter_pb2 import PlotRequest
+from proto.plotter_pb2 import PlotRequest, PlotChunk
 from proto.plotter_pb2_grpc import PlotterServiceStub
+from utils.compression import call_compression, grpc_compression
 
 
 def client():
@@ -18,10 +19,27 @@ def client():
 
         encodedPayload = b'{ "data": [{"datatype":"file", "filename":"test_01.csv"}]}'
         response = stub.GeneratePlot(
-            PlotRequest(encodedPayload=encodedPayload, rawData=rawData)
+            PlotRequest(encodedPayload=encodedPayload, rawData=rawData),
+            compression=call_compression(len(rawData)),
         )
         return response
-    
+
+
+def stream_client(chunk_size=64 * 1024):
+    # NOTE: the chunks are large enough that each is worth compressing
+    with grpc.insecure_channel(
+        config("PLOTTER_ADDRESS"), compression=grpc_compression()
+    ) as channel:
+        stub = PlotterServiceStub(channel=channel)
+
+        def chunks():
+            yield PlotChunk(encodedPayload=b'{ "data": [{"datatype":"file", "filename":"test_01.csv"}]}')
+            with open("..\\data\\test_01.csv", "rb") as f:
+                while rawData := f.read(chunk_size):
+                    yield PlotChunk(rawData=rawData)
+
+        return b"".join(chunk.image for chunk in stub.GeneratePlotStream(chunks()))
+
 
 if __name__ == "__main__":
     r = client()